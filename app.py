@@ -2,14 +2,16 @@ from flask import Flask, jsonify, render_template
 from flask_cors import CORS
 from datetime import timedelta
 import os
-import logging
-from logging.handlers import RotatingFileHandler
 from dotenv import load_dotenv
 from werkzeug.debug import DebuggedApplication
 
 # .env 파일 로드
 load_dotenv()
 
+# 로깅 - 큐에 넣기만 하고 파일 쓰기는 리스너 스레드에서 (print 캡처 전환 포함, 컨트롤러 import 전에 설정)
+from utils.async_logging import init_logging, init_access_log
+init_logging()
+
 from controllers.auth_controller import auth_bp
 from controllers.vehicle_controller import vehicle_bp
 from controllers.vehicle_api_controller import vehicle_api_bp
@@ -20,71 +22,27 @@ from controllers.card_controller import card_bp
 from controllers.community_controller import community_bp
 from controllers.video_controller import video_bp
 from controllers.spec_controller import spec_bp
+from controllers.upload_controller import upload_bp
 
 # 데이터베이스 연결 테스트
 from models.base import test_database_connection
+from utils.image_manifest import ImageManifest
+from models.photo_gc import PhotoGC
+from utils.resumable_upload import ResumableUploads
+from models.driving_video import DrivingVideo, VIDEO_DIR
+from models.video_thumbnail import VideoThumbnailer
+from models.video_packager import VideoPackager
+from models.market_view_counter import MarketViewCounter
+from models.community_cache import CommunityCache
+from utils.compression import init_compression
 
 app = Flask(__name__)
 
 # 업로드 폴더 설정 (정적 파일 서빙)
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
 
-# 로깅 설정
-def setup_logging(app):
-    """로깅 설정 함수"""
-    # logs 디렉토리 생성
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-    
-    # 로그 포맷 설정
-    formatter = logging.Formatter(
-        '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
-    )
-    
-    # 파일 핸들러 설정 (최대 10MB, 백업 5개)
-    file_handler = RotatingFileHandler(
-        'logs/connected_car.log', 
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.INFO)
-    
-    # 에러 로그 파일 핸들러
-    error_file_handler = RotatingFileHandler(
-        'logs/connected_car_error.log',
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
-    error_file_handler.setFormatter(formatter)
-    error_file_handler.setLevel(logging.ERROR)
-    
-    # Flask 앱 로거에 핸들러 추가
-    app.logger.addHandler(file_handler)
-    app.logger.addHandler(error_file_handler)
-    app.logger.setLevel(logging.INFO)
-    
-    # Werkzeug 로그도 파일로 저장
-    werkzeug_logger = logging.getLogger('werkzeug')
-    werkzeug_logger.addHandler(file_handler)
-    werkzeug_logger.setLevel(logging.INFO)
-
-# 로깅 설정 적용
-setup_logging(app)
-
-# 요청 로깅 미들웨어
-@app.before_request
-def log_request_info():
-    """모든 요청을 로그에 기록"""
-    from flask import request
-    app.logger.info(f'Request: {request.method} {request.url} - IP: {request.remote_addr}')
-
-@app.after_request
-def log_response_info(response):
-    """모든 응답을 로그에 기록"""
-    from flask import request
-    app.logger.info(f'Response: {response.status_code} for {request.method} {request.url}')
-    return response
+# 요청당 접근 로그 1줄 (지연 시간 포함, 경로별 샘플링) - 다른 after_request 훅보다 먼저 등록
+init_access_log(app)
 
 # CORS 설정 - 개발 환경용 (credentials 포함, origins 허용)
 CORS(app, supports_credentials=True, origins=[
@@ -113,9 +71,41 @@ app.register_blueprint(card_bp)
 app.register_blueprint(community_bp)
 app.register_blueprint(video_bp)
 app.register_blueprint(spec_bp)
+app.register_blueprint(upload_bp)
+
+# 응답 압축 (gzip/brotli) + 사전 압축된 정적 파일(.br/.gz) 전송
+init_compression(app)
+
+# 차량 이미지 매니페스트 - 시작 시 1회 인덱싱 후 mtime 감시로 갱신
+ImageManifest.start_watcher()
+
+# 사진 파일 지연 삭제 스위퍼 + 주기적 정합성 점검
+PhotoGC.start(app.root_path)
+
+# 만료된 이어 올리기 업로드 세션 정리
+ResumableUploads.start_gc(os.path.join(app.root_path, 'uploads', 'sessions'))
+
+# 주행 영상 카탈로그 - 영상 폴더 증분 스캔
+DrivingVideo.start_watcher()
+# 영상 미리보기(포스터/스프라이트/VTT) 생성 - ffmpeg가 있을 때만
+VideoThumbnailer.start(app.root_path, VIDEO_DIR)
+# 영상 HLS(fMP4) 패키징 - ffmpeg가 있을 때만
+VideoPackager.start(app.root_path, VIDEO_DIR)
+
+# 중고장터 조회수 - 메모리에 모아 몇 초마다 일괄 반영
+MarketViewCounter.start()
+
+# 공지사항/FAQ 응답 캐시 - 변경 여부만 주기적으로 확인
+CommunityCache.start_watcher()
+
+@app.context_processor
+def inject_car_images():
+    """템플릿에서 car_images(model_id, kind) 로 이미지 매니페스트 조회"""
+    return {'car_images': ImageManifest.get_images}
 
 app.debug = True
-app.config['TEMPLATES_AUTO_RELOAD'] = True
+# 템플릿 자동 리로드는 개발 시에만 (매 렌더링마다 파일 mtime 확인 비용 발생)
+app.config['TEMPLATES_AUTO_RELOAD'] = os.getenv('TEMPLATES_AUTO_RELOAD', '0') == '1'
 app.wsgi_app = DebuggedApplication(
     app.wsgi_app,
     evalex=True,        # enables the in-browser console
@@ -157,27 +147,21 @@ def health_check():
 if __name__ == '__main__':
     # 서버 시작 로그
     startup_message = "커넥티드카 BE 서버 시작 중..."
-    print("[START] " + startup_message)
     app.logger.info(startup_message)
 
     db_message = "MySQL 기반 데이터 관리"
-    print("[DB] " + db_message)
     app.logger.info(db_message)
 
     api_message = "car-api 서버 연동 (localhost:9000)"
-    print("[API] " + api_message)
     app.logger.info(api_message)
 
     # 데이터베이스 연결 확인
     if test_database_connection():
         success_message = "MySQL 데이터베이스 연결 성공"
-        print("[OK] " + success_message)
         app.logger.info(success_message)
     else:
         error_message = "MySQL 데이터베이스 연결 실패"
         warning_message = "로컬 MySQL 서버가 실행 중인지 확인하세요"
-        print("[ERROR] " + error_message)
-        print("[WARN] " + warning_message)
         app.logger.error(error_message)
         app.logger.warning(warning_message)
     
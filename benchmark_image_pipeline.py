@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+이미지 처리 파이프라인 벤치마크 스크립트
+합성 JPEG 원본을 만들어 워커 수별로 처리량(images/sec)과 코어당 처리량을 측정함
+
+사용 예:
+    python benchmark_image_pipeline.py
+    python benchmark_image_pipeline.py --images 48 --size 4032x3024 --workers 1,2,4
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+from utils.image_processing import process_photo
+from utils.image_pipeline import ImagePipeline
+
+def make_corpus(directory, count, width, height):
+    """휴대폰 사진 크기의 합성 JPEG 원본 생성"""
+    paths = []
+    base = Image.effect_noise((width, height), 64).convert('RGB')
+    for i in range(count):
+        path = os.path.join(directory, f'source_{i}.jpg')
+        base.save(path, format='JPEG', quality=92)
+        paths.append(path)
+    return paths
+
+def run_pipeline(sources, out_dir, workers, users):
+    """ImagePipeline에 전체 원본을 넣고 모두 끝날 때까지 걸린 시간 측정"""
+    done = threading.Event()
+    finished = []
+    errors = []
+
+    def on_complete(job, result, error):
+        finished.append(job['photo_id'])
+        if error:
+            errors.append(error)
+        if len(finished) == len(sources):
+            done.set()
+
+    pipeline = ImagePipeline(process_photo, workers=workers, max_queue=len(sources),
+                             max_per_user=len(sources), on_complete=on_complete)
+
+    # 워커 프로세스 기동 시간은 측정에서 제외
+    pipeline._ensure_started()
+    pipeline._executor.submit(os.getpid).result()
+
+    started = time.time()
+    for i, source in enumerate(sources):
+        pipeline.submit(i % users, {
+            'photo_id': i,
+            'kwargs': {'src_path': source, 'blob_root': out_dir}
+        })
+    done.wait()
+    elapsed = time.time() - started
+    pipeline._executor.shutdown()
+    return elapsed, len(errors)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='이미지 파이프라인 처리량 벤치마크')
+    parser.add_argument('--images', type=int, default=24, help='처리할 이미지 수')
+    parser.add_argument('--size', default='4032x3024', help='원본 크기 (가로x세로)')
+    parser.add_argument('--workers', default=None, help='워커 수 목록 (예: 1,2,4). 기본: 1과 CPU 수')
+    parser.add_argument('--users', type=int, default=4, help='요청을 나눠 보낼 가상 사용자 수')
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split('x'))
+    cpu_count = os.cpu_count() or 1
+    worker_counts = [int(v) for v in args.workers.split(',')] if args.workers else sorted({1, cpu_count})
+
+    print("=== 이미지 파이프라인 벤치마크 ===")
+    print(f"원본 {args.images}장 ({width}x{height}), CPU {cpu_count}개")
+
+    work_dir = tempfile.mkdtemp(prefix='image_bench_')
+    try:
+        sources = make_corpus(work_dir, args.images, width, height)
+        for workers in worker_counts:
+            out_dir = os.path.join(work_dir, f'out_{workers}')
+            os.makedirs(out_dir)
+            elapsed, error_count = run_pipeline(sources, out_dir, workers, args.users)
+            throughput = args.images / elapsed
+            print(f"workers={workers:>2}  {elapsed:6.2f}s  {throughput:6.2f} images/sec  "
+                  f"{throughput / workers:6.2f} images/sec/core  errors={error_count}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
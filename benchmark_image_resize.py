@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+이미지 축소 경로 벤치마크 스크립트
+기존 경로(전체 디코딩 + LANCZOS)와 현재 경로(JPEG draft + reduce + EXIF 회전)를
+같은 원본 코퍼스에 대해 비교해 처리량(images/sec)과 최대 RSS를 출력함
+
+각 경로는 별도 프로세스(spawn)에서 실행하므로 최대 RSS가 서로 섞이지 않음
+
+사용 예:
+    python benchmark_image_resize.py
+    python benchmark_image_resize.py --corpus ./sample_photos --rounds 3
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+from utils.image_processing import MAX_IMAGE_WIDTH, encode_image, prepare_image
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+
+def legacy_prepare_image(image, max_width=MAX_IMAGE_WIDTH):
+    """기존 경로 - 원본 전체를 디코딩한 뒤 LANCZOS 축소, 알파는 split()으로 분리"""
+    if image.width > max_width:
+        ratio = max_width / image.width
+        image = image.resize((max_width, int(image.height * ratio)), Image.Resampling.LANCZOS)
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+PATHS = {
+    'legacy': legacy_prepare_image,
+    'fast': prepare_image,
+}
+
+def make_corpus(directory):
+    """휴대폰 사진과 비슷한 합성 코퍼스 생성 (세로 촬영 EXIF, 투명 PNG 포함)"""
+    specs = [
+        ('phone_landscape.jpg', (4032, 3024), 'RGB', 1),
+        ('phone_portrait.jpg', (4032, 3024), 'RGB', 6),
+        ('camera_large.jpg', (6000, 4000), 'RGB', 1),
+        ('medium.jpg', (2048, 1536), 'RGB', 1),
+        ('grayscale.jpg', (3000, 2000), 'L', 1),
+        ('transparent.png', (2400, 1600), 'RGBA', 1),
+    ]
+    paths = []
+    for name, size, mode, orientation in specs:
+        # 실제 사진처럼 완만한 그라데이션 위에 약한 노이즈를 섞음 (순수 노이즈는 압축되지 않음)
+        gradient = Image.merge('RGB', [
+            Image.linear_gradient('L').resize(size),
+            Image.linear_gradient('L').rotate(90).resize(size),
+            Image.radial_gradient('L').resize(size),
+        ])
+        noise = Image.effect_noise(size, 24).convert('RGB')
+        image = Image.blend(gradient, noise, 0.15).convert(mode)
+        path = os.path.join(directory, name)
+        if name.endswith('.jpg'):
+            exif = image.getexif()
+            if orientation != 1:
+                exif[0x0112] = orientation
+            image.save(path, format='JPEG', quality=92, exif=exif.tobytes())
+        else:
+            image.save(path, format='PNG')
+        paths.append(path)
+    return paths
+
+def load_corpus(directory):
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+def peak_rss_kb():
+    """현재 프로세스의 최대 RSS (KB)"""
+    # ru_maxrss는 exec 이전(부모 fork 시점) 값을 이어받으므로 Linux에서는 VmHWM을 우선 사용
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def run_path(name, sources, rounds, queue):
+    """자식 프로세스에서 한 경로를 실행하고 (경과 시간, 처리 수, 최대 RSS 증가량 KB) 반환"""
+    prepare = PATHS[name]
+    # 임포트까지 끝난 시점의 RSS를 기준선으로 사용
+    baseline = peak_rss_kb()
+
+    started = time.time()
+    count = 0
+    for _ in range(rounds):
+        for source in sources:
+            with Image.open(source) as image:
+                prepared = prepare(image)
+            encode_image(prepared, 'jpeg')
+            count += 1
+    elapsed = time.time() - started
+
+    peak = peak_rss_kb()
+    queue.put((elapsed, count, peak - baseline, peak))
+
+def measure(name, sources, rounds):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=run_path, args=(name, sources, rounds, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='이미지 축소 경로 처리량/메모리 벤치마크')
+    parser.add_argument('--corpus', default=None, help='원본 이미지 디렉토리 (기본: 합성 코퍼스)')
+    parser.add_argument('--rounds', type=int, default=2, help='코퍼스 반복 횟수')
+    parser.add_argument('--paths', default='legacy,fast', help='비교할 경로 (legacy,fast)')
+    args = parser.parse_args()
+
+    print("=== 이미지 축소 경로 벤치마크 ===")
+    work_dir = None
+    try:
+        if args.corpus:
+            sources = load_corpus(args.corpus)
+        else:
+            work_dir = tempfile.mkdtemp(prefix='resize_bench_')
+            sources = make_corpus(work_dir)
+        if not sources:
+            print("❌ 코퍼스에 이미지가 없습니다.")
+            sys.exit(1)
+        print(f"원본 {len(sources)}장 x {args.rounds}회, 최대 가로폭 {MAX_IMAGE_WIDTH}px\n")
+
+        results = {}
+        for name in args.paths.split(','):
+            elapsed, count, rss_delta, rss_peak = measure(name, sources, args.rounds)
+            results[name] = count / elapsed
+            print(f"{name:>7}  {elapsed:6.2f}s  {count / elapsed:6.2f} images/sec  "
+                  f"peak RSS +{rss_delta / 1024:7.1f} MB (total {rss_peak / 1024:7.1f} MB)")
+
+        if 'legacy' in results and 'fast' in results:
+            print(f"\n처리량 {results['fast'] / results['legacy']:.2f}배")
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+중고장터 전문 검색 벤치마크 스크립트
+합성 게시글(기본 10만 건)을 별도 테이블에 넣고 FULLTEXT(ngram) 검색과 LIKE 스캔의 지연 시간을 비교함
+(운영 테이블은 건드리지 않으며, 끝나면 벤치마크 테이블을 삭제함)
+
+사용 예:
+    python benchmark_market_search.py
+    python benchmark_market_search.py --posts 100000 --repeat 20 --keep
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.base import DatabaseConnection
+from models.market_post import SEARCH_TITLE_WEIGHT
+
+BENCH_TABLE = 'bench_market_search'
+
+BRANDS = {
+    '현대': ['아반떼', '쏘나타', '그랜저', '투싼', '싼타페', '팰리세이드', '아이오닉5', '캐스퍼'],
+    '기아': ['K3', 'K5', 'K8', '스포티지', '쏘렌토', '카니발', 'EV6', '모닝', '레이'],
+    '제네시스': ['G70', 'G80', 'G90', 'GV70', 'GV80'],
+    '쉐보레': ['스파크', '트레일블레이저', '말리부', '트랙스'],
+    'KG모빌리티': ['토레스', '티볼리', '렉스턴']
+}
+PARTS = ['블랙박스', '타이어', '휠', '내비게이션', '루프박스', '카시트', '하이패스', '매트', '썬팅필름', '충전기']
+FEATURES = ['무사고', '1인 신조', '정비 이력 있음', '실내 금연', '완전 무사고', '보험 이력 깨끗', '썬루프',
+            '통풍시트', '하이브리드', '사계절 타이어 교체', '엔진오일 최근 교환', '외관 흠집 약간']
+PHRASES = ['직거래 우선입니다.', '네고 가능합니다.', '주말에만 연락 주세요.', '사진 추가로 보내드립니다.',
+           '급매로 내놓습니다.', '택배 거래 가능합니다.', '상태 좋습니다.', '문의는 채팅으로 부탁드립니다.']
+QUERIES = ['아반떼', '그랜저 하이브리드', '무사고', '블랙박스', '스포티지 타이어', 'GV80', '급매', '카니발 네고',
+           '아이오닉5 충전기', '통풍시트']
+
+def make_post(rng, now):
+    """차량 또는 부품 판매 게시글 1건 생성 → (title, body, price, status, created_at)"""
+    brand = rng.choice(list(BRANDS))
+    model = rng.choice(BRANDS[brand])
+    if rng.random() < 0.6:
+        year = rng.randint(2012, 2025)
+        title = f"{brand} {model} {year}년식 {rng.choice(FEATURES)}"
+        body_parts = [f"{year}년식 {model} 판매합니다.", f"주행거리 {rng.randint(1, 25) * 10000}km."]
+        price = rng.randint(300, 6000) * 10000
+    else:
+        part = rng.choice(PARTS)
+        title = f"{model} {part} 팝니다"
+        body_parts = [f"{brand} {model}에서 쓰던 {part}입니다."]
+        price = rng.randint(1, 100) * 10000
+    body_parts += rng.sample(FEATURES, 2) + rng.sample(PHRASES, 3)
+    status = rng.choices(['sale', 'reserved', 'sold'], weights=[6, 1, 3])[0]
+    created_at = now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+    return title, ' '.join(body_parts), price, status, created_at
+
+def create_table(cursor):
+    cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    cursor.execute(f"""
+        CREATE TABLE {BENCH_TABLE} (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(200) NOT NULL,
+            body TEXT NOT NULL,
+            price INT NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            created_at TIMESTAMP NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+def load_corpus(cursor, count, seed):
+    """합성 게시글 적재 후 FULLTEXT 인덱스 생성 (대량 적재 뒤에 만드는 편이 빠름)"""
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    for start in range(0, count, 1000):
+        # executemany는 multi-row INSERT 1개로 묶임 (autocommit)
+        cursor.executemany(f"""
+            INSERT INTO {BENCH_TABLE} (title, body, price, status, created_at)
+            VALUES (%s, %s, %s, %s, %s)
+        """, [make_post(rng, now) for _ in range(min(1000, count - start))])
+    cursor.execute(f"ALTER TABLE {BENCH_TABLE} ADD FULLTEXT INDEX ft_bench_title_body (title, body) WITH PARSER ngram")
+    cursor.execute(f"ALTER TABLE {BENCH_TABLE} ADD FULLTEXT INDEX ft_bench_title (title) WITH PARSER ngram")
+
+def fulltext_query(cursor, query, max_price=None):
+    """검색 API와 같은 점수식/필터로 상위 20건 조회"""
+    condition = "AND price <= %s" if max_price is not None else ""
+    params = [query, query, query] + ([max_price] if max_price is not None else [])
+    cursor.execute(f"""
+        SELECT id, MATCH(title) AGAINST (%s IN NATURAL LANGUAGE MODE) * {SEARCH_TITLE_WEIGHT}
+                   + MATCH(title, body) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score
+        FROM {BENCH_TABLE}
+        WHERE MATCH(title, body) AGAINST (%s IN NATURAL LANGUAGE MODE) {condition}
+        ORDER BY score DESC, created_at DESC, id DESC
+        LIMIT 20
+    """, params)
+    return cursor.fetchall()
+
+def like_query(cursor, query, max_price=None):
+    """비교용 - 단어별 LIKE '%...%' 전체 스캔 (최신순)"""
+    words = query.split()
+    conditions = ' AND '.join(["(title LIKE %s OR body LIKE %s)"] * len(words))
+    params = [f'%{word}%' for word in words for _ in range(2)]
+    if max_price is not None:
+        conditions += " AND price <= %s"
+        params.append(max_price)
+    cursor.execute(f"""
+        SELECT id FROM {BENCH_TABLE} WHERE {conditions}
+        ORDER BY created_at DESC, id DESC
+        LIMIT 20
+    """, params)
+    return cursor.fetchall()
+
+def measure(cursor, func, repeat, **kwargs):
+    """검색어별 반복 실행 → 전체 지연 시간 목록 (ms)"""
+    timings = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            started = time.perf_counter()
+            func(cursor, query, **kwargs)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def summarize(name, timings):
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name:>18}  p50 {statistics.median(ordered):8.2f}ms  p95 {p95:8.2f}ms  "
+          f"max {ordered[-1]:8.2f}ms  ({len(ordered)}회)")
+    return statistics.median(ordered)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='중고장터 전문 검색 벤치마크')
+    parser.add_argument('--posts', type=int, default=100000, help='합성 게시글 수')
+    parser.add_argument('--repeat', type=int, default=10, help='검색어 목록 반복 횟수')
+    parser.add_argument('--seed', type=int, default=42, help='코퍼스 난수 시드')
+    parser.add_argument('--keep', action='store_true', help='끝난 뒤 벤치마크 테이블을 남김')
+    args = parser.parse_args()
+
+    print("=== 중고장터 검색 벤치마크 ===")
+    with DatabaseConnection.get_connection() as conn:
+        with conn.cursor() as cursor:
+            try:
+                started = time.time()
+                create_table(cursor)
+                load_corpus(cursor, args.posts, args.seed)
+                print(f"게시글 {args.posts}건 적재 + 인덱스 생성 {time.time() - started:.1f}s\n")
+
+                for query in QUERIES[:3]:
+                    top = fulltext_query(cursor, query)
+                    print(f"'{query}' 상위 {len(top)}건, 최고 점수 {top[0]['score']:.3f}" if top
+                          else f"'{query}' 결과 없음")
+                print()
+
+                fulltext_p50 = summarize('FULLTEXT', measure(cursor, fulltext_query, args.repeat))
+                summarize('FULLTEXT + 가격', measure(cursor, fulltext_query, args.repeat, max_price=10000000))
+                like_p50 = summarize('LIKE 스캔', measure(cursor, like_query, max(args.repeat // 5, 1)))
+                print(f"\n중앙값 기준 {like_p50 / fulltext_p50:.1f}배")
+            finally:
+                if not args.keep:
+                    cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
@@ -111,24 +111,13 @@ def register():
             if random_vehicle_spec:
                 model_id = random_vehicle_spec['id']
 
-                # 2. 랜덤 VIN 및 번호판 생성 (중복 확인)
-                max_attempts = 10
+                # 2. 랜덤 VIN 및 번호판 생성 (후보를 묶어 한 번에 중복 확인)
                 vin = None
                 license_plate = None
 
-                for _ in range(max_attempts):
-                    # VIN 생성 및 중복 확인
-                    temp_vin = Car.generate_random_vin()
-                    if not Car.get_by_vin(temp_vin):
-                        vin = temp_vin
-                        break
-
-                for _ in range(max_attempts):
-                    # 번호판 생성 및 중복 확인
-                    temp_license_plate = Car.generate_random_license_plate()
-                    if not Car.get_by_license_plate(temp_license_plate):
-                        license_plate = temp_license_plate
-                        break
+                identifiers = Car.generate_unique_identifiers(1)
+                if identifiers:
+                    vin, license_plate = identifiers[0]
 
                 # 3. 차량 등록
                 if vin and license_plate:
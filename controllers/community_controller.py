@@ -1,47 +1,34 @@
 # 커뮤니티 (공지사항/FAQ) API 컨트롤러
+# 응답 본문은 CommunityCache가 미리 만들어 둔 것을 그대로 사용 (요청마다 DB 조회 없음)
 from flask import Blueprint, jsonify
-import pymysql
 import os
 from dotenv import load_dotenv
+from models.community_cache import CommunityCache
+from utils.http_cache import conditional_response
 
 load_dotenv()
 
 community_bp = Blueprint('community', __name__)
 
-def get_admin_db_connection():
-    """admin_db 데이터베이스 연결"""
-    return pymysql.connect(
-        host=os.getenv('DB_HOST', 'localhost'),
-        port=int(os.getenv('DB_PORT', 3306)),
-        user=os.getenv('DB_USER', 'root'),
-        password=os.getenv('DB_PASSWORD', 'student'),
-        database='admin_db',
-        charset='utf8mb4',
-        cursorclass=pymysql.cursors.DictCursor
+COMMUNITY_MAX_AGE = int(os.getenv('COMMUNITY_MAX_AGE', '60'))
+
+def _cached_community_response(name):
+    """캐시된 본문을 ETag/Last-Modified 포함 JSON 응답으로 변환 (조건부 요청이면 304)"""
+    entry = CommunityCache.get(name)
+    return conditional_response(
+        entry['body'],
+        mimetype='application/json',
+        etag=entry['etag'],
+        last_modified=entry['last_modified'],
+        cache_control=f'public, max-age={COMMUNITY_MAX_AGE}'
     )
 
 @community_bp.route('/api/community/notices', methods=['GET'])
 def get_notices():
     """공지사항 조회"""
     try:
-        conn = get_admin_db_connection()
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT id, title, content, created_at, updated_at 
-                FROM community 
-                WHERE type = 'notice' 
-                ORDER BY created_at DESC 
-                LIMIT 10
-            """)
-            notices = cursor.fetchall()
-            
-        conn.close()
-        
-        return jsonify({
-            'success': True,
-            'data': notices
-        })
-        
+        return _cached_community_response('notices')
+
     except Exception as e:
         return jsonify({
             'success': False,
@@ -52,24 +39,8 @@ def get_notices():
 def get_faqs():
     """FAQ 조회"""
     try:
-        conn = get_admin_db_connection()
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT id, title, content, created_at, updated_at 
-                FROM community 
-                WHERE type = 'faq' 
-                ORDER BY created_at DESC 
-                LIMIT 10
-            """)
-            faqs = cursor.fetchall()
-            
-        conn.close()
-        
-        return jsonify({
-            'success': True,
-            'data': faqs
-        })
-        
+        return _cached_community_response('faqs')
+
     except Exception as e:
         return jsonify({
             'success': False,
@@ -80,40 +51,10 @@ def get_faqs():
 def get_all_community():
     """공지사항과 FAQ 모두 조회"""
     try:
-        conn = get_admin_db_connection()
-        with conn.cursor() as cursor:
-            # 공지사항 조회
-            cursor.execute("""
-                SELECT id, title, content, created_at, updated_at 
-                FROM community 
-                WHERE type = 'notice' 
-                ORDER BY created_at DESC 
-                LIMIT 5
-            """)
-            notices = cursor.fetchall()
-            
-            # FAQ 조회
-            cursor.execute("""
-                SELECT id, title, content, created_at, updated_at 
-                FROM community 
-                WHERE type = 'faq' 
-                ORDER BY created_at DESC 
-                LIMIT 5
-            """)
-            faqs = cursor.fetchall()
-            
-        conn.close()
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'notices': notices,
-                'faqs': faqs
-            }
-        })
-        
+        return _cached_community_response('all')
+
     except Exception as e:
         return jsonify({
             'success': False,
             'error': f'커뮤니티 데이터 조회 실패: {str(e)}'
-        }), 500
\ No newline at end of file
+        }), 500
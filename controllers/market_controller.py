@@ -1,10 +1,16 @@
 # controllers/market_controller.py - 중고장터 게시판 CRUD
 from flask import Blueprint, request, jsonify, session
 from utils.auth import login_required
+from utils.page_cache import PageCache
+from utils.http_cache import make_etag, conditional_response, conditional_json
 from models.base import DatabaseHelper, DatabaseConnection
+from models.market_post import MarketPost, MARKET_STATUSES, SEARCH_MIN_LENGTH, SEARCH_MAX_LENGTH
+from models.market_view_counter import MarketViewCounter
 import pymysql
 from datetime import datetime
 import os
+import time
+import uuid
 from dotenv import load_dotenv
 
 # .env 파일 로드
@@ -12,6 +18,16 @@ load_dotenv()
 
 market_bp = Blueprint('market', __name__)
 
+# 목록 JSON 캐시 - 목록 프로젝션 버전이 바뀌면 엔트리가 자동 만료됨
+# 조회수는 버전을 올리지 않으므로 MARKET_FEED_CACHE_SECONDS 단위로도 만료시켜 너무 오래 묵지 않게 함
+market_feed_cache = PageCache(
+    max_entries=int(os.getenv('MARKET_FEED_CACHE_ENTRIES', '256')),
+    max_bytes=int(os.getenv('MARKET_FEED_CACHE_BYTES', str(4 * 1024 * 1024)))
+)
+MARKET_FEED_CACHE_SECONDS = int(os.getenv('MARKET_FEED_CACHE_SECONDS', '10'))
+# 기존 page 파라미터(OFFSET)는 앞쪽 몇 페이지까지만 허용 - 그 뒤는 cursor로만 이어 읽음
+MARKET_MAX_OFFSET_PAGE = int(os.getenv('MARKET_MAX_OFFSET_PAGE', '5'))
+
 # 간편한 DB 연결 함수 (환경변수 직접 사용)
 def get_db_connection():
     """데이터베이스 연결 반환 - 환경변수 기반"""
@@ -26,26 +42,42 @@ def get_db_connection():
         cursorclass=pymysql.cursors.DictCursor
     )
 
+def viewer_key():
+    """조회수 중복 판정용 방문자 키 (로그인 사용자 id, 비로그인은 세션별 임의 토큰)"""
+    user_id = session.get('user_id')
+    if user_id:
+        return ('user', user_id)
+    token = session.get('viewer_id')
+    if not token:
+        token = uuid.uuid4().hex
+        session['viewer_id'] = token
+    return ('session', token)
+
 @market_bp.route('/api/market/posts', methods=['GET'])
+@conditional_json(cache_control='public, no-cache', vary=None)
 def get_market_posts():
     """중고장터 게시글 목록 조회 (로그인 불필요)"""
     print("[DEBUG] GET market posts started")
     try:
-        # 페이지네이션 파라미터
+        # 페이지네이션 파라미터 (cursor가 있으면 커서 기준, 없으면 기존 page 호환)
         page = int(request.args.get('page', 1))
-        limit = int(request.args.get('limit', 20))
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
         status = request.args.get('status', 'all')  # all, sale, reserved, sold
+        cursor_param = request.args.get('cursor')
         
-        print(f"[DEBUG] Params: page={page}, limit={limit}, status={status}")
+        print(f"[DEBUG] Params: page={page}, limit={limit}, status={status}, cursor={cursor_param}")
         
-        offset = (page - 1) * limit
-        
-        # 상태별 필터링
-        status_condition = ""
-        params = []
-        if status != 'all':
-            status_condition = "WHERE status = %s"
-            params.append(status)
+        after = None
+        if cursor_param:
+            try:
+                after = MarketPost.decode_cursor(cursor_param)
+            except ValueError:
+                return jsonify({'error': '잘못된 cursor 값입니다.'}), 400
+        elif page < 1 or page > MARKET_MAX_OFFSET_PAGE:
+            return jsonify({
+                'error': f'page는 1~{MARKET_MAX_OFFSET_PAGE} 범위만 지원합니다. '
+                         '그 뒤 페이지는 응답의 pagination.next_cursor를 cursor로 넘겨 조회하세요.'
+            }), 400
         
         print("[DEBUG] Attempting DB connection...")
         conn = get_db_connection()
@@ -53,10 +85,17 @@ def get_market_posts():
         print("[DEBUG] DB connection successful")
         
         try:
-            # 전체 개수 조회
-            count_query = f"SELECT COUNT(*) as total FROM used_market {status_condition}"
-            cursor.execute(count_query, params)
-            total_count = cursor.fetchone()['total']
+            # 목록 버전 확인 후 캐시된 페이지가 있으면 그대로 반환 (PK 조회 1회)
+            version = (MarketPost.listing_version(cursor), int(time.time() // MARKET_FEED_CACHE_SECONDS))
+            cache_key = (status, limit, cursor_param or page)
+            cached = market_feed_cache.get(cache_key, version)
+            if cached:
+                cursor.close()
+                conn.close()
+                return conditional_response(cached['body'], mimetype='application/json', etag=cached['etag'])
+            
+            # 전체 개수 조회 (상태별 개수 캐시)
+            total_count = MarketPost.count(cursor, status)
         except Exception as e:
             # 테이블이 없으면 빈 결과 반환
             if "doesn't exist" in str(e) or "Table" in str(e):
@@ -70,27 +109,16 @@ def get_market_posts():
                         'total_count': 0,
                         'total_pages': 0,
                         'has_next': False,
-                        'has_prev': False
+                        'has_prev': False,
+                        'next_cursor': None
                     }
                 })
             else:
                 raise e
         
-        # 게시글 목록 조회 (최신순)
-        list_query = f"""
-            SELECT 
-                um.id, um.title, um.body, um.price, um.status, um.view_count, um.created_at,
-                u.username, u.name as seller_name
-            FROM used_market um
-            JOIN users u ON um.user_id = u.id
-            {status_condition}
-            ORDER BY um.created_at DESC
-            LIMIT %s OFFSET %s
-        """
-        
-        list_params = params + [limit, offset]
-        cursor.execute(list_query, list_params)
-        posts = cursor.fetchall()
+        # 게시글 목록 조회 (목록 프로젝션만 읽음, 인덱스 범위 스캔 - page 호환 경로는 앞쪽 몇 페이지만 OFFSET)
+        offset = 0 if after else (page - 1) * limit
+        posts, next_cursor = MarketPost.list_page(cursor, status, limit, after, offset)
         
         # 게시글 데이터 포맷팅
         formatted_posts = []
@@ -98,28 +126,31 @@ def get_market_posts():
             formatted_posts.append({
                 'id': post['id'],
                 'title': post['title'],
-                'body': post['body'][:100] + ('...' if len(post['body']) > 100 else ''),  # 미리보기용 요약
+                'body': post['preview'],  # 미리보기용 요약 (100자)
                 'price': post['price'],
                 'status': post['status'],
-                'view_count': post['view_count'],
-                'seller': post['seller_name'] or post['username'],
+                'view_count': MarketViewCounter.live_count(post['id'], post['view_count']),
+                'seller': post['seller_name'],
                 'created_at': post['created_at'].isoformat(),
             })
         
         cursor.close()
         conn.close()
         
-        return jsonify({
+        body = jsonify({
             'success': True,
             'posts': formatted_posts,
             'pagination': {
-                'current_page': page,
+                'current_page': None if after else page,
                 'total_count': total_count,
                 'total_pages': (total_count + limit - 1) // limit,
-                'has_next': offset + limit < total_count,
-                'has_prev': page > 1
+                'has_next': next_cursor is not None,
+                'has_prev': bool(after) or page > 1,
+                'next_cursor': next_cursor
             }
-        })
+        }).get_data()
+        entry = market_feed_cache.set(cache_key, body, version=version, etag=make_etag(version, body))
+        return conditional_response(entry['body'], mimetype='application/json', etag=entry['etag'])
         
     except Exception as e:
         print(f"[ERROR] GET market posts failed: {str(e)}")
@@ -133,16 +164,76 @@ def get_market_posts():
             conn.close()
         return jsonify({'error': f'게시글 목록 조회 실패: {str(e)}'}), 500
 
+@market_bp.route('/api/market/search', methods=['GET'])
+def search_market_posts():
+    """중고장터 게시글 검색 (제목/본문 전문 검색 + 가격/상태 필터, 관련도순)"""
+    try:
+        # 공백 정규화한 검색어
+        query = ' '.join(request.args.get('q', '').split())
+        status = request.args.get('status', 'all')
+        page = max(int(request.args.get('page', 1)), 1)
+        limit = min(max(int(request.args.get('limit', 20)), 1), 50)
+        min_price = request.args.get('min_price')
+        max_price = request.args.get('max_price')
+        min_price = int(min_price) if min_price not in (None, '') else None
+        max_price = int(max_price) if max_price not in (None, '') else None
+    except ValueError:
+        return jsonify({'error': '페이지/가격은 숫자로 입력해주세요.'}), 400
+    
+    if len(query) < SEARCH_MIN_LENGTH:
+        return jsonify({'error': f'검색어를 {SEARCH_MIN_LENGTH}자 이상 입력해주세요.'}), 400
+    if len(query) > SEARCH_MAX_LENGTH:
+        return jsonify({'error': f'검색어는 {SEARCH_MAX_LENGTH}자 이내로 입력해주세요.'}), 400
+    if status != 'all' and status not in MARKET_STATUSES:
+        return jsonify({'error': '올바르지 않은 판매 상태입니다.'}), 400
+    if min_price is not None and max_price is not None and min_price > max_price:
+        return jsonify({'error': '최소 가격이 최대 가격보다 큽니다.'}), 400
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        posts, has_next = MarketPost.search(cursor, query, status, min_price, max_price,
+                                            limit, (page - 1) * limit)
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'posts': [{
+                'id': post['id'],
+                'title': post['title'],
+                'body': post['preview'],
+                'price': post['price'],
+                'status': post['status'],
+                'view_count': MarketViewCounter.live_count(post['id'], post['view_count']),
+                'seller': post['seller_name'],
+                'created_at': post['created_at'].isoformat(),
+                'score': round(float(post['score']), 4)
+            } for post in posts],
+            'pagination': {
+                'current_page': page,
+                'has_next': has_next,
+                'has_prev': page > 1
+            }
+        })
+        
+    except Exception as e:
+        if 'cursor' in locals():
+            cursor.close()
+        if 'conn' in locals():
+            conn.close()
+        return jsonify({'error': f'게시글 검색 실패: {str(e)}'}), 500
+
 @market_bp.route('/api/market/posts/<int:post_id>', methods=['GET'])
 def get_market_post(post_id):
-    """중고장터 게시글 상세 조회 (조회수 증가)"""
+    """중고장터 게시글 상세 조회 (조회수 증가 - 메모리에 모아 주기적으로 반영)"""
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # 조회수 증가
-        cursor.execute("UPDATE used_market SET view_count = view_count + 1 WHERE id = %s", (post_id,))
-        
         # 게시글 상세 정보 조회
         cursor.execute("""
             SELECT 
@@ -161,6 +252,9 @@ def get_market_post(post_id):
             conn.close()
             return jsonify({'error': '게시글을 찾을 수 없습니다.'}), 404
         
+        # 조회수 증가 (같은 방문자의 재조회는 세지 않음)
+        MarketViewCounter.record(post_id, viewer_key())
+        
         # 현재 사용자가 작성자인지 확인
         current_user_id = session.get('user_id')
         is_author = current_user_id == post['user_id']
@@ -171,7 +265,7 @@ def get_market_post(post_id):
             'body': post['body'],
             'price': post['price'],
             'status': post['status'],
-            'view_count': post['view_count'],
+            'view_count': MarketViewCounter.live_count(post_id, post['view_count']),
             'seller': post['seller_name'] or post['username'],
             'seller_id': post['user_id'],
             'created_at': post['created_at'].isoformat(),
@@ -241,14 +335,18 @@ def create_market_post():
         cursor = conn.cursor()
         print("[DEBUG] Database connection successful")
         
-        # 게시글 생성
+        # 게시글 생성 (상태별 개수 / 목록 프로젝션과 같은 트랜잭션)
         print(f"[DEBUG] Inserting post: user_id={user_id}, title='{title}', price={price}")
+        conn.begin()
         cursor.execute("""
-            INSERT INTO used_market (user_id, title, body, price)
-            VALUES (%s, %s, %s, %s)
+            INSERT INTO used_market (user_id, title, body, price, status)
+            VALUES (%s, %s, %s, %s, 'sale')
         """, (user_id, title, body, price))
         
         post_id = cursor.lastrowid
+        MarketPost.adjust_count(cursor, 'sale', 1)
+        MarketPost.refresh_listing(cursor, post_id)
+        conn.commit()
         print(f"[DEBUG] Post created with ID: {post_id}")
         
         # 생성된 게시글 정보 반환
@@ -357,7 +455,7 @@ def update_market_post(post_id):
                 conn.close()
                 return jsonify({'error': '올바른 가격을 입력해주세요.'}), 400
         
-        if status and status in ['sale', 'reserved', 'sold']:
+        if status and status in MARKET_STATUSES:
             update_fields.append("status = %s")
             update_params.append(status)
         
@@ -366,11 +464,19 @@ def update_market_post(post_id):
             conn.close()
             return jsonify({'error': '수정할 내용이 없습니다.'}), 400
         
-        # 게시글 업데이트
+        # 게시글 업데이트 (상태별 개수 / 목록 프로젝션도 같은 트랜잭션에서 갱신)
         update_query = f"UPDATE used_market SET {', '.join(update_fields)} WHERE id = %s"
         update_params.append(post_id)
         
+        conn.begin()
+        cursor.execute("SELECT status FROM used_market WHERE id = %s FOR UPDATE", (post_id,))
+        current = cursor.fetchone()
         cursor.execute(update_query, update_params)
+        if current and status in MARKET_STATUSES and current['status'] != status:
+            MarketPost.adjust_count(cursor, current['status'], -1)
+            MarketPost.adjust_count(cursor, status, 1)
+        MarketPost.refresh_listing(cursor, post_id)
+        conn.commit()
         
         # 업데이트된 게시글 정보 반환
         cursor.execute("""
@@ -397,7 +503,7 @@ def update_market_post(post_id):
                 'body': updated_post['body'],
                 'price': updated_post['price'],
                 'status': updated_post['status'],
-                'view_count': updated_post['view_count'],
+                'view_count': MarketViewCounter.live_count(post_id, updated_post['view_count']),
                 'seller': updated_post['seller_name'] or updated_post['username'],
                 'created_at': updated_post['created_at'].isoformat(),
                 'updated_at': updated_post['updated_at'].isoformat() if updated_post['updated_at'] else None
@@ -435,8 +541,16 @@ def delete_market_post(post_id):
             conn.close()
             return jsonify({'error': '삭제 권한이 없습니다.'}), 403
         
-        # 게시글 삭제
+        # 게시글 삭제 (상태별 개수 / 목록 프로젝션과 같은 트랜잭션)
+        conn.begin()
+        cursor.execute("SELECT status FROM used_market WHERE id = %s FOR UPDATE", (post_id,))
+        current = cursor.fetchone()
         cursor.execute("DELETE FROM used_market WHERE id = %s", (post_id,))
+        if current and cursor.rowcount:
+            MarketPost.adjust_count(cursor, current['status'], -1)
+        MarketPost.remove_listing(cursor, post_id)
+        conn.commit()
+        MarketViewCounter.discard(post_id)
         
         cursor.close()
         conn.close()
@@ -455,6 +569,7 @@ def delete_market_post(post_id):
 
 @market_bp.route('/api/market/my-posts', methods=['GET'])
 @login_required
+@conditional_json()
 def get_my_market_posts():
     """내가 작성한 중고장터 게시글 목록 조회"""
     try:
@@ -481,7 +596,7 @@ def get_my_market_posts():
                 'body': post['body'][:100] + ('...' if len(post['body']) > 100 else ''),
                 'price': post['price'],
                 'status': post['status'],
-                'view_count': post['view_count'],
+                'view_count': MarketViewCounter.live_count(post['id'], post['view_count']),
                 'created_at': post['created_at'].isoformat(),
                 'updated_at': post['updated_at'].isoformat() if post['updated_at'] else None
             })
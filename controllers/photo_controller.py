@@ -1,15 +1,21 @@
 # controllers/photo_controller.py - 차량 사진 업로드 관리 (MySQL 기반)
 import os
 import uuid
-import base64
 from datetime import datetime
-from flask import Blueprint, request, jsonify, session, current_app, send_from_directory
-from PIL import Image
-from io import BytesIO
+from flask import Blueprint, request, jsonify, session, current_app, abort
 from utils.auth import login_required
+from utils.image_processing import (probe_image, process_photo, variant_filename,
+                                    MIN_IMAGE_WIDTH, VARIANT_WIDTHS, VARIANT_FORMATS)
+from utils.image_pipeline import ImagePipeline, PipelineFull
+from utils.json_stream import iter_base64_array, PayloadTooLarge
+from utils.blob_store import BlobStore, blob_url
+from utils.http_cache import file_response, conditional_json, IMMUTABLE_MAX_AGE
 from models.base import DatabaseHelper, DatabaseConnection
+from models.photo_blob import PhotoBlob
+from models.photo_gc import PhotoGC
 import pymysql
 from werkzeug.utils import secure_filename  # 경로 탈출 방지용
+from werkzeug.security import safe_join
 
 photo_bp = Blueprint('photo', __name__)
 
@@ -32,8 +38,13 @@ def get_db_connection():
 MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
 MAX_PHOTOS_PER_USER = 12
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-MAX_IMAGE_WIDTH = 1600
-MIN_IMAGE_WIDTH = 320
+
+# 사진 응답 캐시 설정
+# 버전(?v=) 없는 URL은 짧게 캐시 후 ETag로 재검증, 버전 URL/블롭 URL은 immutable
+PHOTO_REVALIDATE_MAX_AGE = int(os.getenv('PHOTO_REVALIDATE_MAX_AGE', '60'))
+PHOTO_VERSION_LENGTH = 16
+# 변형 선택(pick_variant)에 쓰는 요청 헤더 - 공유 캐시가 이 헤더별로 따로 저장하도록 Vary에 모두 명시
+PHOTO_WIDTH_HINTS = ('Sec-CH-Width', 'Width')
 
 # 실습 모드 스위치 (환경변수로 제어: VULN_LAB=1 이면 ON)
 VULN_LAB = os.getenv('VULN_LAB', '0') == '1'
@@ -51,50 +62,282 @@ def get_upload_paths():
     os.makedirs(upload_dir, exist_ok=True)
     return upload_dir, upload_url
 
-def resize_image(image_data, max_width=MAX_IMAGE_WIDTH):
-    """이미지 리사이징 처리 (안전 모드에서 사용)"""
+def get_pending_dir():
+    """
+    업로드 원본 임시 저장 경로: <앱루트>/uploads/pending
+    (서빙 경로 밖에 두어 처리 전 원본이 노출되지 않게 함)
+    """
+    pending_dir = os.path.join(current_app.root_path, 'uploads', 'pending')
+    os.makedirs(pending_dir, exist_ok=True)
+    return pending_dir
+
+def get_blob_root():
+    """
+    처리 완료 사진 저장소: <앱루트>/uploads/blobs/ab/cd/<sha256>.<ext>
+    브라우저 접근 URL: /uploads/blobs/...
+    """
+    blob_root = os.path.join(current_app.root_path, 'uploads', 'blobs')
+    os.makedirs(blob_root, exist_ok=True)
+    return blob_root
+
+def validate_raw_image(raw_path):
+    """저장된 원본의 헤더만 확인해 이미지 여부/최소 크기 검증 (디코딩은 워커에서)"""
     try:
-        # base64 데이터에서 이미지 추출
-        if isinstance(image_data, str) and image_data.startswith('data:image'):
-            # data:image/jpeg;base64,... 형태에서 실제 데이터 추출
-            image_data = image_data.split(',')[1]
-        
-        # base64 디코딩
-        img_bytes = base64.b64decode(image_data)
-        image = Image.open(BytesIO(img_bytes))
-        
-        # 크기 검증
-        if image.width < MIN_IMAGE_WIDTH:
-            raise ValueError(f'이미지 가로폭이 너무 작습니다. 최소 {MIN_IMAGE_WIDTH}px 이상이어야 합니다.')
-        
-        # 리사이징 필요한지 확인
-        if image.width > max_width:
-            ratio = max_width / image.width
-            new_height = int(image.height * ratio)
-            image = image.resize((max_width, new_height), Image.Resampling.LANCZOS)
-        
-        # JPEG로 변환 (압축)
-        output = BytesIO()
-        if image.mode in ('RGBA', 'LA', 'P'):
-            # 투명도가 있는 이미지는 배경을 흰색으로 변환
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            if image.mode == 'P':
-                image = image.convert('RGBA')
-            background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-            image = background
-        
-        image.save(output, format='JPEG', quality=85, optimize=True)
-        processed_bytes = output.getvalue()
-        
-        return processed_bytes, image.width, image.height, image.width, image.height
-    
+        _, width, _ = probe_image(raw_path)
     except Exception as e:
         raise ValueError(f'이미지 처리 실패: {str(e)}')
+    if width < MIN_IMAGE_WIDTH:
+        raise ValueError(f'이미지 가로폭이 너무 작습니다. 최소 {MIN_IMAGE_WIDTH}px 이상이어야 합니다.')
+
+def discard_files(paths):
+    """저장한 파일 목록 일괄 삭제 (실패해도 무시)"""
+    for path in paths:
+        discard_file(path)
+
+def new_photo_row(user_id, photo_id, filename, original_filename, file_path, file_url,
+                  file_size, mime_type, status):
+    """car_photos INSERT용 행 (업로드 응답도 이 값으로 구성)"""
+    return {
+        'user_id': user_id,
+        'photo_id': photo_id,
+        'filename': filename,
+        'original_filename': original_filename,
+        'file_path': file_path,
+        'file_url': file_url,
+        'file_size': file_size,
+        'width': 0,
+        'height': 0,
+        'mime_type': mime_type,
+        'status': status,
+        'created_at': datetime.now().replace(microsecond=0)
+    }
+
+def discard_file(path):
+    """임시 파일 삭제 (실패해도 무시)"""
+    try:
+        if path and os.path.exists(path):
+            os.remove(path)
+    except OSError:
+        pass
+
+def on_photo_processed(job, result, error):
+    """이미지 파이프라인 완료 콜백 - 블롭 참조 등록/배치 후 car_photos 상태/크기 갱신, 원본 정리"""
+    if error:
+        print(f"[PIPELINE] photo {job['photo_id']} failed: {error}")
+        DatabaseHelper.execute_update("""
+            UPDATE car_photos SET status = 'failed'
+            WHERE user_id = %s AND photo_id = %s
+        """, (job['user_id'], job['photo_id']))
+        discard_file(job['kwargs']['src_path'])
+        return
+
+    store = BlobStore(job['kwargs']['blob_root'])
+    main_blob = result['blob']
+    variants = result.get('variants', [])
+    staged = [(main_blob, 'image/jpeg')] + [(v['blob'], VARIANT_FORMATS[v['format']][2]) for v in variants]
+
+    # 참조를 먼저 등록한 뒤 파일을 제자리에 옮김 (동시에 같은 해시가 해제되어도 파일이 지워지지 않음)
+    PhotoBlob.acquire([{'hash': blob['hash'], 'file_path': store.path_for(blob['hash'], blob['ext']),
+                        'file_size': blob['file_size'], 'mime_type': mime_type}
+                       for blob, mime_type in staged])
+    for blob, _ in staged:
+        store.commit(blob)
+
+    updated = DatabaseHelper.execute_update("""
+        UPDATE car_photos
+        SET status = 'ready', width = %s, height = %s, file_size = %s, file_path = %s, blob_hash = %s
+        WHERE user_id = %s AND photo_id = %s
+    """, (result['width'], result['height'], result['file_size'],
+          store.path_for(main_blob['hash'], main_blob['ext']), main_blob['hash'],
+          job['user_id'], job['photo_id']))
+    if not updated:
+        # 처리 중에 사진이 삭제된 경우 방금 등록한 참조 해제
+        PhotoBlob.release([blob['hash'] for blob, _ in staged])
+    elif variants:
+        inserted = DatabaseHelper.execute_many("""
+            INSERT INTO car_photo_variants
+            (photo_id, user_id, size_class, format, filename, file_path, blob_hash, width, height, file_size)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, [(job['photo_id'], job['user_id'], v['size_class'], v['format'],
+               variant_filename(job['filename'], v['size_class'], v['format']),
+               store.path_for(v['blob']['hash'], v['blob']['ext']), v['blob']['hash'],
+               v['width'], v['height'], v['file_size'])
+              for v in variants])
+        if not inserted:
+            # 변형 행 저장 실패 - 가리키는 행이 없는 변형 블롭 참조 해제 (본 사진은 원본 크기로 제공됨)
+            PhotoBlob.release([v['blob']['hash'] for v in variants])
+    discard_file(job['kwargs']['src_path'])
+
+def load_srcsets(cursor, user_id, upload_url):
+    """사용자 사진들의 변형 목록을 한 번에 조회해 photo_id -> {포맷: {등급: URL}} 맵 구성"""
+    cursor.execute("""
+        SELECT photo_id, size_class, format, filename, blob_hash, width
+        FROM car_photo_variants
+        WHERE user_id = %s
+        ORDER BY size_class
+    """, (user_id,))
+    srcsets = {}
+    for row in cursor.fetchall():
+        by_format = srcsets.setdefault(row['photo_id'], {}).setdefault(row['format'], {})
+        if row['blob_hash']:
+            url = blob_url(row['blob_hash'], VARIANT_FORMATS[row['format']][1])
+        else:
+            url = f"{upload_url}/{row['filename']}"
+        by_format[str(row['size_class'])] = {'url': url, 'width': row['width']}
+    return srcsets
+
+def collect_photo_files(cursor, user_id, photo_id=None):
+    """삭제할 사진(photo_id 없으면 사용자 전체)의 변형 행을 지우고 (기존 파일 경로, 블롭 해시) 목록 반환
+
+    호출 측 트랜잭션 안에서 블롭은 PhotoBlob.decrement()로 참조를 차감하고,
+    블롭 저장소 이전 파일(blob_hash 없음)과 참조가 0이 된 블롭은 PhotoGC.enqueue()로 삭제 예약
+    """
+    where = "user_id = %s" if photo_id is None else "user_id = %s AND photo_id = %s"
+    params = (user_id,) if photo_id is None else (user_id, photo_id)
+
+    paths, hashes = [], []
+    for table in ('car_photos', 'car_photo_variants'):
+        cursor.execute(f"SELECT file_path, blob_hash FROM {table} WHERE {where}", params)
+        for row in cursor.fetchall():
+            if row['blob_hash']:
+                hashes.append(row['blob_hash'])
+            else:
+                paths.append(row['file_path'])
+    cursor.execute(f"DELETE FROM car_photo_variants WHERE {where}", params)
+    return paths, hashes
+
+# 사진 처리 워커 풀 (요청 스레드는 원본 저장 + 큐 등록만 수행)
+photo_pipeline = ImagePipeline(
+    process_photo,
+    workers=int(os.getenv('IMAGE_WORKERS', '0')) or None,
+    max_queue=int(os.getenv('IMAGE_QUEUE_MAX', '64')),
+    max_per_user=MAX_PHOTOS_PER_USER,
+    on_complete=on_photo_processed
+)
+
+def insert_photo_rows(conn, cursor, user_id, photo_rows, saved_paths):
+    """한 트랜잭션 안에서 사용자 행을 잠그고(FOR UPDATE) 남은 개수만큼만 multi-row INSERT
+
+    saved_paths는 photo_rows와 같은 순서의 저장 파일이며, 남은 개수를 넘는 파일은 지움
+    → 커밋된 행 목록 반환 (사용자가 없으면 파일을 모두 지우고 None)
+    """
+    conn.begin()
+    # 사용자 행 잠금으로 같은 사용자의 동시 업로드를 직렬화
+    cursor.execute("SELECT id FROM users WHERE id = %s FOR UPDATE", (user_id,))
+    if not cursor.fetchone():
+        conn.rollback()
+        discard_files(saved_paths)
+        return None
+    cursor.execute("SELECT COUNT(*) AS count FROM car_photos WHERE user_id = %s", (user_id,))
+    remaining = max(MAX_PHOTOS_PER_USER - cursor.fetchone()['count'], 0)
+
+    # 그 사이 다른 요청이 먼저 저장했다면 남은 개수를 넘는 파일은 버림
+    discard_files(saved_paths[remaining:])
+    photo_rows = photo_rows[:remaining]
+    if not photo_rows:
+        conn.rollback()
+        return []
+
+    cursor.executemany("""
+        INSERT INTO car_photos 
+        (user_id, photo_id, filename, original_filename, file_path, file_url, file_size, width, height, mime_type, status, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, [(row['user_id'], row['photo_id'], row['filename'], row['original_filename'],
+           row['file_path'], row['file_url'], row['file_size'], row['width'], row['height'],
+           row['mime_type'], row['status'], row['created_at'])
+          for row in photo_rows])
+    conn.commit()
+    return photo_rows
+
+def submit_photo_jobs(user_id, photo_rows, jobs):
+    """커밋된 행의 처리 작업을 이미지 파이프라인에 등록하고 처리 중인 photo_id 목록 반환"""
+    processing_ids = []
+    for row in photo_rows:
+        job = jobs.get(row['photo_id'])
+        if not job:
+            continue
+        try:
+            photo_pipeline.submit(user_id, job)
+            processing_ids.append(row['photo_id'])
+        except PipelineFull as e:
+            print(f"[UPLOAD] pipeline full, photo {job['photo_id']} failed: {e}")
+            on_photo_processed(dict(job, user_id=user_id), None, e)
+            row['status'] = 'failed'
+    return processing_ids
+
+def uploaded_photo(row):
+    """업로드 응답용 사진 정보 (재조회 없이 메모리의 행으로 구성)"""
+    return {
+        'id': row['photo_id'],
+        'filename': row['filename'],
+        'original_filename': row['original_filename'],
+        'url': photo_url(row),
+        'file_size': row['file_size'],
+        'width': row['width'],
+        'height': row['height'],
+        'status': row['status'],
+        'created_at': row['created_at'].isoformat()
+    }
+
+def ingest_photo_file(user_id, src_path, original_filename):
+    """이어 올리기로 완성된 파일을 사진 1장으로 등록 (안전 모드 업로드와 같은 검증/처리 경로)
+
+    → (응답 dict, HTTP 상태 코드). 성공하면 src_path는 pending 디렉토리로 옮겨짐
+    """
+    if photo_pipeline.available(user_id) <= 0:
+        return {'success': False, 'ok': False,
+                'error': '이미지 처리 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.'}, 503
+    try:
+        validate_raw_image(src_path)
+    except ValueError as e:
+        return {'success': False, 'ok': False, 'error': str(e)}, 415
+
+    upload_dir, upload_url = get_upload_paths()
+    photo_id = str(uuid.uuid4())
+    raw_path = os.path.join(get_pending_dir(), f"{user_id}_{photo_id}.upload")
+    os.replace(src_path, raw_path)
+
+    filename = f"{user_id}_{photo_id}.jpg"
+    row = new_photo_row(user_id, photo_id, filename, original_filename,
+                        os.path.join(upload_dir, filename), f'{upload_url}/{filename}',
+                        os.path.getsize(raw_path), 'image/jpeg', 'processing')
+    jobs = {photo_id: {'photo_id': photo_id, 'filename': filename,
+                       'kwargs': {'src_path': raw_path, 'blob_root': get_blob_root()}}}
+
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            photo_rows = insert_photo_rows(conn, cursor, user_id, [row], [raw_path])
+    except Exception:
+        # 이어 올리기 세션에서 완료 요청을 다시 할 수 있도록 파일을 원래 위치로 되돌림
+        os.replace(raw_path, src_path)
+        raise
+    finally:
+        conn.close()
+    if photo_rows is None:
+        return {'success': False, 'ok': False, 'error': '유효하지 않은 사용자입니다.'}, 403
+    if not photo_rows:
+        return {'success': False, 'ok': False,
+                'error': f'최대 {MAX_PHOTOS_PER_USER}장까지만 저장할 수 있습니다.'}, 400
+
+    processing_ids = submit_photo_jobs(user_id, photo_rows, jobs)
+    return {'success': True, 'ok': True,
+            'message': '1개의 파일이 업로드되었습니다.',
+            'photos': [uploaded_photo(row)],
+            'processing_ids': processing_ids,
+            'uploaded_count': 1,
+            'uploadedCount': 1}, 200
 
 @photo_bp.route('/api/car-photos/upload', methods=['POST'])
 @login_required
 def upload_car_photos():
-    """차량 사진 업로드 (MySQL 저장)"""
+    """차량 사진 업로드 (MySQL 저장)
+
+    파일을 먼저 저장/검증해 행을 메모리에 모은 뒤, 한 트랜잭션 안에서
+    사용자 행을 잠그고(FOR UPDATE) 남은 개수만큼만 multi-row INSERT 함
+    → 동시 업로드가 있어도 MAX_PHOTOS_PER_USER를 넘지 않음
+    """
+    committed = False
     try:
         user_id = session.get('user_id')
         
@@ -107,62 +350,87 @@ def upload_car_photos():
         # 디버깅 로그
         print(f"[UPLOAD] user_id={user_id}, VULN_LAB={VULN_LAB}, lab_mode={lab_mode}, is_json={request.is_json}, file_keys={list(request.files.keys())}")
 
-        # 현재 사진 개수 확인
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # 사용자 존재 여부 확인
-        cursor.execute("SELECT id FROM users WHERE id = %s", (user_id,))
-        if not cursor.fetchone():
+        # 사용자 존재 여부 + 현재 사진 개수 (1회 조회, 잠금 없는 사전 확인)
+        cursor.execute("""
+            SELECT u.id, (SELECT COUNT(*) FROM car_photos WHERE user_id = u.id) AS photo_count
+            FROM users u WHERE u.id = %s
+        """, (user_id,))
+        user_row = cursor.fetchone()
+        if not user_row:
             cursor.close(); conn.close()
             return jsonify({'success': False, 'ok': False, 'error': '유효하지 않은 사용자입니다.'}), 403
-            
-        cursor.execute("SELECT COUNT(*) as count FROM car_photos WHERE user_id = %s", (user_id,))
-        current_count = cursor.fetchone()['count']
+        current_count = user_row['photo_count']
         
         if current_count >= MAX_PHOTOS_PER_USER:
             cursor.close(); conn.close()
             return jsonify({'success': False, 'ok': False,
                             'error': f'최대 {MAX_PHOTOS_PER_USER}장까지만 저장할 수 있습니다.'}), 400
         
-        uploaded_count = 0
+        photo_rows = []  # INSERT할 행 (응답도 이 목록으로 구성)
+        saved_paths = []  # 행과 같은 순서의 저장 파일 (실패/초과 시 정리)
+        jobs = {}  # photo_id -> 커밋 후 이미지 파이프라인에 넘길 작업
+
+        # 안전 모드는 워커 큐 여유가 있어야 받음 (bounded queue)
+        pipeline_slots = MAX_PHOTOS_PER_USER if lab_mode else photo_pipeline.available(user_id)
+        if pipeline_slots <= 0:
+            cursor.close(); conn.close()
+            response = jsonify({'success': False, 'ok': False,
+                                'error': '이미지 처리 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.'})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+
+        upload_dir, upload_url = get_upload_paths()
 
         # ---- Case 1: base64(JSON) 업로드 (안전 모드에서만 허용) ----
+        # 본문을 get_json()으로 통째로 읽지 않고 images 배열을 스트리밍 파싱하며
+        # base64를 청크 단위로 디코딩해 원본 파일에 바로 기록함 (요청당 메모리 상한 고정)
         if request.is_json and not lab_mode:
-            data = request.get_json(silent=True) or {}
-            images = data.get('images', [])
-            if not isinstance(images, list):
-                images = []
+            raw_paths = []
 
-            for img_data in images:
-                if current_count + uploaded_count >= MAX_PHOTOS_PER_USER:
-                    break
-                try:
-                    processed_img, width, height, _, _ = resize_image(img_data)
-                    photo_id = str(uuid.uuid4())
-                    filename = f"{user_id}_{photo_id}.jpg"
+            def open_raw_file():
+                photo_id = str(uuid.uuid4())
+                raw_path = os.path.join(get_pending_dir(), f"{user_id}_{photo_id}.upload")
+                raw_paths.append((photo_id, raw_path))
+                return open(raw_path, 'wb')
 
-                    upload_dir, upload_url = get_upload_paths()
-                    filepath = os.path.join(upload_dir, filename)
-                    with open(filepath, 'wb') as f:
-                        f.write(processed_img)
-                    print(f"[SAVE] upload_dir={upload_dir}")
-                    print(f"[SAVE] filepath={filepath}")
+            images = iter_base64_array(request.stream, 'images', sink_factory=open_raw_file,
+                                       max_bytes=MAX_FILE_SIZE)
+            try:
+                for raw_file in images:
+                    raw_file.close()
+                    photo_id, raw_path = raw_paths[-1]
+                    # 원본만 저장하고 헤더 검증 (디코딩/리사이즈는 워커 프로세스에서)
+                    validate_raw_image(raw_path)
 
-                    file_url = f'{upload_url}/{filename}'
-                    cursor.execute("""
-                        INSERT INTO car_photos 
-                        (user_id, photo_id, filename, file_path, file_url, file_size, width, height, mime_type)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (user_id, photo_id, filename, filepath, file_url,
-                          len(processed_img), width, height, 'image/jpeg'))
-                    uploaded_count += 1
-                except Exception as e:
-                    print(f"[UPLOAD][JSON] Image processing error: {e}")
-                    # 안전 모드: 명확하게 실패 반환
-                    cursor.close(); conn.close()
-                    return jsonify({'success': False, 'ok': False,
-                                    'error': '이미지 파일만 업로드할 수 있습니다.'}), 415
+                    filename = f"{user_id}_{photo_id}.jpg"
+                    photo_rows.append(new_photo_row(user_id, photo_id, filename, None,
+                                                    os.path.join(upload_dir, filename), f'{upload_url}/{filename}',
+                                                    os.path.getsize(raw_path), 'image/jpeg', 'processing'))
+                    saved_paths.append(raw_path)
+                    jobs[photo_id] = {'photo_id': photo_id, 'filename': filename,
+                                      'kwargs': {'src_path': raw_path, 'blob_root': get_blob_root()}}
+
+                    if current_count + len(photo_rows) >= MAX_PHOTOS_PER_USER or len(jobs) >= pipeline_slots:
+                        break
+            except PayloadTooLarge as e:
+                print(f"[UPLOAD][JSON] {e}")
+                for _, raw_path in raw_paths:
+                    discard_file(raw_path)
+                cursor.close(); conn.close()
+                return jsonify({'success': False, 'ok': False, 'error': str(e)}), 413
+            except Exception as e:
+                print(f"[UPLOAD][JSON] Image processing error: {e}")
+                for _, raw_path in raw_paths:
+                    discard_file(raw_path)
+                # 안전 모드: 명확하게 실패 반환
+                cursor.close(); conn.close()
+                return jsonify({'success': False, 'ok': False,
+                                'error': '이미지 파일만 업로드할 수 있습니다.'}), 415
+            finally:
+                images.close()
 
         # ---- Case 2: multipart/form-data 업로드 (실습/안전 모드 모두) ----
         else:
@@ -178,7 +446,7 @@ def upload_car_photos():
                                 'error': "업로드 파일 필드는 'files' 또는 'photos'로 보내야 합니다."}), 400
 
             for file in files:
-                if current_count + uploaded_count >= MAX_PHOTOS_PER_USER:
+                if current_count + len(photo_rows) >= MAX_PHOTOS_PER_USER:
                     break
                 if not file or not file.filename:
                     continue
@@ -189,6 +457,7 @@ def upload_car_photos():
                 file.seek(0)
                 if raw_size > MAX_FILE_SIZE and not lab_mode:
                     print(f"[UPLOAD] Skip large file: {file.filename} ({raw_size} bytes)")
+                    discard_files(saved_paths)
                     cursor.close(); conn.close()
                     return jsonify({'success': False, 'ok': False,
                                     'error': f'파일 크기 제한 {MAX_FILE_SIZE} 바이트를 초과했습니다.'}), 413
@@ -201,93 +470,85 @@ def upload_car_photos():
                     safe_name = secure_filename(original_filename)  # 경로 탈출 방지
                     filename = f"{user_id}_{photo_id}_{safe_name}"  # 충돌 방지용 접두
 
-                    upload_dir, upload_url = get_upload_paths()
                     filepath = os.path.join(upload_dir, filename)
                     file.save(filepath)
                     print(f"[SAVE] upload_dir={upload_dir}")
                     print(f"[SAVE] filepath={filepath}")
 
-                    file_size = os.path.getsize(filepath)
-                    mime_type = file.mimetype or 'application/octet-stream'
-                    width, height = 0, 0  # 이미지 아닐 수 있음 → 0 기록
+                    # 이미지 아닐 수 있음 → 가로/세로 0 기록
+                    photo_rows.append(new_photo_row(user_id, photo_id, filename, original_filename,
+                                                    filepath, f'{upload_url}/{filename}', os.path.getsize(filepath),
+                                                    file.mimetype or 'application/octet-stream', 'ready'))
+                    saved_paths.append(filepath)
 
                 else:
-                    # === 안전 모드: 이미지만 허용 + JPEG 재인코딩 ===
+                    # === 안전 모드: 이미지만 허용 + JPEG 재인코딩 (워커 프로세스에서) ===
                     # 이미지 MIME이 아니면 즉시 거부 (415)
                     if not (file.mimetype or '').lower().startswith('image/'):
+                        discard_files(saved_paths)
                         cursor.close(); conn.close()
                         return jsonify({'success': False, 'ok': False,
                                         'error': '이미지 파일만 업로드할 수 있습니다.'}), 415
+                    if len(jobs) >= pipeline_slots:
+                        break
+                    raw_path = os.path.join(get_pending_dir(), f"{user_id}_{photo_id}.upload")
                     try:
-                        img_bytes = file.read()
-                        img_b64 = base64.b64encode(img_bytes).decode()
-                        processed_img, width, height, _, _ = resize_image(img_b64)
-
-                        filename = f"{user_id}_{photo_id}.jpg"
-                        upload_dir, upload_url = get_upload_paths()
-                        filepath = os.path.join(upload_dir, filename)
-                        with open(filepath, 'wb') as f:
-                            f.write(processed_img)
-                        print(f"[SAVE] upload_dir={upload_dir}")
-                        print(f"[SAVE] filepath={filepath}")
-
-                        file_size = len(processed_img)
-                        mime_type = 'image/jpeg'
+                        file.save(raw_path)
+                        validate_raw_image(raw_path)
                     except Exception as e:
                         print(f"[UPLOAD][SAFE] File processing error: {e}")
+                        discard_file(raw_path)
+                        discard_files(saved_paths)
                         cursor.close(); conn.close()
                         return jsonify({'success': False, 'ok': False,
                                         'error': '이미지 처리에 실패했습니다.'}), 415
 
-                file_url = f'{upload_url}/{filename}'
-                cursor.execute("""
-                    INSERT INTO car_photos 
-                    (user_id, photo_id, filename, original_filename, file_path, file_url, file_size, width, height, mime_type)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (user_id, photo_id, filename, original_filename, filepath, file_url,
-                      file_size, width, height, mime_type))
-                uploaded_count += 1
+                    filename = f"{user_id}_{photo_id}.jpg"
+                    # 가로/세로는 워커 처리 완료 후 갱신
+                    photo_rows.append(new_photo_row(user_id, photo_id, filename, original_filename,
+                                                    os.path.join(upload_dir, filename), f'{upload_url}/{filename}',
+                                                    raw_size, 'image/jpeg', 'processing'))
+                    saved_paths.append(raw_path)
+                    jobs[photo_id] = {'photo_id': photo_id, 'filename': filename,
+                                      'kwargs': {'src_path': raw_path, 'blob_root': get_blob_root()}}
+
+        # ---- 한 트랜잭션으로 개수 재확인 + 일괄 INSERT ----
+        photo_rows = insert_photo_rows(conn, cursor, user_id, photo_rows, saved_paths)
+        committed = True  # 여기서부터 저장 파일 정리는 insert_photo_rows()가 끝냄
+        cursor.close(); conn.close()
+        if photo_rows is None:
+            return jsonify({'success': False, 'ok': False, 'error': '유효하지 않은 사용자입니다.'}), 403
+        if not photo_rows and saved_paths:
+            return jsonify({'success': False, 'ok': False,
+                            'error': f'최대 {MAX_PHOTOS_PER_USER}장까지만 저장할 수 있습니다.'}), 400
 
-        # 트랜잭션 커밋
-        conn.commit()
+        # 커밋된 행에 대해서만 백그라운드 처리 시작
+        processing_ids = submit_photo_jobs(user_id, photo_rows, jobs)
 
-        # 업데이트된 사진 목록 조회
-        cursor.execute("""
-            SELECT photo_id, filename, original_filename, file_url, file_size, width, height, created_at
-            FROM car_photos 
-            WHERE user_id = %s 
-            ORDER BY created_at DESC
-        """, (user_id,))
-        
-        photos = []
-        for row in cursor.fetchall():
-            photos.append({
-                'id': row['photo_id'],
-                'filename': row['filename'],
-                'original_filename': row.get('original_filename'),
-                'url': row['file_url'],
-                'file_size': row['file_size'],
-                'width': row['width'],
-                'height': row['height'],
-                'created_at': row['created_at'].isoformat()
-            })
+        # 이번에 업로드한 사진 목록 (재조회 없이 메모리의 행으로 구성)
+        photos = [uploaded_photo(row) for row in photo_rows]
 
-        cursor.close(); conn.close()
+        uploaded_count = len(photo_rows)
         return jsonify({
             'success': True, 'ok': True,
             'message': f'{uploaded_count}개의 파일이 업로드되었습니다.',
             'photos': photos,
+            'processing_ids': processing_ids,  # 백그라운드 처리 중인 사진
             'uploaded_count': uploaded_count,
             'uploadedCount': uploaded_count  # 프론트 호환용
         })
 
     except Exception as e:
+        if not committed and 'saved_paths' in locals():
+            # 커밋 전에 실패한 경우 저장한 파일 정리 (행은 롤백됨)
+            discard_files(saved_paths)
         if 'cursor' in locals(): cursor.close()
         if 'conn' in locals(): conn.close()
         return jsonify({'success': False, 'ok': False, 'error': f'업로드 실패: {str(e)}'}), 500
 
 @photo_bp.route('/api/car-photos', methods=['GET'])
 @login_required
+@conditional_json()
 def get_car_photos():
     """사용자의 차량 사진 목록 조회"""
     try:
@@ -306,23 +567,29 @@ def get_car_photos():
             cursor.close(); conn.close()
             return jsonify({'success': False, 'ok': False, 'error': '유효하지 않은 사용자입니다.'}), 403
         cursor.execute("""
-            SELECT photo_id, filename, original_filename, file_url, file_size, width, height, is_main, created_at
+            SELECT photo_id, filename, original_filename, file_url, blob_hash, file_size, width, height, status, is_main, created_at
             FROM car_photos 
             WHERE user_id = %s 
             ORDER BY created_at DESC
         """, (user_id,))
         
+        rows = cursor.fetchall()
+        _, upload_url = get_upload_paths()
+        srcsets = load_srcsets(cursor, user_id, upload_url)
+
         photos = []
         main_photo_id = None
-        for row in cursor.fetchall():
+        for row in rows:
             photos.append({
                 'id': row['photo_id'],
                 'filename': row['filename'],
                 'original_filename': row.get('original_filename'),
-                'url': row['file_url'],
+                'url': photo_url(row),
+                'srcset': srcsets.get(row['photo_id'], {}),  # {'jpeg'|'webp': {'160': {url, width}, ...}}
                 'file_size': row['file_size'],
                 'width': row['width'],
                 'height': row['height'],
+                'status': row['status'],  # processing / ready / failed
                 'created_at': row['created_at'].isoformat()
             })
             if row['is_main']:
@@ -410,7 +677,7 @@ def delete_car_photo(photo_id):
             cursor.close(); conn.close()
             return jsonify({'success': False, 'ok': False, 'error': '유효하지 않은 사용자입니다.'}), 403
         cursor.execute("""
-            SELECT filename, file_path, is_main 
+            SELECT filename, is_main 
             FROM car_photos 
             WHERE user_id = %s AND photo_id = %s
         """, (user_id, photo_id))
@@ -419,17 +686,17 @@ def delete_car_photo(photo_id):
             cursor.close(); conn.close()
             return jsonify({'success': False, 'ok': False, 'error': '존재하지 않는 사진이거나 접근 권한이 없습니다.'}), 404
 
+        # 전체 삭제와 같은 방식 - 행 삭제와 파일 삭제 예약(tombstone)을 한 트랜잭션으로 처리
+        conn.begin()
+        file_paths, blob_hashes = collect_photo_files(cursor, user_id, photo_id)
+        orphan_blobs = PhotoBlob.decrement(cursor, blob_hashes)
+        PhotoGC.enqueue(cursor, [(path, None) for path in file_paths]
+                        + [(row['file_path'], row['hash']) for row in orphan_blobs])
         cursor.execute("""
             DELETE FROM car_photos 
             WHERE user_id = %s AND photo_id = %s
         """, (user_id, photo_id))
 
-        try:
-            if os.path.exists(photo_info['file_path']):
-                os.remove(photo_info['file_path'])
-        except:
-            pass  # 파일 삭제 실패해도 DB 삭제는 유지
-
         if photo_info['is_main']:
             cursor.execute("""
                 UPDATE car_photos 
@@ -440,9 +707,10 @@ def delete_car_photo(photo_id):
             """, (user_id,))
 
         conn.commit()
+        PhotoGC.wake()
 
         cursor.execute("""
-            SELECT photo_id, filename, file_url, file_size, is_main, created_at
+            SELECT photo_id, filename, file_url, blob_hash, file_size, is_main, created_at
             FROM car_photos 
             WHERE user_id = %s 
             ORDER BY created_at DESC
@@ -453,7 +721,7 @@ def delete_car_photo(photo_id):
             photos.append({
                 'id': row['photo_id'],
                 'filename': row['filename'],
-                'url': row['file_url'],
+                'url': photo_url(row),
                 'file_size': row['file_size'],
                 'created_at': row['created_at'].isoformat()
             })
@@ -493,23 +761,24 @@ def clear_all_photos():
         if not cursor.fetchone():
             cursor.close(); conn.close()
             return jsonify({'success': False, 'ok': False, 'error': '유효하지 않은 사용자입니다.'}), 403
-        cursor.execute("SELECT file_path FROM car_photos WHERE user_id = %s", (user_id,))
-        file_paths = [row['file_path'] for row in cursor.fetchall()]
-
+        # 행 삭제와 파일 삭제 예약(tombstone)을 한 트랜잭션으로 처리하고 바로 반환
+        # 실제 파일 삭제는 백그라운드 스위퍼가 배치로 수행 (요청이 중간에 끊겨도 고아 파일이 남지 않음)
+        conn.begin()
+        cursor.execute("SELECT COUNT(*) AS count FROM car_photos WHERE user_id = %s", (user_id,))
+        photo_count = cursor.fetchone()['count']
+
+        file_paths, blob_hashes = collect_photo_files(cursor, user_id)
+        orphan_blobs = PhotoBlob.decrement(cursor, blob_hashes)
+        PhotoGC.enqueue(cursor, [(path, None) for path in file_paths]
+                        + [(row['file_path'], row['hash']) for row in orphan_blobs])
         cursor.execute("DELETE FROM car_photos WHERE user_id = %s", (user_id,))
         conn.commit()
-
-        for file_path in file_paths:
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except:
-                pass
+        PhotoGC.wake()
 
         cursor.close(); conn.close()
         return jsonify({
             'success': True, 'ok': True,
-            'message': f'{len(file_paths)}개의 사진이 모두 삭제되었습니다.',
+            'message': f'{photo_count}개의 사진이 모두 삭제되었습니다.',
             'photos': [],
             'main_photo_id': None,
             'mainPhotoId': None
@@ -520,8 +789,94 @@ def clear_all_photos():
         if 'conn' in locals(): conn.close()
         return jsonify({'success': False, 'ok': False, 'error': f'전체 삭제 실패: {str(e)}'}), 500
 
+def pick_variant(variants):
+    """Accept 헤더(WebP 지원)와 가로폭 힌트(?w= 또는 Width/Sec-CH-Width)로 가장 알맞은 변형 선택
+
+    variants: {(크기 등급, 포맷): 파일 경로}
+    """
+    accepts_webp = 'image/webp' in request.headers.get('Accept', '')
+    width_hint = (request.args.get('w', type=int)
+                  or request.headers.get('Sec-CH-Width', type=int)
+                  or request.headers.get('Width', type=int))
+    if not accepts_webp and not width_hint:
+        return None
+
+    formats = ['webp', 'jpeg'] if accepts_webp else ['jpeg']
+    if width_hint:
+        # 힌트 이상인 가장 작은 등급부터, 없으면 큰 등급부터 내려가며 탐색
+        classes = [c for c in VARIANT_WIDTHS if c >= width_hint] + \
+                  sorted((c for c in VARIANT_WIDTHS if c < width_hint), reverse=True)
+    else:
+        classes = sorted(VARIANT_WIDTHS, reverse=True)
+
+    for size_class in classes:
+        for fmt in formats:
+            if (size_class, fmt) in variants:
+                return size_class, fmt
+    return None
+
+def photo_url(row):
+    """목록 응답용 사진 URL - 처리 완료 사진은 내용 해시를 ?v= 로 붙여 immutable 캐시 가능하게 함"""
+    if row.get('blob_hash'):
+        return f"{row['file_url']}?v={row['blob_hash'][:PHOTO_VERSION_LENGTH]}"
+    return row['file_url']
+
+def blob_etag(path):
+    """블롭 파일명(<sha256>.<ext>)의 해시를 강한 ETag로 사용 (내용이 같으면 같은 ETag)"""
+    return os.path.splitext(os.path.basename(path))[0]
+
 # 업로드된 파일을 /uploads/... 로 서빙하는 라우트
 @photo_bp.get('/uploads/car_photos/<path:filename>')
 def serve_uploaded_photo(filename):
     upload_dir, _ = get_upload_paths()
-    return send_from_directory(upload_dir, filename)
+    uploads_root = os.path.dirname(upload_dir)
+    # 처리 완료된 사진은 블롭 저장소에 있으므로 파일명으로 본 파일/변형 위치를 찾아 클라이언트에 맞게 선택
+    if filename.lower().endswith('.jpg'):
+        rows = DatabaseHelper.execute_query("""
+            SELECT p.file_path, p.blob_hash, v.size_class, v.format, v.file_path AS variant_path
+            FROM car_photos p
+            LEFT JOIN car_photo_variants v ON v.user_id = p.user_id AND v.photo_id = p.photo_id
+            WHERE p.filename = %s AND p.status = 'ready'
+        """, (filename,))
+        if rows:
+            variants = {(row['size_class'], row['format']): row['variant_path']
+                        for row in rows if row['variant_path']}
+            choice = pick_variant(variants)
+            path = variants[choice] if choice else rows[0]['file_path']
+            if os.path.isfile(path):
+                mime_type = VARIANT_FORMATS[choice[1]][2] if choice else 'image/jpeg'
+                # ?v= 가 현재 내용 해시와 같으면 URL 자체가 버전이므로 재검증 없이 장기 캐시
+                version = request.args.get('v')
+                blob_hash = rows[0]['blob_hash']
+                immutable = bool(version and blob_hash and version == blob_hash[:PHOTO_VERSION_LENGTH])
+                response = file_response(
+                    path, mimetype=mime_type,
+                    etag=blob_etag(path) if blob_hash else True,
+                    max_age=IMMUTABLE_MAX_AGE if immutable else PHOTO_REVALIDATE_MAX_AGE,
+                    immutable=immutable,
+                    accel_path=os.path.relpath(path, uploads_root),
+                    vary='Accept'
+                )
+                for header in PHOTO_WIDTH_HINTS:
+                    response.vary.add(header)
+                # 브라우저가 다음 요청부터 가로폭 힌트를 보내도록 요청
+                response.headers['Accept-CH'] = ', '.join(PHOTO_WIDTH_HINTS)
+                return response
+
+    # 블롭 저장소 이전 파일 / 실습 모드 원본
+    path = safe_join(upload_dir, filename)
+    if not path or not os.path.isfile(path):
+        abort(404)
+    return file_response(path, max_age=PHOTO_REVALIDATE_MAX_AGE,
+                         accel_path=os.path.relpath(path, uploads_root))
+
+# 블롭 저장소 파일 서빙 (내용 해시 경로라 URL이 바뀌지 않는 한 내용도 바뀌지 않음)
+@photo_bp.get('/uploads/blobs/<path:blob_path>')
+def serve_photo_blob(blob_path):
+    blob_root = get_blob_root()
+    path = safe_join(blob_root, blob_path)
+    if blob_path.startswith('tmp/') or not path or not os.path.isfile(path):
+        # 워커가 스테이징 중인 파일은 노출하지 않음
+        abort(404)
+    return file_response(path, etag=blob_etag(path), max_age=IMMUTABLE_MAX_AGE, immutable=True,
+                         accel_path=os.path.relpath(path, os.path.dirname(blob_root)))
@@ -1,94 +1,123 @@
 from flask import Blueprint, request, render_template, render_template_string, jsonify, current_app
-import pymysql
 import os
 import subprocess
 from datetime import datetime
 from dotenv import load_dotenv
+from models.spec_catalog import SpecCatalog
+from utils.image_manifest import ImageManifest
+from utils.page_cache import PageCache
+from utils.http_cache import make_etag, conditional_response
 
 load_dotenv()
 
 spec_bp = Blueprint('spec', __name__)
 
-def get_db_connection():
-    """connected_car_service 데이터베이스 연결"""
-    return pymysql.connect(
-        host=os.getenv('DB_HOST', 'localhost'),
-        port=int(os.getenv('DB_PORT', 3307)),
-        user=os.getenv('DB_USER', 'admin'),
-        password=os.getenv('DB_PASSWORD', 'STRONGMAN'),
-        database='connected_car_service',
-        charset='utf8mb4',
-        cursorclass=pymysql.cursors.DictCursor
-    )
+# 스펙 페이지 렌더링 캐시 (가장 많이 크롤링되는 공개 페이지)
+# 카탈로그/이미지 매니페스트 버전이 바뀌면 엔트리가 자동 만료됨
+spec_page_cache = PageCache(
+    max_entries=int(os.getenv('SPEC_PAGE_CACHE_ENTRIES', '512')),
+    max_bytes=int(os.getenv('SPEC_PAGE_CACHE_BYTES', str(8 * 1024 * 1024)))
+)
+SPEC_PAGE_MAX_AGE = int(os.getenv('SPEC_PAGE_MAX_AGE', '60'))
+# 검색 결과 페이지는 목록 부분만 캐시하고, 요청마다 렌더링하는 헤더(검색 시간 포함)를 이 자리에 끼워 넣음
+_SEARCH_HEADER_SLOT = '<!--spec-search-header-->'
 
 @spec_bp.route('/spec')
 def spec_search_page():
     """차종 스펙 검색 메인 페이지"""
     return render_template('spec_search.html')
 
+def _spec_data_version():
+    """스펙 페이지 데이터 버전 - 카탈로그 또는 이미지 매니페스트가 바뀌면 달라짐"""
+    return f'{SpecCatalog.version()}:{ImageManifest.version()}'
+
+def _cached_page_response(entry):
+    """캐시 엔트리를 ETag/Last-Modified 포함 HTML 응답으로 변환 (조건부 요청이면 304)"""
+    return conditional_response(
+        entry['body'],
+        mimetype='text/html',
+        etag=entry['etag'],
+        last_modified=entry['last_modified'],
+        cache_control=f'public, max-age={SPEC_PAGE_MAX_AGE}'
+    )
+
+def _render_and_cache(key, version, template_name, **context):
+    """템플릿 렌더링 후 캐시에 저장"""
+    body = render_template(template_name, **context).encode('utf-8')
+    entry = spec_page_cache.set(key, body, version=version, etag=make_etag(version, body))
+    return _cached_page_response(entry)
+
 @spec_bp.route('/spec/search')
 def search_specs():
     """차종 스펙 검색 결과 페이지 - SSTI 취약점 존재"""
-    search_query = request.args.get('q', '').strip()
+    # 공백 정규화한 검색어 + 필터를 캐시 키로 사용
+    search_query = ' '.join(request.args.get('q', '').split())
     filter_type = request.args.get('filter', 'all')
     
     if not search_query:
         return render_template('spec_search.html', error="검색어를 입력해주세요.")
     
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            # vehicle_specs 테이블에서 검색
-            if filter_type == 'model':
-                sql = "SELECT * FROM vehicle_specs WHERE model LIKE %s ORDER BY id DESC" 
-                cursor.execute(sql, (f'%{search_query}%',))
-            else:
-                # 전체 검색
-                sql = """SELECT * FROM vehicle_specs 
-                        WHERE model LIKE %s OR category LIKE %s OR engine_type LIKE %s 
-                        ORDER BY id DESC"""
-                cursor.execute(sql, (f'%{search_query}%', f'%{search_query}%', f'%{search_query}%'))
-            
-            specs = cursor.fetchall()
-            
-            # SSTI 취약점: 사용자 입력을 템플릿에 직접 삽입!
-            if specs:
-                result_message = f"'{search_query}' 검색 결과 {len(specs)}개의 차종을 찾았습니다."
-            else:
-                result_message = f"'{search_query}' 검색 결과가 없습니다. 다른 검색어를 시도해보세요."
-            
-            # 동적 HTML 생성으로 SSTI 취약점 발생!
-            html_template = f"""
-            <div class="search-result-header">
-                <h2>차종 스펙 검색 결과</h2>
-                <p class="result-summary">{result_message}</p>
-                <div class="search-stats">
-                    검색어: <strong>{search_query}</strong> | 
-                    필터: <strong>{filter_type}</strong> |
-                    검색 시간: {{{{ datetime.now().strftime('%Y-%m-%d %H:%M:%S') }}}}
-                </div>
+        version = _spec_data_version()
+        cache_key = ('search', search_query, filter_type)
+        cached = spec_page_cache.get(cache_key, version)
+        if cached:
+            specs_count = cached['specs_count']
+        else:
+            # 인메모리 카탈로그에서 검색 (filter=model 이면 모델명만, 그 외 전체 검색)
+            specs = SpecCatalog.search(search_query, filter_type)
+            specs_count = len(specs)
+            body = render_template('spec_results.html',
+                                   specs=specs,
+                                   search_query=search_query,
+                                   filter_type=filter_type,
+                                   dynamic_header=_SEARCH_HEADER_SLOT).encode('utf-8')
+            cached = spec_page_cache.set(cache_key, body, version=version, etag=make_etag(version, body),
+                                         specs_count=specs_count)
+        
+        # SSTI 취약점: 사용자 입력을 템플릿에 직접 삽입!
+        if specs_count:
+            result_message = f"'{search_query}' 검색 결과 {specs_count}개의 차종을 찾았습니다."
+        else:
+            result_message = f"'{search_query}' 검색 결과가 없습니다. 다른 검색어를 시도해보세요."
+        
+        # 동적 HTML 생성으로 SSTI 취약점 발생!
+        html_template = f"""
+        <div class="search-result-header">
+            <h2>차종 스펙 검색 결과</h2>
+            <p class="result-summary">{result_message}</p>
+            <div class="search-stats">
+                검색어: <strong>{search_query}</strong> | 
+                필터: <strong>{filter_type}</strong> |
+                검색 시간: {{{{ datetime.now().strftime('%Y-%m-%d %H:%M:%S') }}}}
             </div>
-            """
-            dynamic_header = render_template_string(
-                html_template, 
-                datetime=datetime,
-                config=current_app.config,
-                request=request,
-                os=os,
-                subprocess=subprocess,
-                __builtins__=__builtins__,
-                eval=eval,
-                exec=exec,
-                open=open,
-                __import__=__import__
-            )
-            
-            conn.close()
-            return render_template('spec_results.html', 
-                                 specs=specs, 
-                                 search_query=search_query,
-                                 filter_type=filter_type,
-                                 dynamic_header=dynamic_header)
+        </div>
+        """
+        dynamic_header = render_template_string(
+            html_template, 
+            datetime=datetime,
+            config=current_app.config,
+            request=request,
+            os=os,
+            subprocess=subprocess,
+            __builtins__=__builtins__,
+            eval=eval,
+            exec=exec,
+            open=open,
+            __import__=__import__
+        )
+        
+        # ETag/Last-Modified는 캐시된 목록 기준 - 검색 시간만 바뀐 페이지는 304로 재검증
+        # (헤더에 요청 시각이 들어가므로 max-age 없이 매번 재검증)
+        body = cached['body'].replace(_SEARCH_HEADER_SLOT.encode('utf-8'), dynamic_header.encode('utf-8'), 1)
+        return conditional_response(
+            body,
+            mimetype='text/html',
+            etag=cached['etag'],
+            weak=True,  # 검색 시간이 달라 바이트 단위로는 같지 않음
+            last_modified=cached['last_modified'],
+            cache_control='public, no-cache'
+        )
             
     except Exception as e:
         return render_template('spec_search.html', error=f"검색 중 오류가 발생했습니다: {str(e)}")
@@ -97,46 +126,56 @@ def search_specs():
 def spec_detail(spec_id):
     """차종 상세 정보 페이지"""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT * FROM vehicle_specs WHERE id = %s", (spec_id,))
-            spec = cursor.fetchone()
-            
-            if not spec:
-                return render_template('spec_search.html', error="해당 차종 정보를 찾을 수 없습니다.")
-            
-            # main_car_images 폴더에서 해당 모델 ID와 일치하는 이미지 찾기
-            import os
-            import glob
-            
-            main_images_path = os.path.join('static', 'assets', 'cars', 'main_car_images')
-            model_id = spec["id"]
-            
-            # 해당 모델 ID로 시작하는 이미지 파일들 찾기 (예: 1.jpg, 1_1.jpg, 1_2.jpg 등)
-            image_patterns = [
-                f"{model_id}.jpg",
-                f"{model_id}_*.jpg"
-            ]
-            
-            photos = []
-            for pattern in image_patterns:
-                full_pattern = os.path.join(main_images_path, pattern)
-                matching_files = glob.glob(full_pattern)
-                for file_path in matching_files:
-                    filename = os.path.basename(file_path)
-                    photos.append({
-                        'filename': filename,
-                        'file_path': f'/static/assets/cars/main_car_images/{filename}',
-                        'description': f'{spec["model"]} 차량 이미지'
-                    })
-            
-            # Hero 배경용 메인 이미지 찾기
-            hero_image = None
-            if photos:
-                hero_image = photos[0]['file_path']  # 첫 번째 이미지를 Hero 배경으로 사용
-            
-            conn.close()
-            return render_template('spec_detail.html', spec=spec, photos=photos, hero_image=hero_image)
+        version = _spec_data_version()
+        cache_key = ('detail', spec_id)
+        cached = spec_page_cache.get(cache_key, version)
+        if cached:
+            return _cached_page_response(cached)
+
+        spec = SpecCatalog.get(spec_id)
+        
+        if not spec:
+            return render_template('spec_search.html', error="해당 차종 정보를 찾을 수 없습니다.")
+        
+        # 시작 시 인덱싱된 이미지 매니페스트에서 해당 모델 이미지 조회 (파일시스템 접근 없음)
+        photos = []
+        for image in ImageManifest.get_images(spec["id"], 'main'):
+            photos.append({
+                'filename': image['filename'],
+                'file_path': image['file_path'],
+                'width': image['width'],
+                'height': image['height'],
+                'description': f'{spec["model"]} 차량 이미지'
+            })
+        
+        # Hero 배경용 메인 이미지 찾기
+        hero_image = None
+        if photos:
+            hero_image = photos[0]['file_path']  # 첫 번째 이미지를 Hero 배경으로 사용
+        
+        return _render_and_cache(cache_key, version, 'spec_detail.html',
+                                 spec=spec, photos=photos, hero_image=hero_image)
             
     except Exception as e:
-        return render_template('spec_search.html', error=f"상세 정보 조회 중 오류가 발생했습니다: {str(e)}")
\ No newline at end of file
+        return render_template('spec_search.html', error=f"상세 정보 조회 중 오류가 발생했습니다: {str(e)}")
+
+@spec_bp.route('/api/car-images', methods=['GET'])
+def get_car_image_manifest():
+    """차량 이미지 매니페스트 전체 조회 (모델별 이미지/크기/해시)"""
+    return jsonify({
+        'success': True,
+        'data': ImageManifest.to_dict()
+    })
+
+@spec_bp.route('/api/car-images/<int:model_id>', methods=['GET'])
+def get_car_images(model_id):
+    """모델별 차량 이미지 조회 (main/control)"""
+    return jsonify({
+        'success': True,
+        'data': {
+            'model_id': model_id,
+            'main': ImageManifest.get_images(model_id, 'main'),
+            'control': ImageManifest.get_images(model_id, 'control'),
+            'version': ImageManifest.version()
+        }
+    })
@@ -0,0 +1,131 @@
+# controllers/upload_controller.py - 이어 올리기(resumable) 청크 업로드
+#  1. POST   /api/uploads                  세션 생성 {kind: photo|video, filename, size, sha256?, chunk_size?}
+#  2. PUT    /api/uploads/<id>?offset=N    청크 전송 (본문 = 원시 바이트, X-Chunk-SHA256 헤더로 검증)
+#                                          오프셋만 다르면 순서 무관 / 병렬 전송 가능
+#  3. GET    /api/uploads/<id>             받은 구간/빠진 구간 조회 (연결이 끊긴 뒤 이어 올릴 위치)
+#  4. POST   /api/uploads/<id>/complete    완료 - 사진은 이미지 파이프라인, 영상은 영상 디렉토리로 넘김
+#     DELETE /api/uploads/<id>             취소
+import os
+from flask import Blueprint, request, jsonify, session, current_app
+from utils.auth import login_required
+from utils.resumable_upload import ResumableUploads, UploadError
+from controllers.photo_controller import ingest_photo_file, MAX_FILE_SIZE
+from controllers.video_controller import ingest_video_file, VIDEO_MAX_SIZE
+
+upload_bp = Blueprint('upload', __name__)
+
+# 업로드 종류별 최대 크기 / 완료 처리 함수
+UPLOAD_KINDS = {
+    'photo': (MAX_FILE_SIZE, ingest_photo_file),
+    'video': (VIDEO_MAX_SIZE, ingest_video_file)
+}
+
+def get_upload_store():
+    """세션 저장 경로: <앱루트>/uploads/sessions (서빙 경로 밖)"""
+    return ResumableUploads(os.path.join(current_app.root_path, 'uploads', 'sessions'))
+
+def upload_error(e):
+    return jsonify({'success': False, 'ok': False, 'error': str(e)}), e.status
+
+@upload_bp.route('/api/uploads', methods=['POST'])
+@login_required
+def create_upload():
+    """업로드 세션 생성"""
+    data = request.get_json(silent=True) or {}
+    kind = data.get('kind')
+    if kind not in UPLOAD_KINDS:
+        return jsonify({'success': False, 'ok': False,
+                        'error': "kind는 'photo' 또는 'video'여야 합니다."}), 400
+    try:
+        size = int(data.get('size') or 0)
+        chunk_size = int(data['chunk_size']) if data.get('chunk_size') is not None else None
+        # 영상은 촬영 차량을 지정할 수 있음 (완료 시 소유 여부 확인)
+        extra = {'car_id': int(data['car_id'])} if kind == 'video' and data.get('car_id') else {}
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'ok': False, 'error': '요청 값이 올바르지 않습니다.'}), 400
+
+    try:
+        meta = get_upload_store().create(session.get('user_id'), kind, data.get('filename'), size,
+                                         UPLOAD_KINDS[kind][0], sha256=data.get('sha256'),
+                                         chunk_size=chunk_size, extra=extra)
+    except UploadError as e:
+        return upload_error(e)
+
+    return jsonify({
+        'success': True, 'ok': True,
+        'upload_id': meta['upload_id'],
+        'upload_url': f"/api/uploads/{meta['upload_id']}",
+        'chunk_size': meta['chunk_size'],
+        'size': meta['size'],
+        'expires_at': meta['expires_at']
+    }), 201
+
+@upload_bp.route('/api/uploads/<upload_id>', methods=['PUT'])
+@login_required
+def put_upload_chunk(upload_id):
+    """청크 1개 기록 - 본문을 메모리에 모으지 않고 읽는 대로 파일 오프셋에 씀"""
+    offset = request.args.get('offset', type=int)
+    length = request.content_length
+    if offset is None or not length:
+        return jsonify({'success': False, 'ok': False,
+                        'error': 'offset 쿼리와 Content-Length 헤더가 필요합니다.'}), 400
+    try:
+        status = get_upload_store().write_chunk(upload_id, session.get('user_id'), offset, length,
+                                                request.stream,
+                                                checksum=request.headers.get('X-Chunk-SHA256'))
+    except UploadError as e:
+        return upload_error(e)
+    return jsonify(dict(status, success=True, ok=True))
+
+@upload_bp.route('/api/uploads/<upload_id>', methods=['GET'])
+@login_required
+def get_upload_status(upload_id):
+    """업로드 진행 상태 (받은 구간/빠진 구간)"""
+    try:
+        status = get_upload_store().status(upload_id, session.get('user_id'))
+    except UploadError as e:
+        return upload_error(e)
+    return jsonify(dict(status, success=True, ok=True))
+
+@upload_bp.route('/api/uploads/<upload_id>', methods=['DELETE'])
+@login_required
+def abort_upload(upload_id):
+    """업로드 취소"""
+    try:
+        get_upload_store().abort(upload_id, session.get('user_id'))
+    except UploadError as e:
+        return upload_error(e)
+    return jsonify({'success': True, 'ok': True, 'message': '업로드가 취소되었습니다.'})
+
+@upload_bp.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+@login_required
+def complete_upload(upload_id):
+    """업로드 완료 - 전체 구간/체크섬 확인 후 종류별 처리 함수로 넘김"""
+    user_id = session.get('user_id')
+    store = get_upload_store()
+    try:
+        meta, path = store.finalize(upload_id, user_id)
+    except UploadError as e:
+        return upload_error(e)
+
+    try:
+        payload, status = UPLOAD_KINDS[meta['kind']][1](user_id, path, meta['filename'],
+                                                        **meta.get('extra', {}))
+    except Exception as e:
+        # 일시적 오류(DB 등)일 수 있으므로 받은 데이터는 남겨 완료 요청만 다시 할 수 있게 함
+        # (처리 함수는 실패 시 파일을 세션 위치로 되돌려 둠)
+        print(f"[UPLOAD] finalize {upload_id} failed: {e}")
+        store.reopen(upload_id)
+        return jsonify({'success': False, 'ok': False, 'upload_id': upload_id,
+                        'error': f'업로드 처리 실패: {str(e)}'}), 500
+
+    # 성공/거부 모두 세션 종료 (대기열이 가득 찬 경우와 예기치 않은 오류만 세션을 남겨 다시 완료 요청 가능)
+    if status == 503:
+        store.reopen(upload_id)
+    else:
+        store.release(upload_id)
+    payload['upload_id'] = upload_id
+    response = jsonify(payload)
+    if status == 503:
+        response.headers['Retry-After'] = '5'
+    return response, status
@@ -6,6 +6,7 @@ from models.car_history import CarHistory
 from utils.auth import login_required
 import requests
 import json
+import logging
 import os
 from datetime import datetime
 from dotenv import load_dotenv
@@ -14,21 +15,21 @@ from dotenv import load_dotenv
 load_dotenv()
 
 vehicle_api_bp = Blueprint('vehicle_api', __name__)
+logger = logging.getLogger(__name__)
 
 # car-api 서버 설정 (환경변수 사용)
 CAR_API_BASE_URL = os.getenv('CAR_API_BASE_URL', 'http://localhost:8000')  # 로컬 환경으로 수정
 CAR_API_TIMEOUT = int(os.getenv('CAR_API_TIMEOUT', '10'))
 
 # 디버그: 환경변수 확인
-print(f"[DEBUG] CAR_API_BASE_URL: {CAR_API_BASE_URL}")
-print(f"[DEBUG] CAR_API_TIMEOUT: {CAR_API_TIMEOUT}")
+logger.debug("CAR_API_BASE_URL: %s, CAR_API_TIMEOUT: %s", CAR_API_BASE_URL, CAR_API_TIMEOUT)
 
 # car-api 서버 통신 헬퍼 함수
 def call_car_api(endpoint, method='GET', data=None, timeout=CAR_API_TIMEOUT):
     """car-api 서버 HTTP 통신 헬퍼"""
     try:
         url = f'{CAR_API_BASE_URL}{endpoint}'
-        print(f"[DEBUG] car-api 요청: {method} {url}")  # 디버그 로그
+        logger.debug("car-api 요청: %s %s", method, url)
         
         if method == 'GET':
             response = requests.get(url, timeout=timeout)
@@ -39,27 +40,28 @@ def call_car_api(endpoint, method='GET', data=None, timeout=CAR_API_TIMEOUT):
         else:
             raise ValueError(f'지원하지 않는 HTTP 메서드: {method}')
         
-        print(f"[DEBUG] car-api 응답: {response.status_code}")  # 디버그 로그
+        logger.debug("car-api 응답: %s", response.status_code)
         response.raise_for_status()
         result = response.json()
-        print(f"[DEBUG] car-api 데이터: {result}")  # 디버그 로그
+        # 응답 본문은 DEBUG 레벨이 켜져 있을 때만 문자열로 만들어짐
+        logger.debug("car-api 데이터: %s", result)
         return result
         
     except requests.ConnectionError as e:
         error_msg = f'car-api 서버에 연결할 수 없습니다: {str(e)}'
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         return {'success': False, 'error': error_msg}
     except requests.Timeout as e:
         error_msg = f'car-api 서버 응답 시간 초과: {str(e)}'
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         return {'success': False, 'error': error_msg}
     except requests.HTTPError as e:
         error_msg = f'car-api 서버 HTTP 오류: {e.response.status_code}'
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         return {'success': False, 'error': error_msg}
     except Exception as e:
         error_msg = f'통신 오류: {str(e)}'
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         return {'success': False, 'error': error_msg}
 
 # 실시간 차량 상태 조회 API
@@ -103,14 +105,13 @@ def get_vehicle_status(vehicle_id):
 def control_vehicle(vehicle_id):
     """car-api로 차량 원격 제어 명령 전송 (새 명세에 맞게)"""
     try:
-        print(f"[DEBUG] Control Vehicle 시작 - vehicle_id: {vehicle_id}")
+        logger.debug("Control Vehicle 시작 - vehicle_id: %s", vehicle_id)
         
         user_id = session.get('user_id')
-        print(f"[DEBUG] user_id: {user_id}")
+        logger.debug("user_id: %s", user_id)
         
         data = request.get_json()
-        print(f"[DEBUG] Request data: {data}")
-        print(f"[DEBUG] Session data: {dict(session)}")
+        logger.debug("Request data: %s", data)
         
         # 필수 필드 검증
         if not data or not data.get('property') or 'value' not in data:
@@ -118,7 +119,7 @@ def control_vehicle(vehicle_id):
         
         # 소유권 확인
         ownership_check = Car.verify_ownership(user_id, vehicle_id)
-        print(f"[DEBUG] Ownership check result: {ownership_check}")
+        logger.debug("Ownership check result: %s", ownership_check)
         
         if not ownership_check:
             return jsonify({'error': '해당 차량에 대한 권한이 없습니다'}), 403
@@ -166,11 +167,11 @@ def control_vehicle(vehicle_id):
             try:
                 api_response = call_car_api('/api/vehicle/control', 'POST', control_data)
                 if attempt > 0:
-                    print(f"[SUCCESS] car-api 재시도 성공 (시도 {attempt + 1}/3)")
+                    logger.info("car-api 재시도 성공 (시도 %d/3)", attempt + 1)
                 break  # 성공하면 루프 종료
             except Exception as e:
                 last_error = e
-                print(f"[WARNING] car-api 요청 실패 (시도 {attempt + 1}/3): {e}")
+                logger.warning("car-api 요청 실패 (시도 %d/3): %s", attempt + 1, e)
                 if attempt < 2:  # 마지막 시도가 아니면 재시도
                     import time
                     time.sleep(0.2 * (attempt + 1))  # 점진적 대기 (0.2초, 0.4초)
@@ -208,10 +209,7 @@ def control_vehicle(vehicle_id):
         })
         
     except Exception as e:
-        print(f"[ERROR] Control Vehicle 예외 발생: {str(e)}")
-        print(f"[ERROR] Exception type: {type(e).__name__}")
-        import traceback
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        logger.exception("Control Vehicle 예외 발생 (%s): %s", type(e).__name__, e)
         
         # 실패 이력도 저장
         try:
@@ -224,7 +222,7 @@ def control_vehicle(vehicle_id):
                     result='error'
                 )
         except Exception as history_error:
-            print(f"[ERROR] 이력 저장 실패: {history_error}")
+            logger.error("이력 저장 실패: %s", history_error)
         
         return jsonify({'error': f'차량 제어 실패: {str(e)}'}), 500
 
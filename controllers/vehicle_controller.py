@@ -3,9 +3,10 @@
 from flask import Blueprint, jsonify, request, session
 from models.car import Car
 from models.car_history import CarHistory
-from models.vehicle_spec import VehicleSpec
+from models.spec_catalog import SpecCatalog, MAX_COMPARE_SPECS
 from models.base import DatabaseHelper
 from utils.auth import login_required
+from utils.http_cache import conditional_json
 import json
 import os
 from datetime import datetime
@@ -355,19 +356,20 @@ def get_car_diagnostics(car_id):
     except Exception as e:
         return jsonify({'error': f'진단 정보 조회 실패: {str(e)}'}), 500
 
-# 차량 스펙 정보 조회 API (MySQL 기반)
+# 차량 스펙 정보 조회 API (캐시된 카탈로그 기반 - ETag 버전과 본문이 같은 스냅샷)
 @vehicle_bp.route('/api/vehicle-specs', methods=['GET'])
 @login_required
+@conditional_json(version=SpecCatalog.version)
 def get_vehicle_specs():
-    """모든 차량 스펙 정보 조회 (MySQL 기반)"""
+    """모든 차량 스펙 정보 조회 (캐시된 카탈로그 기반)"""
     try:
         # 카테고리 필터
         category = request.args.get('category')
         
         if category:
-            specs = VehicleSpec.get_by_category(category)
+            specs = SpecCatalog.get_by_category(category)
         else:
-            specs = VehicleSpec.get_all()
+            specs = SpecCatalog.get_all()
         
         return jsonify({
             'success': True,
@@ -378,13 +380,54 @@ def get_vehicle_specs():
     except Exception as e:
         return jsonify({'error': f'차량 스펙 조회 실패: {str(e)}'}), 500
 
-# 특정 차량 스펙 조회 API (MySQL 기반)
+# 차량 스펙 비교 API (캐시된 카탈로그 기반)
+@vehicle_bp.route('/api/vehicle-specs/compare', methods=['GET'])
+@login_required
+@conditional_json(version=SpecCatalog.version)
+def compare_vehicle_specs():
+    """여러 차량 스펙을 한 번에 비교 (ids=1,2,3 또는 ids=1&ids=2)"""
+    try:
+        raw_ids = []
+        for value in request.args.getlist('ids'):
+            raw_ids.extend(part.strip() for part in value.split(',') if part.strip())
+
+        spec_ids = []
+        for raw_id in raw_ids:
+            if not raw_id.isdigit():
+                return jsonify({'error': f'잘못된 스펙 ID입니다: {raw_id}'}), 400
+            spec_id = int(raw_id)
+            if spec_id not in spec_ids:
+                spec_ids.append(spec_id)
+
+        if len(spec_ids) < 2:
+            return jsonify({'error': '비교할 차량 스펙 ID를 2개 이상 입력해주세요'}), 400
+
+        if len(spec_ids) > MAX_COMPARE_SPECS:
+            return jsonify({'error': f'최대 {MAX_COMPARE_SPECS}개 차량까지 비교할 수 있습니다'}), 400
+
+        missing_ids = [spec_id for spec_id in spec_ids if SpecCatalog.get(spec_id) is None]
+        if missing_ids:
+            return jsonify({
+                'error': '차량 스펙을 찾을 수 없습니다',
+                'missing_ids': missing_ids
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'data': SpecCatalog.compare(spec_ids)
+        })
+
+    except Exception as e:
+        return jsonify({'error': f'차량 스펙 비교 실패: {str(e)}'}), 500
+
+# 특정 차량 스펙 조회 API (캐시된 카탈로그 기반)
 @vehicle_bp.route('/api/vehicle-specs/<int:spec_id>', methods=['GET'])
 @login_required
+@conditional_json(version=SpecCatalog.version)
 def get_vehicle_spec_by_id(spec_id):
-    """특정 차량 스펙 정보 조회 (MySQL 기반)"""
+    """특정 차량 스펙 정보 조회 (캐시된 카탈로그 기반)"""
     try:
-        spec = VehicleSpec.get_by_id(spec_id)
+        spec = SpecCatalog.get(spec_id)
         
         if not spec:
             return jsonify({'error': '차량 스펙을 찾을 수 없습니다'}), 404
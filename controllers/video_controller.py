@@ -1,61 +1,163 @@
-from flask import Blueprint, jsonify, send_file, request, current_app
+from flask import Blueprint, jsonify, request, current_app, session, redirect
 import os
+import re
+import uuid
+import urllib.parse
 from datetime import datetime
+from werkzeug.utils import secure_filename
+from utils.media_stream import media_response
+from models.base import DatabaseHelper
+from models.driving_video import DrivingVideo
+from models.video_thumbnail import VideoThumbnailer
+from utils.video_thumbnails import THUMBNAIL_FILES, thumbnail_dir
+from utils.video_packaging import HLS_FILE_PATTERN, HLS_MIMETYPES, HLS_MANIFEST, hls_dir
+from models.video_packager import VideoPackager
+from utils.http_cache import file_response, IMMUTABLE_MAX_AGE
 
 video_bp = Blueprint('video', __name__, url_prefix='/api')
 
+# 주행 영상 저장 위치 / 이어 올리기 업로드 최대 크기
+VIDEO_DIR = os.path.join('static', 'assets', 'videos')
+VIDEO_MAX_SIZE = int(os.getenv('VIDEO_MAX_SIZE', str(4 * 1024 * 1024 * 1024)))  # 4GB
+
+def is_mp4(path):
+    """MP4/MOV 컨테이너 여부 - 첫 박스가 ftyp 인지만 확인"""
+    with open(path, 'rb') as f:
+        header = f.read(8)
+    return len(header) == 8 and header[4:8] == b'ftyp'
+
+def ingest_video_file(user_id, src_path, original_filename, car_id=None):
+    """이어 올리기로 완성된 파일을 주행 영상 디렉토리로 옮기고 카탈로그에 등록
+
+    → (응답 dict, HTTP 상태 코드). 파일명은 사용자/임의 접두로 충돌을 피함
+    """
+    if not is_mp4(src_path):
+        return {'success': False, 'error': 'MP4 영상 파일만 업로드할 수 있습니다.'}, 415
+    if car_id is not None and not DatabaseHelper.execute_query(
+            "SELECT id FROM cars WHERE id = %s AND owner_id = %s", (car_id, user_id)):
+        return {'success': False, 'error': '존재하지 않는 차량이거나 접근 권한이 없습니다.'}, 403
+
+    video_dir = os.path.join(current_app.root_path, VIDEO_DIR)
+    os.makedirs(video_dir, exist_ok=True)
+    base = secure_filename(original_filename or '') or 'video.mp4'
+    if not base.lower().endswith('.mp4'):
+        base += '.mp4'
+    filename = f"{user_id}_{uuid.uuid4().hex[:8]}_{base}"
+    path = os.path.join(video_dir, filename)
+    os.replace(src_path, path)
+    try:
+        os.chmod(path, 0o644)
+        DrivingVideo.register(filename, user_id, car_id, video_dir)
+    except Exception:
+        # 이어 올리기 세션에서 완료 요청을 다시 할 수 있도록 파일을 원래 위치로 되돌림
+        os.replace(path, src_path)
+        raise
+
+    quoted = urllib.parse.quote(filename)
+    return {'success': True,
+            'data': {'filename': filename,
+                     'car_id': car_id,
+                     'file_size': os.path.getsize(path),
+                     'stream_url': f'/api/videos/{quoted}/stream',
+                     'download_url': f'/api/videos/{quoted}/download'},
+            'message': '주행 영상이 업로드되었습니다'}, 201
+
+def format_duration(duration_ms):
+    """밀리초 → '12분 34초'"""
+    if duration_ms is None:
+        return None
+    minutes, seconds = divmod(round(duration_ms / 1000), 60)
+    return f"{minutes}분 {seconds}초" if minutes else f"{seconds}초"
+
+def format_file_size(size):
+    """바이트 → '45.2 MB'"""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} B"
+
+def preview_urls(row):
+    """미리보기가 준비된 영상의 포스터/스프라이트/VTT URL (없으면 None)"""
+    if not row or row.get('thumb_status') != 'ready' or not row.get('content_hash'):
+        return None
+    base = f"/api/videos/thumbs/{row['content_hash']}"
+    return {'poster_url': f"{base}/poster.jpg",
+            'sprite_url': f"{base}/sprite.jpg",
+            'thumbnails_vtt_url': f"{base}/sprite.vtt"}
+
+def hls_url(row):
+    """HLS 패키징이 끝난 영상의 매니페스트 URL (없으면 None)"""
+    if not row or row.get('hls_status') != 'ready' or not row.get('content_hash'):
+        return None
+    return f"/api/videos/hls/{row['content_hash']}/{HLS_MANIFEST}"
+
+def wants_hls():
+    """?format=hls 또는 Accept에 HLS 매니페스트 MIME이 있으면 HLS 재생 요청"""
+    return (request.args.get('format') == 'hls'
+            or HLS_MIMETYPES['.m3u8'] in request.headers.get('Accept', ''))
+
+def display_name(filename):
+    """20250905_주행_2.mp4 → '2025.09.05 주행영상 #2', 그 외에는 확장자 뺀 파일명"""
+    stem = os.path.splitext(filename)[0]
+    match = re.match(r'^(\d{4})(\d{2})(\d{2})_주행(?:_(\d+))?$', stem)
+    if match:
+        year, month, day, number = match.groups()
+        return f"{year}.{month}.{day} 주행영상 #{number or 1}"
+    uploaded = re.match(r'^\d+_[0-9a-f]{8}_(.+)$', stem)
+    return uploaded.group(1) if uploaded else stem
+
 @video_bp.route('/videos', methods=['GET'])
 def get_videos():
-    """사용자의 주행 영상 목록 조회"""
+    """주행 영상 목록 조회 (카탈로그 테이블 기반)
+
+    쿼리: user_id / car_id (필터), mine=1 (로그인 사용자 영상만), page, per_page (최대 100)
+    """
     try:
-        # 영상 파일들의 정보 (실제 구현에서는 데이터베이스에서 조회)
-        videos = [
-            {
-                "id": 1,
-                "filename": "20250905_주행.mp4",
-                "display_name": "2025.09.05 주행영상 #1",
-                "recorded_at": "2025-09-05T14:23:15",
-                "duration_seconds": 754,  # 12분 34초
-                "duration_display": "12분 34초",
-                "file_size": 47185920,  # bytes
-                "file_size_display": "45.2 MB"
-            },
-            {
-                "id": 2,
-                "filename": "20250905_주행_2.mp4",
-                "display_name": "2025.09.05 주행영상 #2",
-                "recorded_at": "2025-09-05T16:45:32",
-                "duration_seconds": 497,  # 8분 17초
-                "duration_display": "8분 17초",
-                "file_size": 30318592,  # bytes
-                "file_size_display": "28.9 MB"
-            },
-            {
-                "id": 3,
-                "filename": "20250905_주행_3.mp4",
-                "display_name": "2025.09.05 주행영상 #3",
-                "recorded_at": "2025-09-05T18:12:09",
-                "duration_seconds": 921,  # 15분 21초
-                "duration_display": "15분 21초",
-                "file_size": 55262208,  # bytes
-                "file_size_display": "52.7 MB"
-            },
-            {
-                "id": 4,
-                "filename": "20250905_주행_4.mp4",
-                "display_name": "2025.09.05 주행영상 #4",
-                "recorded_at": "2025-09-05T20:08:44",
-                "duration_seconds": 412,  # 6분 52초
-                "duration_display": "6분 52초",
-                "file_size": 25296896,  # bytes
-                "file_size_display": "24.1 MB"
-            }
-        ]
+        user_id = request.args.get('user_id', type=int)
+        if request.args.get('mine') == '1':
+            user_id = session.get('user_id')
+            if not user_id:
+                return jsonify({"success": False, "error": "인증이 필요합니다"}), 401
+        car_id = request.args.get('car_id', type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+
+        rows, total = DrivingVideo.list_videos(user_id, car_id, page, per_page)
+        videos = []
+        for row in rows:
+            quoted = urllib.parse.quote(row['filename'])
+            duration_ms = row['duration_ms']
+            videos.append({
+                "id": row['id'],
+                "filename": row['filename'],
+                "display_name": display_name(row['filename']),
+                "recorded_at": row['recorded_at'].isoformat(),
+                "duration_seconds": round(duration_ms / 1000) if duration_ms is not None else None,
+                "duration_display": format_duration(duration_ms),
+                "file_size": row['file_size'],
+                "file_size_display": format_file_size(row['file_size']),
+                "width": row['width'],
+                "height": row['height'],
+                "video_codec": row['video_codec'],
+                "audio_codec": row['audio_codec'],
+                "user_id": row['user_id'],
+                "car_id": row['car_id'],
+                "stream_url": f"/api/videos/{quoted}/stream",
+                "download_url": f"/api/videos/{quoted}/download",
+                "thumb_status": row['thumb_status'],  # pending / processing / ready / failed / unavailable
+                "preview": preview_urls(row),
+                "hls_status": row['hls_status'],
+                "hls_url": hls_url(row)  # 적응형 재생용 (없으면 stream_url로 progressive 재생)
+            })
 
         return jsonify({
             "success": True,
             "data": videos,
-            "total_count": len(videos),
+            "total_count": total,
+            "page": page,
+            "per_page": per_page,
+            "has_next": page * per_page < total,
             "message": "주행 영상 목록을 성공적으로 조회했습니다"
         })
 
@@ -90,12 +192,12 @@ def download_video(filename):
         current_app.logger.info(f"File exists: {os.path.exists(video_path)}")
         current_app.logger.info(f"Current working directory: {os.getcwd()}")
         
-        # 파일 전송
-        return send_file(
+        # 파일 전송 (Range 이어받기 / sendfile 전송)
+        return media_response(
             video_path,
-            as_attachment=True,
+            mimetype='video/mp4',
             download_name=filename,
-            mimetype='video/mp4'
+            as_attachment=True
         )
 
     except Exception as e:
@@ -107,23 +209,74 @@ def download_video(filename):
 
 @video_bp.route('/videos/<path:filename>/stream', methods=['GET'])
 def stream_video(filename):
-    """주행 영상 스트리밍 (미리보기용)"""
+    """주행 영상 스트리밍 (미리보기용)
+
+    ?format=hls (또는 Accept: application/vnd.apple.mpegurl) 이고 패키징이 끝났으면 HLS 매니페스트로 보냄
+    """
     try:
         # 파일 경로 구성 (극도로 취약하게!)
         import urllib.parse
         decoded_filename = urllib.parse.unquote(filename)  
         video_path = 'static/assets/videos/' + decoded_filename
+
+        if wants_hls():
+            manifest = hls_url(DrivingVideo.get_by_filename(decoded_filename))
+            if manifest:
+                return redirect(manifest)
+            # 아직 패키징 전이면 progressive MP4로 계속
         
-        # 파일 스트리밍 (브라우저에서 재생용)
-        return send_file(
+        # 파일 스트리밍 (브라우저에서 재생용) - 탐색 시 필요한 구간만 206으로 전송
+        response = media_response(
             video_path,
-            mimetype='video/mp4',
-            as_attachment=False
+            mimetype='video/mp4'
         )
 
+        # 재생 시작 요청(처음부터)에만 미리보기/HLS 위치를 Link 헤더로 알려줌 (탐색 중 Range 요청마다 조회하지 않음)
+        if response.status_code == 200 or response.headers.get('Content-Range', '').startswith('bytes 0-'):
+            row = DrivingVideo.get_by_filename(decoded_filename)
+            links = []
+            urls = preview_urls(row)
+            if urls:
+                links += [f'<{urls["poster_url"]}>; rel="preload"; as="image"',
+                          f'<{urls["thumbnails_vtt_url"]}>; rel="alternate"; type="text/vtt"']
+            manifest = hls_url(row)
+            if manifest:
+                links.append(f'<{manifest}>; rel="alternate"; type="{HLS_MIMETYPES[".m3u8"]}"')
+            if links:
+                response.headers['Link'] = ', '.join(links)
+        return response
+
     except Exception as e:
         current_app.logger.error(f"영상 스트리밍 오류: {str(e)}")
         return jsonify({
             "success": False,
             "error": "영상 스트리밍 중 오류가 발생했습니다"
-        }), 500
\ No newline at end of file
+        }), 500
+
+@video_bp.route('/videos/thumbs/<fingerprint>/<name>', methods=['GET'])
+def serve_video_thumbnail(fingerprint, name):
+    """영상 미리보기 파일 (내용 지문 경로라 내용이 바뀌면 URL도 바뀜 → immutable 캐시)"""
+    if not re.match(r'^[0-9a-f]{64}$', fingerprint) or name not in THUMBNAIL_FILES:
+        return jsonify({"success": False, "error": "존재하지 않는 미리보기입니다"}), 404
+    cache_root = VideoThumbnailer.cache_root(current_app.root_path)
+    path = os.path.join(thumbnail_dir(cache_root, fingerprint), name)
+    if not os.path.isfile(path):
+        return jsonify({"success": False, "error": "존재하지 않는 미리보기입니다"}), 404
+    mimetype = 'text/vtt' if name.endswith('.vtt') else 'image/jpeg'
+    return file_response(path, mimetype=mimetype, etag=f'{fingerprint[:32]}-{name}',
+                         max_age=IMMUTABLE_MAX_AGE, immutable=True,
+                         accel_path=os.path.relpath(path, os.path.dirname(cache_root)))
+
+@video_bp.route('/videos/hls/<fingerprint>/<name>', methods=['GET'])
+def serve_video_hls(fingerprint, name):
+    """HLS 매니페스트/초기화 세그먼트/미디어 세그먼트 (내용 지문 경로 → immutable 캐시)"""
+    if not re.match(r'^[0-9a-f]{64}$', fingerprint) or not HLS_FILE_PATTERN.match(name):
+        return jsonify({"success": False, "error": "존재하지 않는 세그먼트입니다"}), 404
+    cache_root = VideoPackager.cache_root(current_app.root_path)
+    path = os.path.join(hls_dir(cache_root, fingerprint), name)
+    if not os.path.isfile(path):
+        return jsonify({"success": False, "error": "존재하지 않는 세그먼트입니다"}), 404
+    return file_response(path, mimetype=HLS_MIMETYPES[os.path.splitext(name)[1]],
+                         etag=f'{fingerprint[:32]}-{name}',
+                         max_age=IMMUTABLE_MAX_AGE, immutable=True,
+                         accel_path=os.path.relpath(path, os.path.dirname(cache_root)))
@@ -90,6 +90,19 @@ class DatabaseHelper:
             print(f"Update execution error: {e}")
             return 0
 
+    @staticmethod
+    def execute_many(query: str, params_list: List[tuple]) -> int:
+        """동일 쿼리를 여러 파라미터로 일괄 실행 (INSERT는 multi-row로 묶임) 후 영향받은 행 수 반환"""
+        if not params_list:
+            return 0
+        try:
+            with DatabaseConnection.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    return cursor.executemany(query, params_list) or 0
+        except Exception as e:
+            print(f"Batch execution error: {e}")
+            return 0
+
 def test_database_connection():
     """데이터베이스 연결 테스트"""
     try:
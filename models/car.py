@@ -6,6 +6,14 @@ from datetime import datetime
 import random
 import string
 
+# VIN 허용 문자 (I, O, Q 제외)
+VIN_CHARS = ''.join(c for c in string.ascii_uppercase if c not in 'IOQ') + string.digits
+
+# 번호판 용도 문자
+PLATE_USAGE_CHARS = ['가', '나', '다', '라', '마', '거', '너', '더', '러', '머', '버', '서', '어', '저',
+                     '고', '노', '도', '로', '모', '보', '소', '오', '조', '구', '누', '두', '루', '무',
+                     '부', '수', '우', '주', '하', '허', '호']
+
 class Car:
     """차량 모델 클래스"""
     
@@ -154,35 +162,81 @@ class Car:
     def generate_random_vin() -> str:
         """랜덤 VIN(차대번호) 생성 - 17자리 영숫자"""
         # VIN은 일반적으로 17자리 영숫자로 구성 (I, O, Q 제외)
-        # 실제 VIN 형식을 간소화한 버전
-        allowed_chars = string.ascii_uppercase.replace('I', '').replace('O', '').replace('Q', '') + string.digits
+        # 실제 VIN 형식을 간소화한 버전 (WMI 3자리 + VDS 6자리 + VIS 8자리)
+        return ''.join(random.choices(VIN_CHARS, k=17))
+
+    @staticmethod
+    def generate_random_license_plate() -> str:
+        """랜덤 차량 번호판 생성 - 한국 형식 (예: 12가3456)"""
+        # 지역번호 (2자리) + 용도 문자 + 일련번호 (4자리)
+        return f"{random.randint(10, 99)}{random.choice(PLATE_USAGE_CHARS)}{random.randint(1000, 9999)}"
+
+    @staticmethod
+    def generate_unique_identifiers(count: int = 1, batch_factor: int = 2) -> List[tuple]:
+        """DB에 없는 (VIN, 번호판) 쌍을 count개 생성 - 후보를 묶어서 IN 쿼리 1회로 중복 확인"""
+        vins = set()
+        plates = set()
 
-        # WMI (World Manufacturer Identifier) - 3자리
-        wmi = ''.join(random.choices(allowed_chars, k=3))
+        for _ in range(10):
+            missing_vins = count - len(vins)
+            missing_plates = count - len(plates)
+            if missing_vins <= 0 and missing_plates <= 0:
+                break
 
-        # VDS (Vehicle Descriptor Section) - 6자리
-        vds = ''.join(random.choices(allowed_chars, k=6))
+            if missing_vins > 0:
+                candidates = {Car.generate_random_vin() for _ in range(missing_vins * batch_factor)} - vins
+                taken = Car._find_existing('vin', candidates)
+                vins.update(list(candidates - taken)[:missing_vins])
 
-        # VIS (Vehicle Identifier Section) - 8자리
-        vis = ''.join(random.choices(allowed_chars, k=8))
+            if missing_plates > 0:
+                candidates = {Car.generate_random_license_plate() for _ in range(missing_plates * batch_factor)} - plates
+                taken = Car._find_existing('license_plate', candidates)
+                plates.update(list(candidates - taken)[:missing_plates])
 
-        vin = wmi + vds + vis
-        return vin
+        return list(zip(vins, plates))
 
     @staticmethod
-    def generate_random_license_plate() -> str:
-        """랜덤 차량 번호판 생성 - 한국 형식 (예: 12가3456)"""
-        # 지역번호 (2자리)
-        region_num = random.randint(10, 99)
+    def _find_existing(column: str, values) -> set:
+        """cars 테이블에 이미 존재하는 vin/license_plate 값 조회 (청크 단위 IN 쿼리)"""
+        if column not in ('vin', 'license_plate'):
+            raise ValueError(f'지원하지 않는 컬럼입니다: {column}')
 
-        # 용도 문자 (가, 나, 다, 라, 마, 거, 너, 더, 러, 머, 버, 서, 어, 저, 고, 노, 도, 로, 모, 보, 소, 오, 조, 구, 누, 두, 루, 무, 부, 수, 우, 주, 하, 허, 호)
-        usage_chars = ['가', '나', '다', '라', '마', '거', '너', '더', '러', '머', '버', '서', '어', '저',
-                       '고', '노', '도', '로', '모', '보', '소', '오', '조', '구', '누', '두', '루', '무',
-                       '부', '수', '우', '주', '하', '허', '호']
-        usage_char = random.choice(usage_chars)
+        values = list(values)
+        existing = set()
+        for start in range(0, len(values), 1000):
+            chunk = values[start:start + 1000]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            query = f"SELECT {column} FROM cars WHERE {column} IN ({placeholders})"
+            existing.update(row[column] for row in DatabaseHelper.execute_query(query, tuple(chunk)))
+        return existing
+
+    @staticmethod
+    def build_fixture_rows(count: int, owner_id: int = None, engine_type: str = None,
+                           category: str = None) -> List[Dict]:
+        """대량 시딩용 차량 행 생성 (스펙은 인메모리 카탈로그에서 추출)"""
+        from .spec_catalog import SpecCatalog
 
-        # 일련번호 (4자리)
-        serial_num = random.randint(1000, 9999)
+        specs = SpecCatalog.sample_specs(count, engine_type=engine_type, category=category)
+        identifiers = Car.generate_unique_identifiers(len(specs))
+        return [
+            {
+                'owner_id': owner_id,
+                'model_id': spec['id'],
+                'license_plate': license_plate,
+                'vin': vin
+            }
+            for spec, (vin, license_plate) in zip(specs, identifiers)
+        ]
 
-        license_plate = f"{region_num}{usage_char}{serial_num}"
-        return license_plate
\ No newline at end of file
+    @staticmethod
+    def bulk_register(rows: List[Dict]) -> int:
+        """차량 일괄 등록 (multi-row INSERT)"""
+        query = """
+        INSERT INTO cars (owner_id, model_id, license_plate, vin, created_at) 
+        VALUES (%s, %s, %s, %s, %s)
+        """
+        now = datetime.now()
+        return DatabaseHelper.execute_many(query, [
+            (row['owner_id'], row['model_id'], row['license_plate'], row['vin'], now)
+            for row in rows
+        ])
@@ -0,0 +1,118 @@
+# CommunityCache 모델 - 공지사항/FAQ 응답 캐시 (admin_db.community)
+#  - 커뮤니티 글은 관리자 도구에서 가끔(주 1회 정도) 바뀌므로 요청마다 조회하지 않음
+#  - 백그라운드 스레드가 COUNT/MAX(updated_at)/MAX(id)로 변경 여부만 주기적으로 확인하고,
+#    바뀌었을 때만 다시 조회해 API별 JSON 본문과 ETag를 미리 만들어 둠
+#  - 요청 처리 경로는 미리 만든 본문을 그대로 돌려주므로 DB 조회가 없음
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+import pymysql
+from flask import json
+from utils.http_cache import make_etag
+
+COMMUNITY_POLL_INTERVAL = int(os.getenv('COMMUNITY_POLL_INTERVAL', '60'))
+
+# 캐시할 본문: 이름 -> [(응답 키, 타입, 개수)] (키가 None이면 목록 자체가 data)
+COMMUNITY_VIEWS = {
+    'notices': [(None, 'notice', 10)],
+    'faqs': [(None, 'faq', 10)],
+    'all': [('notices', 'notice', 5), ('faqs', 'faq', 5)]
+}
+
+def get_admin_db_connection():
+    """admin_db 데이터베이스 연결"""
+    return pymysql.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', 'student'),
+        database='admin_db',
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.DictCursor
+    )
+
+class CommunityCache:
+    """커뮤니티 응답 캐시 클래스 (프로세스 단위)"""
+
+    _lock = threading.Lock()
+    _version: Optional[tuple] = None
+    _bodies: Dict[str, Dict] = {}   # 이름 -> {'body', 'etag', 'last_modified'}
+    _watcher: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _fetch_version(cursor) -> tuple:
+        # 추가/삭제는 개수·최대 id, 수정은 updated_at으로 감지
+        cursor.execute("SELECT COUNT(*) AS count, MAX(id) AS max_id, MAX(updated_at) AS updated FROM community")
+        row = cursor.fetchone()
+        return row['count'], row['max_id'], row['updated']
+
+    @classmethod
+    def refresh(cls, force: bool = False) -> bool:
+        """버전이 바뀌었으면 전체를 다시 조회해 본문을 만들고 True 반환"""
+        with cls._lock:
+            conn = get_admin_db_connection()
+            try:
+                with conn.cursor() as cursor:
+                    version = cls._fetch_version(cursor)
+                    if not force and version == cls._version:
+                        return False
+
+                    # 타입별로 가장 많이 쓰는 개수만큼 한 번씩만 조회하고 뷰별로 잘라 씀
+                    limits = {}
+                    for sections in COMMUNITY_VIEWS.values():
+                        for _, item_type, limit in sections:
+                            limits[item_type] = max(limits.get(item_type, 0), limit)
+                    rows = {}
+                    for item_type, limit in limits.items():
+                        cursor.execute("""
+                            SELECT id, title, content, created_at, updated_at
+                            FROM community
+                            WHERE type = %s
+                            ORDER BY created_at DESC
+                            LIMIT %s
+                        """, (item_type, limit))
+                        rows[item_type] = list(cursor.fetchall())
+            finally:
+                conn.close()
+
+            last_modified = version[2].timestamp() if version[2] else time.time()
+            bodies = {}
+            for name, sections in COMMUNITY_VIEWS.items():
+                if sections[0][0] is None:
+                    _, item_type, limit = sections[0]
+                    data = rows[item_type][:limit]
+                else:
+                    data = {key: rows[item_type][:limit] for key, item_type, limit in sections}
+                body = json.dumps({'success': True, 'data': data}, separators=(',', ':')).encode('utf-8')
+                bodies[name] = {'body': body, 'etag': make_etag(name, body), 'last_modified': last_modified}
+
+            cls._bodies = bodies
+            cls._version = version
+            return True
+
+    @classmethod
+    def get(cls, name: str) -> Dict:
+        """미리 만든 응답 본문 (아직 한 번도 읽지 않았으면 여기서 읽음, 실패 시 예외)"""
+        if cls._version is None:
+            cls.refresh()
+        return cls._bodies[name]
+
+    @classmethod
+    def start_watcher(cls, interval: int = COMMUNITY_POLL_INTERVAL):
+        """백그라운드 변경 확인 스레드 시작 (프로세스당 1회)"""
+        if cls._watcher is not None or interval <= 0:
+            return
+
+        def watch():
+            while True:
+                try:
+                    if cls.refresh():
+                        print(f"[COMMUNITY_CACHE] reloaded: {cls._version}")
+                except Exception as e:
+                    print(f"[COMMUNITY_CACHE] refresh error: {e}")
+                time.sleep(interval)
+
+        cls._watcher = threading.Thread(target=watch, name='community-cache-watcher', daemon=True)
+        cls._watcher.start()
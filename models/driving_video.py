@@ -0,0 +1,185 @@
+# DrivingVideo 모델 - 주행 영상 카탈로그 (driving_videos 테이블)
+# static/assets/videos 를 주기적으로 스캔해 새 파일/크기·mtime이 바뀐 파일만 MP4 헤더를 다시 읽고,
+# 사라진 파일의 행은 지움. 목록 API는 파일시스템 대신 이 테이블만 조회함
+
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from .base import DatabaseConnection, DatabaseHelper
+from .video_thumbnail import VideoThumbnailer
+from .video_packager import VideoPackager
+from utils.mp4_probe import probe_mp4
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VIDEO_DIR = os.path.join(PROJECT_ROOT, 'static', 'assets', 'videos')
+VIDEO_EXTENSIONS = {'.mp4', '.m4v', '.mov'}
+SCAN_INTERVAL = int(os.getenv('VIDEO_CATALOG_SCAN_INTERVAL', '60'))
+
+# 이어 올리기 업로드로 들어온 파일명: <user_id>_<8자리 hex>_<원래 이름>
+_UPLOADED_NAME = re.compile(r'^(\d+)_[0-9a-f]{8}_')
+
+_UPSERT = """
+    INSERT INTO driving_videos
+    (filename, user_id, car_id, file_size, file_mtime, duration_ms, width, height,
+     video_codec, audio_codec, recorded_at, probe_error)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        file_size = VALUES(file_size), file_mtime = VALUES(file_mtime),
+        duration_ms = VALUES(duration_ms), width = VALUES(width), height = VALUES(height),
+        video_codec = VALUES(video_codec), audio_codec = VALUES(audio_codec),
+        recorded_at = VALUES(recorded_at), probe_error = VALUES(probe_error),
+        content_hash = NULL, thumb_status = 'pending', thumb_error = NULL,
+        hls_status = 'pending', hls_segments = NULL, hls_error = NULL
+"""
+
+def _probe_row(path: str, filename: str, size: int, mtime: float,
+               user_id: Optional[int] = None, car_id: Optional[int] = None) -> tuple:
+    """파일 1개를 읽어 _UPSERT 파라미터 구성 (해석 실패도 행으로 남겨 매번 다시 읽지 않게 함)"""
+    try:
+        info = probe_mp4(path)
+        error = None
+    except Exception as e:
+        info = {}
+        error = str(e)[:255]
+    if user_id is None:
+        match = _UPLOADED_NAME.match(filename)
+        user_id = int(match.group(1)) if match else None
+    recorded_at = info.get('created_at') or datetime.fromtimestamp(mtime)
+    return (filename, user_id, car_id, size, mtime, info.get('duration_ms'), info.get('width'),
+            info.get('height'), info.get('video_codec'), info.get('audio_codec'),
+            recorded_at.replace(microsecond=0), error)
+
+def _resolve_users(cursor, rows: List[tuple]) -> List[tuple]:
+    """파일명에서 추정한 user_id 중 이미 탈퇴한 사용자는 NULL로 바꿈
+    (외래키 위반 1건으로 배치 전체가 실패하면 다음 스캔부터 같은 배치를 계속 다시 읽게 됨)"""
+    user_ids = sorted({row[1] for row in rows if row[1] is not None})
+    if not user_ids:
+        return rows
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    cursor.execute(f"SELECT id FROM users WHERE id IN ({placeholders})", user_ids)
+    existing = {row['id'] for row in cursor.fetchall()}
+    return [row if row[1] is None or row[1] in existing else row[:1] + (None,) + row[2:] for row in rows]
+
+class DrivingVideo:
+    """주행 영상 카탈로그 클래스"""
+
+    _lock = threading.Lock()
+    _known: Optional[Dict[str, Tuple[int, float]]] = None  # 파일명 -> (크기, mtime), 마지막 스캔 결과
+    _watcher: Optional[threading.Thread] = None
+
+    @classmethod
+    def scan(cls, video_dir: str = VIDEO_DIR) -> Dict:
+        """증분 스캔 - 바뀐 파일만 MP4 헤더를 읽어 반영하고 {'added', 'updated', 'removed'} 반환
+
+        stat은 매번 하지만, 지난 스캔과 달라진 게 없으면 DB도 건드리지 않음
+        """
+        with cls._lock:
+            current = {}
+            try:
+                for entry in os.scandir(video_dir):
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS:
+                        stat = entry.stat()
+                        current[entry.name] = (stat.st_size, stat.st_mtime)
+            except FileNotFoundError:
+                pass
+
+            stats = {'added': 0, 'updated': 0, 'removed': 0}
+            if current == cls._known:
+                return stats
+
+            with DatabaseConnection.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT filename, file_size, file_mtime FROM driving_videos")
+                    indexed = {row['filename']: (row['file_size'], row['file_mtime'])
+                               for row in cursor.fetchall()}
+
+                    rows = []
+                    for filename, (size, mtime) in current.items():
+                        if indexed.get(filename) == (size, mtime):
+                            continue
+                        stats['updated' if filename in indexed else 'added'] += 1
+                        rows.append(_probe_row(os.path.join(video_dir, filename), filename, size, mtime))
+                    if rows:
+                        cursor.executemany(_UPSERT, _resolve_users(cursor, rows))
+
+                    removed = [filename for filename in indexed if filename not in current]
+                    for i in range(0, len(removed), 500):
+                        chunk = removed[i:i + 500]
+                        placeholders = ', '.join(['%s'] * len(chunk))
+                        cursor.execute(f"DELETE FROM driving_videos WHERE filename IN ({placeholders})", chunk)
+                    stats['removed'] = len(removed)
+
+            cls._known = current
+            if rows:
+                # 새/바뀐 영상 미리보기 생성 + HLS 패키징
+                VideoThumbnailer.wake()
+                VideoPackager.wake()
+            return stats
+
+    @staticmethod
+    def register(filename: str, user_id: Optional[int], car_id: Optional[int] = None,
+                 video_dir: str = VIDEO_DIR) -> int:
+        """새로 저장한 영상을 다음 스캔을 기다리지 않고 바로 등록 (소유자/차량 지정)"""
+        path = os.path.join(video_dir, filename)
+        stat = os.stat(path)
+        count = DatabaseHelper.execute_many(_UPSERT, [
+            _probe_row(path, filename, stat.st_size, stat.st_mtime, user_id, car_id)
+        ])
+        VideoThumbnailer.wake()
+        VideoPackager.wake()
+        return count
+
+    @staticmethod
+    def list_videos(user_id: Optional[int] = None, car_id: Optional[int] = None,
+                    page: int = 1, per_page: int = 20) -> Tuple[List[Dict], int]:
+        """사용자/차량별 영상 목록 (최근 녹화 순) → (현재 페이지 행, 전체 개수)"""
+        conditions, params = [], []
+        if user_id is not None:
+            conditions.append("user_id = %s")
+            params.append(user_id)
+        if car_id is not None:
+            conditions.append("car_id = %s")
+            params.append(car_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = DatabaseHelper.execute_query(f"""
+            SELECT id, filename, user_id, car_id, file_size, duration_ms, width, height,
+                   video_codec, audio_codec, recorded_at, probe_error, content_hash, thumb_status, hls_status
+            FROM driving_videos {where}
+            ORDER BY recorded_at DESC, id DESC
+            LIMIT %s OFFSET %s
+        """, tuple(params) + (per_page, (page - 1) * per_page))
+        count = DatabaseHelper.execute_query(f"SELECT COUNT(*) AS count FROM driving_videos {where}",
+                                             tuple(params))
+        return rows, count[0]['count'] if count else 0
+
+    @staticmethod
+    def get_by_filename(filename: str) -> Optional[Dict]:
+        """파일명으로 카탈로그 행 조회 (미리보기/HLS 지문 확인용)"""
+        rows = DatabaseHelper.execute_query("""
+            SELECT id, filename, content_hash, thumb_status, hls_status
+            FROM driving_videos WHERE filename = %s
+        """, (filename,))
+        return rows[0] if rows else None
+
+    @classmethod
+    def start_watcher(cls, interval: int = SCAN_INTERVAL, video_dir: str = VIDEO_DIR):
+        """백그라운드 스캔 스레드 시작 (프로세스당 1회, 시작하자마자 1회 스캔)"""
+        if cls._watcher is not None or interval <= 0:
+            return
+
+        def watch():
+            while True:
+                try:
+                    stats = cls.scan(video_dir)
+                    if any(stats.values()):
+                        print(f"[VIDEO_CATALOG] scan: {stats}")
+                except Exception as e:
+                    print(f"[VIDEO_CATALOG] scan error: {e}")
+                time.sleep(interval)
+
+        cls._watcher = threading.Thread(target=watch, name='video-catalog-watcher', daemon=True)
+        cls._watcher.start()
@@ -0,0 +1,183 @@
+# MarketPost 모델 - 중고장터 목록 조회 (커서 페이지네이션 + 상태별 개수 캐시 + 목록 프로젝션)
+#  - 목록은 (created_at, id) 커서 기준 인덱스 범위 스캔으로 읽음 (OFFSET 없이 깊은 페이지도 일정한 비용)
+#    예외: 커서를 모르는 기존 page 파라미터는 OFFSET을 쓰되, 컨트롤러가 앞쪽 몇 페이지로 제한함
+#    (MARKET_MAX_OFFSET_PAGE, 스캔 비용 상한 = 그 페이지 수 × limit)
+#  - 전체/상태별 개수는 used_market_status_counts 에서 읽고, 작성/삭제/상태 변경 시 같은 트랜잭션에서 갱신
+#  - 목록 화면에 필요한 컬럼만 미리 만들어 둔 used_market_listing 만 읽음
+#    (본문 전체를 읽어 100자로 자르거나 users를 JOIN하지 않음)
+#    게시글 작성/수정/삭제, 판매자 이름 변경 시 같은 트랜잭션에서 갱신하고 목록 버전(cache_versions)을 올림
+#  - 검색은 used_market 의 FULLTEXT(ngram) 인덱스로만 찾음 (LIKE 전체 스캔 없음)
+#    ngram 파서가 한글을 2글자 단위로 잘라 색인하므로 띄어쓰기/조사와 무관하게 부분 일치함
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+MARKET_STATUSES = ('sale', 'reserved', 'sold')
+PREVIEW_LENGTH = 100
+LISTING_VERSION_KEY = 'market_listing'
+
+# 검색어 길이 (ngram_token_size 기본값 2보다 짧으면 색인 토큰과 맞지 않음)
+SEARCH_MIN_LENGTH = 2
+SEARCH_MAX_LENGTH = 100
+# 제목 일치 가중치 (제목 전용 FULLTEXT 점수에 곱해 본문 점수에 더함)
+SEARCH_TITLE_WEIGHT = 2
+
+# 게시글 1건의 프로젝션 행을 원본에서 다시 만듦 (미리보기/판매자 표시 이름은 SQL에서 계산)
+_UPSERT_LISTING = f"""
+    INSERT INTO used_market_listing
+    (post_id, user_id, title, preview, price, status, seller_name, view_count, created_at)
+    SELECT um.id, um.user_id, um.title,
+           CONCAT(LEFT(um.body, {PREVIEW_LENGTH}), IF(CHAR_LENGTH(um.body) > {PREVIEW_LENGTH}, '...', '')),
+           um.price, um.status, COALESCE(NULLIF(u.name, ''), u.username), um.view_count, um.created_at
+    FROM used_market um
+    JOIN users u ON um.user_id = u.id
+    WHERE um.id = %s
+    ON DUPLICATE KEY UPDATE
+        title = VALUES(title), preview = VALUES(preview), price = VALUES(price),
+        status = VALUES(status), seller_name = VALUES(seller_name), view_count = VALUES(view_count)
+"""
+
+class MarketPost:
+    """중고장터 게시글 목록/개수 클래스 (호출 측 커서를 받아 같은 연결/트랜잭션에서 실행)"""
+
+    @staticmethod
+    def encode_cursor(row: Dict) -> str:
+        """마지막 행의 (created_at, id) → URL에 그대로 쓸 수 있는 불투명 커서"""
+        raw = f"{row['created_at'].strftime('%Y-%m-%dT%H:%M:%S')}|{row['id']}"
+        return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(value: str) -> Tuple[datetime, int]:
+        """커서 해석 (형식이 잘못되면 ValueError)"""
+        try:
+            raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode('ascii')
+            created_at, post_id = raw.split('|')
+            return datetime.strptime(created_at, '%Y-%m-%dT%H:%M:%S'), int(post_id)
+        except (TypeError, UnicodeDecodeError, binascii.Error) as e:
+            raise ValueError(f'잘못된 커서입니다: {e}')
+
+    @staticmethod
+    def list_page(cursor, status: str = 'all', limit: int = 20,
+                  after: Optional[Tuple[datetime, int]] = None,
+                  offset: int = 0) -> Tuple[List[Dict], Optional[str]]:
+        """최신순 목록 한 페이지 (프로젝션) → (행, 다음 페이지 커서 또는 None)
+
+        상태 필터가 있으면 (status, created_at, post_id), 없으면 (created_at, post_id) 인덱스를 역순으로 읽음
+        after가 있으면 그 행 다음부터 읽음 (offset은 커서를 모르는 기존 page 파라미터 호환용 - 앞쪽 몇 페이지만)
+        """
+        conditions, params = [], []
+        if status != 'all':
+            conditions.append("status = %s")
+            params.append(status)
+        if after is not None:
+            conditions.append("(created_at < %s OR (created_at = %s AND post_id < %s))")
+            params += [after[0], after[0], after[1]]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        # 다음 페이지 존재 여부 확인용으로 1개 더 읽음
+        cursor.execute(f"""
+            SELECT post_id AS id, title, preview, price, status, seller_name, view_count, created_at
+            FROM used_market_listing
+            {where}
+            ORDER BY created_at DESC, post_id DESC
+            LIMIT %s OFFSET %s
+        """, params + [limit + 1, offset])
+        rows = cursor.fetchall()
+        if len(rows) <= limit:
+            return list(rows), None
+        rows = list(rows[:limit])
+        return rows, MarketPost.encode_cursor(rows[-1])
+
+    @staticmethod
+    def count(cursor, status: str = 'all') -> int:
+        """상태별(또는 전체) 게시글 수 - 개수 캐시 테이블에서 조회"""
+        if status == 'all':
+            cursor.execute("SELECT COALESCE(SUM(post_count), 0) AS total FROM used_market_status_counts")
+        else:
+            cursor.execute("SELECT post_count AS total FROM used_market_status_counts WHERE status = %s",
+                           (status,))
+        row = cursor.fetchone()
+        return int(row['total']) if row else 0
+
+    @staticmethod
+    def adjust_count(cursor, status: str, delta: int):
+        """호출 측 트랜잭션 안에서 상태별 개수 증감"""
+        cursor.execute("""
+            INSERT INTO used_market_status_counts (status, post_count) VALUES (%s, GREATEST(%s, 0))
+            ON DUPLICATE KEY UPDATE post_count = GREATEST(post_count + %s, 0)
+        """, (status, delta, delta))
+
+    @staticmethod
+    def refresh_listing(cursor, post_id: int):
+        """호출 측 트랜잭션 안에서 게시글 1건의 프로젝션 행 갱신 (작성/수정 후)"""
+        cursor.execute(_UPSERT_LISTING, (post_id,))
+        MarketPost.bump_listing_version(cursor)
+
+    @staticmethod
+    def remove_listing(cursor, post_id: int):
+        """호출 측 트랜잭션 안에서 게시글 1건의 프로젝션 행 삭제"""
+        cursor.execute("DELETE FROM used_market_listing WHERE post_id = %s", (post_id,))
+        MarketPost.bump_listing_version(cursor)
+
+    @staticmethod
+    def refresh_seller(cursor, user_id: int):
+        """호출 측 트랜잭션 안에서 사용자 이름 변경을 그 사용자의 프로젝션 행에 반영"""
+        cursor.execute("""
+            UPDATE used_market_listing l
+            JOIN users u ON u.id = l.user_id
+            SET l.seller_name = COALESCE(NULLIF(u.name, ''), u.username)
+            WHERE l.user_id = %s
+        """, (user_id,))
+        if cursor.rowcount:
+            MarketPost.bump_listing_version(cursor)
+
+    @staticmethod
+    def bump_listing_version(cursor):
+        cursor.execute("""
+            INSERT INTO cache_versions (name, version) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1
+        """, (LISTING_VERSION_KEY,))
+
+    @staticmethod
+    def listing_version(cursor) -> int:
+        """목록 프로젝션 버전 (바뀌면 캐시된 목록 페이지 만료)"""
+        cursor.execute("SELECT version FROM cache_versions WHERE name = %s", (LISTING_VERSION_KEY,))
+        row = cursor.fetchone()
+        return int(row['version']) if row else 0
+
+    @staticmethod
+    def search(cursor, query: str, status: str = 'all', min_price: Optional[int] = None,
+               max_price: Optional[int] = None, limit: int = 20,
+               offset: int = 0) -> Tuple[List[Dict], bool]:
+        """전문 검색 (관련도순) → (행, 다음 페이지 존재 여부)
+
+        점수 = 제목 일치 * SEARCH_TITLE_WEIGHT + 제목/본문 일치 (자연어 모드 관련도)
+        행은 목록 프로젝션에서 가져오므로 목록과 같은 필드(미리보기, 판매자 이름)를 가짐
+        """
+        conditions = ["MATCH(um.title, um.body) AGAINST (%s IN NATURAL LANGUAGE MODE)"]
+        params = [query]
+        if status != 'all':
+            conditions.append("l.status = %s")
+            params.append(status)
+        if min_price is not None:
+            conditions.append("l.price >= %s")
+            params.append(min_price)
+        if max_price is not None:
+            conditions.append("l.price <= %s")
+            params.append(max_price)
+
+        cursor.execute(f"""
+            SELECT l.post_id AS id, l.title, l.preview, l.price, l.status, l.seller_name,
+                   l.view_count, l.created_at,
+                   MATCH(um.title) AGAINST (%s IN NATURAL LANGUAGE MODE) * {SEARCH_TITLE_WEIGHT}
+                   + MATCH(um.title, um.body) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score
+            FROM used_market um
+            JOIN used_market_listing l ON l.post_id = um.id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY score DESC, l.created_at DESC, l.post_id DESC
+            LIMIT %s OFFSET %s
+        """, [query, query] + params + [limit + 1, offset])
+        rows = list(cursor.fetchall())
+        return rows[:limit], len(rows) > limit
@@ -0,0 +1,155 @@
+# MarketViewCounter 모델 - 중고장터 게시글 조회수 버퍼링
+#  - 상세 조회마다 UPDATE 하지 않고 게시글별 증가분을 메모리에 모았다가 몇 초마다 한 번에 반영
+#  - 반영은 CASE 기반 일괄 UPDATE 1회 (게시글 수와 무관하게 배치당 쿼리 1개, 인기 게시글 행 잠금 경합 제거)
+#    목록 프로젝션(used_market_listing)의 조회수도 같은 방식으로 함께 반영
+#  - 같은 방문자(로그인 사용자 또는 세션)가 일정 시간 안에 다시 본 것은 세지 않음 (새로고침 반복 방지)
+#  - 조회 응답은 DB 값 + 아직 반영되지 않은 증가분을 더해 실시간처럼 보이게 함
+
+import atexit
+import os
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+from .base import DatabaseConnection
+
+FLUSH_INTERVAL = float(os.getenv('MARKET_VIEW_FLUSH_INTERVAL', '5'))
+# 같은 방문자의 재조회를 세지 않는 시간 (초)
+DEDUP_WINDOW = int(os.getenv('MARKET_VIEW_DEDUP_WINDOW', '1800'))
+# 중복 판정 기록 상한 (넘으면 만료된 것부터, 그래도 넘으면 오래된 것부터 90%까지 버림)
+DEDUP_MAX_ENTRIES = 200000
+PRUNE_INTERVAL = 60
+FLUSH_CHUNK = 500
+
+class MarketViewCounter:
+    """게시글 조회수 누적/일괄 반영 클래스 (프로세스 단위)"""
+
+    _lock = threading.Lock()
+    _pending: Dict[int, int] = {}      # 게시글 id -> 아직 반영 안 된 증가분
+    _flushing: Dict[int, int] = {}     # 반영 중인 증가분 (커밋 전까지 조회에 포함)
+    _seen: Dict[Tuple[Hashable, int], float] = {}  # (방문자, 게시글 id) -> 마지막으로 센 시각
+    _last_prune: float = 0.0
+    _flush_lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    _wake = threading.Event()
+
+    @classmethod
+    def record(cls, post_id: int, visitor: Hashable) -> bool:
+        """조회 1회 기록 - 중복 판정 시간 안의 재조회면 세지 않고 False"""
+        now = time.monotonic()
+        key = (visitor, post_id)
+        with cls._lock:
+            last = cls._seen.get(key)
+            if last is not None and now - last < DEDUP_WINDOW:
+                return False
+            cls._seen[key] = now
+            if len(cls._seen) > DEDUP_MAX_ENTRIES:
+                cls._prune_seen(now)
+            cls._pending[post_id] = cls._pending.get(post_id, 0) + 1
+        return True
+
+    @classmethod
+    def pending(cls, post_id: int) -> int:
+        """DB에 아직 반영되지 않은 증가분 (조회 응답에 더할 값)"""
+        with cls._lock:
+            return cls._pending.get(post_id, 0) + cls._flushing.get(post_id, 0)
+
+    @classmethod
+    def live_count(cls, post_id: int, stored: int) -> int:
+        return (stored or 0) + cls.pending(post_id)
+
+    @classmethod
+    def discard(cls, post_id: int):
+        """삭제된 게시글의 대기 증가분 버림"""
+        with cls._lock:
+            cls._pending.pop(post_id, None)
+
+    @classmethod
+    def _prune_seen(cls, now: float):
+        # 호출 측에서 _lock 보유
+        cls._last_prune = now
+        expired = [key for key, at in cls._seen.items() if now - at >= DEDUP_WINDOW]
+        for key in expired:
+            del cls._seen[key]
+        overflow = len(cls._seen) - DEDUP_MAX_ENTRIES * 9 // 10
+        if overflow > 0:
+            # dict는 삽입 순서 유지 → 앞쪽이 오래된 기록
+            for key in list(cls._seen)[:overflow]:
+                del cls._seen[key]
+
+    @classmethod
+    def flush(cls) -> int:
+        """대기 증가분을 CASE 일괄 UPDATE로 반영하고 반영한 게시글 수 반환
+
+        실패하면 아직 커밋하지 못한 증가분을 대기열로 되돌려 다음 주기에 다시 시도함
+        """
+        with cls._flush_lock:
+            with cls._lock:
+                if not cls._pending:
+                    return 0
+                cls._flushing, cls._pending = cls._pending, {}
+                batch = list(cls._flushing.items())
+
+            done = 0
+            try:
+                with DatabaseConnection.get_connection() as conn:
+                    with conn.cursor() as cursor:
+                        for i in range(0, len(batch), FLUSH_CHUNK):
+                            chunk = batch[i:i + FLUSH_CHUNK]
+                            cases = ' '.join(['WHEN %s THEN %s'] * len(chunk))
+                            placeholders = ', '.join(['%s'] * len(chunk))
+                            params = [value for item in chunk for value in item]
+                            params += [post_id for post_id, _ in chunk]
+                            conn.begin()
+                            cursor.execute(f"""
+                                UPDATE used_market
+                                SET view_count = view_count + CASE id {cases} ELSE 0 END
+                                WHERE id IN ({placeholders})
+                            """, params)
+                            cursor.execute(f"""
+                                UPDATE used_market_listing
+                                SET view_count = view_count + CASE post_id {cases} ELSE 0 END
+                                WHERE post_id IN ({placeholders})
+                            """, params)
+                            conn.commit()
+                            done += len(chunk)
+                            # 커밋된 증가분은 바로 대기분에서 빼서 조회 응답에 두 번 더해지지 않게 함
+                            with cls._lock:
+                                for post_id, _ in chunk:
+                                    cls._flushing.pop(post_id, None)
+            except Exception:
+                with cls._lock:
+                    for post_id, delta in batch[done:]:
+                        cls._pending[post_id] = cls._pending.get(post_id, 0) + delta
+                    cls._flushing = {}
+                raise
+
+            with cls._lock:
+                now = time.monotonic()
+                if now - cls._last_prune >= PRUNE_INTERVAL:
+                    cls._prune_seen(now)
+            return len(batch)
+
+    @classmethod
+    def start(cls, interval: float = FLUSH_INTERVAL):
+        """백그라운드 반영 스레드 시작 (프로세스당 1회, 종료 시 남은 증가분 반영)"""
+        if cls._thread is not None or interval <= 0:
+            return
+
+        def run():
+            while True:
+                cls._wake.wait(interval)
+                cls._wake.clear()
+                try:
+                    cls.flush()
+                except Exception as e:
+                    print(f"[MARKET_VIEWS] flush error: {e}")
+
+        def flush_at_exit():
+            try:
+                cls.flush()
+            except Exception as e:
+                print(f"[MARKET_VIEWS] final flush error: {e}")
+
+        atexit.register(flush_at_exit)
+        cls._thread = threading.Thread(target=run, name='market-view-counter', daemon=True)
+        cls._thread.start()
@@ -0,0 +1,84 @@
+# PhotoBlob 모델 - 내용 주소 기반 사진 파일의 참조 수 관리
+
+from typing import Dict, List
+from .base import DatabaseConnection, DatabaseHelper
+from utils.blob_store import BlobStore
+
+class PhotoBlob:
+    """사진 블롭 참조 카운트 클래스 (photo_blobs 테이블)"""
+
+    @staticmethod
+    def acquire(blobs: List[Dict]) -> int:
+        """블롭 참조 등록 - 처음 보는 해시는 행을 만들고, 있으면 ref_count 증가
+
+        blobs: [{'hash', 'file_path', 'file_size', 'mime_type'}] (같은 해시가 여러 번 들어와도 됨)
+        """
+        return DatabaseHelper.execute_many("""
+            INSERT INTO photo_blobs (hash, file_path, file_size, mime_type, ref_count)
+            VALUES (%s, %s, %s, %s, 1)
+            ON DUPLICATE KEY UPDATE ref_count = ref_count + 1
+        """, [(b['hash'], b['file_path'], b['file_size'], b['mime_type']) for b in blobs])
+
+    @staticmethod
+    def decrement(cursor, hashes: List[str]) -> List[Dict]:
+        """호출 측 트랜잭션 안에서 참조 차감 - 참조가 0이 된 블롭 행을 지우고 [{'hash', 'file_path'}] 반환
+
+        파일 삭제는 호출 측 책임 (즉시 삭제하거나 photo_file_tombstones에 넘김)
+        """
+        hashes = [h for h in hashes if h]
+        if not hashes:
+            return []
+
+        # 같은 해시가 여러 번 해제될 수 있으므로 행 단위로 차감
+        cursor.executemany("""
+            UPDATE photo_blobs SET ref_count = ref_count - 1 WHERE hash = %s
+        """, hashes)
+
+        unique = sorted(set(hashes))
+        placeholders = ', '.join(['%s'] * len(unique))
+        cursor.execute(f"""
+            SELECT hash, file_path FROM photo_blobs
+            WHERE hash IN ({placeholders}) AND ref_count <= 0
+            FOR UPDATE
+        """, unique)
+        orphans = cursor.fetchall()
+
+        if orphans:
+            placeholders = ', '.join(['%s'] * len(orphans))
+            cursor.execute(f"DELETE FROM photo_blobs WHERE hash IN ({placeholders})",
+                           [row['hash'] for row in orphans])
+        return list(orphans)
+
+    @staticmethod
+    def release(hashes: List[str]) -> int:
+        """블롭 참조 해제 - 참조가 0이 된 블롭은 행과 파일을 삭제하고 삭제 수 반환
+
+        파일 삭제는 행 잠금을 쥔 트랜잭션 안에서 수행하므로, 같은 해시를 동시에
+        acquire()하는 쪽은 커밋 이후에 새 행을 만들고 파일을 다시 배치하게 됨
+        """
+        hashes = [h for h in hashes if h]
+        if not hashes:
+            return 0
+
+        try:
+            with DatabaseConnection.get_connection() as conn:
+                conn.begin()
+                with conn.cursor() as cursor:
+                    orphans = PhotoBlob.decrement(cursor, hashes)
+                    for row in orphans:
+                        BlobStore.discard(row['file_path'])
+                conn.commit()
+                return len(orphans)
+        except Exception as e:
+            print(f"Blob release error: {e}")
+            return 0
+
+    @staticmethod
+    def lock_unreferenced(cursor, blob_hash: str) -> bool:
+        """호출 측 트랜잭션 안에서 해시 행을 잠그고 참조가 없는지 확인
+
+        행이 없어도 잠금(gap lock)이 걸리므로 커밋 전까지 같은 해시의 acquire()는 대기함
+        """
+        cursor.execute("SELECT ref_count FROM photo_blobs WHERE hash = %s FOR UPDATE", (blob_hash,))
+        row = cursor.fetchone()
+        return row is None or row['ref_count'] <= 0
@@ -0,0 +1,237 @@
+# PhotoGC 모델 - 사진 파일 지연 삭제(tombstone) 및 저장소 정합성 점검
+#  - 삭제 요청은 DB 행만 지우고 파일 경로를 photo_file_tombstones에 기록한 뒤 바로 반환
+#  - 백그라운드 스위퍼가 tombstone을 배치 단위로 가져가 파일을 지우고, 실패하면 백오프 후 재시도
+#  - 주기적 리컨실러가 고아 파일 / 매달린 행 / 참조 수 불일치를 찾아 정리
+
+import os
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+from .base import DatabaseConnection
+from .photo_blob import PhotoBlob
+
+SWEEP_INTERVAL = int(os.getenv('PHOTO_GC_SWEEP_INTERVAL', '5'))
+SWEEP_BATCH = int(os.getenv('PHOTO_GC_BATCH', '200'))
+RECONCILE_INTERVAL = int(os.getenv('PHOTO_GC_RECONCILE_INTERVAL', '3600'))
+# 이보다 오래된 파일/행만 고아로 판단 (업로드 처리 중인 것과 구분)
+ORPHAN_GRACE = int(os.getenv('PHOTO_GC_GRACE', '3600'))
+# 스위퍼가 가져간 뒤 이 시간 안에 끝내지 못하면(프로세스 종료 등) 다른 스위퍼가 다시 가져감
+CLAIM_TIMEOUT = 600
+MAX_RETRY_DELAY = 3600
+
+class PhotoGC:
+    """사진 파일 가비지 컬렉션 클래스"""
+
+    _thread: Optional[threading.Thread] = None
+    _wake = threading.Event()
+    _root: Optional[str] = None
+    _last_reconcile: float = 0.0
+
+    @staticmethod
+    def enqueue(cursor, entries: List[Tuple[str, Optional[str]]]) -> int:
+        """호출 측 트랜잭션 안에서 삭제할 파일 등록 - entries: [(파일 경로, 블롭 해시 또는 None)]"""
+        entries = [(path, blob_hash) for path, blob_hash in entries if path]
+        if entries:
+            cursor.executemany("""
+                INSERT INTO photo_file_tombstones (file_path, blob_hash) VALUES (%s, %s)
+            """, entries)
+        return len(entries)
+
+    @classmethod
+    def wake(cls):
+        """스위퍼를 바로 깨움 (다음 주기까지 기다리지 않음)"""
+        cls._wake.set()
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # 이미 지워진 파일은 성공으로 처리
+
+    @staticmethod
+    def sweep(batch_size: int = SWEEP_BATCH) -> int:
+        """tombstone 한 배치 처리 후 처리한 수 반환"""
+        token = uuid.uuid4().hex
+        with DatabaseConnection.get_connection() as conn:
+            with conn.cursor() as cursor:
+                # 여러 프로세스의 스위퍼가 같은 행을 잡지 않도록 UPDATE로 선점
+                cursor.execute("""
+                    UPDATE photo_file_tombstones
+                    SET claimed_by = %s, claimed_at = NOW()
+                    WHERE next_attempt_at <= NOW()
+                      AND (claimed_by IS NULL OR claimed_at < NOW() - INTERVAL %s SECOND)
+                    ORDER BY id
+                    LIMIT %s
+                """, (token, CLAIM_TIMEOUT, batch_size))
+                if not cursor.rowcount:
+                    return 0
+                cursor.execute("""
+                    SELECT id, file_path, blob_hash, attempts
+                    FROM photo_file_tombstones WHERE claimed_by = %s
+                """, (token,))
+                rows = cursor.fetchall()
+
+                done, failed = [], []
+                for row in rows:
+                    try:
+                        if row['blob_hash']:
+                            # 그 사이 같은 내용이 다시 업로드됐으면 파일을 남겨둠
+                            conn.begin()
+                            if PhotoBlob.lock_unreferenced(cursor, row['blob_hash']):
+                                PhotoGC._unlink(row['file_path'])
+                            cursor.execute("DELETE FROM photo_file_tombstones WHERE id = %s", (row['id'],))
+                            conn.commit()
+                        else:
+                            PhotoGC._unlink(row['file_path'])
+                            done.append(row['id'])
+                    except Exception as e:
+                        if row['blob_hash']:
+                            conn.rollback()
+                        failed.append((row, e))
+
+                if done:
+                    placeholders = ', '.join(['%s'] * len(done))
+                    cursor.execute(f"DELETE FROM photo_file_tombstones WHERE id IN ({placeholders})", done)
+
+                for row, error in failed:
+                    # 지수 백오프 (5초, 10초, 20초 ... 최대 1시간)
+                    delay = min(5 * 2 ** row['attempts'], MAX_RETRY_DELAY)
+                    cursor.execute("""
+                        UPDATE photo_file_tombstones
+                        SET attempts = attempts + 1, last_error = %s, claimed_by = NULL,
+                            next_attempt_at = NOW() + INTERVAL %s SECOND
+                        WHERE id = %s
+                    """, (str(error)[:255], delay, row['id']))
+                    print(f"[PHOTO_GC] unlink failed ({row['attempts'] + 1}회): {row['file_path']} - {error}")
+                return len(rows)
+
+    @staticmethod
+    def reconcile(root_path: str) -> dict:
+        """저장소와 DB 정합성 점검 - 매달린 행/참조 수 불일치/고아 파일을 찾아 tombstone 등록"""
+        stats = {'dangling_variants': 0, 'stuck_processing': 0, 'orphan_blobs': 0,
+                 'orphan_files': 0, 'stale_temp_files': 0}
+
+        with DatabaseConnection.get_connection() as conn:
+            with conn.cursor() as cursor:
+                # 1. 사진이 지워진 뒤 늦게 들어온 변형 행
+                conn.begin()
+                cursor.execute("""
+                    SELECT v.id, v.file_path, v.blob_hash
+                    FROM car_photo_variants v
+                    LEFT JOIN car_photos p ON p.user_id = v.user_id AND p.photo_id = v.photo_id
+                    WHERE p.id IS NULL AND v.created_at < NOW() - INTERVAL %s SECOND
+                    FOR UPDATE
+                """, (ORPHAN_GRACE,))
+                dangling = cursor.fetchall()
+                if dangling:
+                    placeholders = ', '.join(['%s'] * len(dangling))
+                    cursor.execute(f"DELETE FROM car_photo_variants WHERE id IN ({placeholders})",
+                                   [row['id'] for row in dangling])
+                    orphans = PhotoBlob.decrement(cursor, [row['blob_hash'] for row in dangling])
+                    PhotoGC.enqueue(cursor, [(row['file_path'], None) for row in dangling if not row['blob_hash']]
+                                    + [(row['file_path'], row['hash']) for row in orphans])
+                conn.commit()
+                stats['dangling_variants'] = len(dangling)
+
+                # 2. 서버 재시작 등으로 워커 결과를 받지 못한 사진
+                cursor.execute("""
+                    UPDATE car_photos SET status = 'failed'
+                    WHERE status = 'processing' AND created_at < NOW() - INTERVAL %s SECOND
+                """, (ORPHAN_GRACE,))
+                stats['stuck_processing'] = cursor.rowcount
+
+                # 3. 참조 수 재계산 후 참조 없는 블롭 정리 (최근 변경된 블롭은 처리 중일 수 있어 제외)
+                conn.begin()
+                cursor.execute("""
+                    UPDATE photo_blobs b
+                    LEFT JOIN (
+                        SELECT blob_hash, COUNT(*) AS refs FROM (
+                            SELECT blob_hash FROM car_photos WHERE blob_hash IS NOT NULL
+                            UNION ALL
+                            SELECT blob_hash FROM car_photo_variants WHERE blob_hash IS NOT NULL
+                        ) r GROUP BY blob_hash
+                    ) counted ON counted.blob_hash = b.hash
+                    SET b.ref_count = COALESCE(counted.refs, 0)
+                    WHERE b.updated_at < NOW() - INTERVAL %s SECOND
+                """, (ORPHAN_GRACE,))
+                cursor.execute("""
+                    SELECT hash, file_path FROM photo_blobs
+                    WHERE ref_count <= 0 AND updated_at < NOW() - INTERVAL %s SECOND
+                    FOR UPDATE
+                """, (ORPHAN_GRACE,))
+                orphans = cursor.fetchall()
+                if orphans:
+                    placeholders = ', '.join(['%s'] * len(orphans))
+                    cursor.execute(f"DELETE FROM photo_blobs WHERE hash IN ({placeholders})",
+                                   [row['hash'] for row in orphans])
+                    PhotoGC.enqueue(cursor, [(row['file_path'], row['hash']) for row in orphans])
+                conn.commit()
+                stats['orphan_blobs'] = len(orphans)
+
+                # 4. DB에 없는 블롭 파일 (스위퍼가 잠금 후 한 번 더 확인하고 지움)
+                blob_root = os.path.join(root_path, 'uploads', 'blobs')
+                cutoff = time.time() - ORPHAN_GRACE
+                candidates = {}
+                for directory, dirnames, filenames in os.walk(blob_root):
+                    if directory == blob_root and 'tmp' in dirnames:
+                        dirnames.remove('tmp')
+                    for name in filenames:
+                        path = os.path.join(directory, name)
+                        try:
+                            if os.path.getmtime(path) < cutoff:
+                                candidates[os.path.splitext(name)[0]] = path
+                        except OSError:
+                            continue
+
+                hashes = list(candidates)
+                for i in range(0, len(hashes), 500):
+                    chunk = hashes[i:i + 500]
+                    placeholders = ', '.join(['%s'] * len(chunk))
+                    cursor.execute(f"SELECT hash FROM photo_blobs WHERE hash IN ({placeholders})", chunk)
+                    known = {row['hash'] for row in cursor.fetchall()}
+                    missing = [(candidates[h], h) for h in chunk if h not in known]
+                    stats['orphan_files'] += PhotoGC.enqueue(cursor, missing)
+
+        # 5. 완료되지 못한 스테이징 파일 / 업로드 원본
+        for directory in (os.path.join(root_path, 'uploads', 'blobs', 'tmp'),
+                          os.path.join(root_path, 'uploads', 'pending')):
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        PhotoGC._unlink(path)
+                        stats['stale_temp_files'] += 1
+                except OSError:
+                    continue
+        return stats
+
+    @classmethod
+    def start(cls, root_path: str):
+        """백그라운드 스위퍼/리컨실러 스레드 시작 (프로세스당 1회)"""
+        if cls._thread is not None or SWEEP_INTERVAL <= 0:
+            return
+        cls._root = root_path
+        cls._last_reconcile = time.time()
+
+        def run():
+            while True:
+                cls._wake.wait(SWEEP_INTERVAL)
+                cls._wake.clear()
+                try:
+                    # 밀린 tombstone이 많으면 배치가 빌 때까지 연속 처리
+                    while cls.sweep() >= SWEEP_BATCH:
+                        pass
+                    if RECONCILE_INTERVAL > 0 and time.time() - cls._last_reconcile >= RECONCILE_INTERVAL:
+                        cls._last_reconcile = time.time()
+                        stats = cls.reconcile(cls._root)
+                        if any(stats.values()):
+                            print(f"[PHOTO_GC] reconcile: {stats}")
+                except Exception as e:
+                    print(f"[PHOTO_GC] error: {e}")
+
+        cls._thread = threading.Thread(target=run, name='photo-gc', daemon=True)
+        cls._thread.start()
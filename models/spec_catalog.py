@@ -0,0 +1,267 @@
+# SpecCatalog 모델 - 차량 스펙 인메모리 카탈로그 (DB 왕복 없는 조회/비교)
+
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Any
+from .base import DatabaseConnection
+from .vehicle_spec import VehicleSpec
+from utils.image_manifest import ImageManifest
+from utils.sampler import AliasSampler, pick_uniform
+
+# 카탈로그 재적재 주기 (초) - 스펙 데이터는 거의 바뀌지 않음
+CATALOG_TTL = int(os.getenv('SPEC_CATALOG_TTL', '300'))
+
+# 한 번에 비교 가능한 최대 모델 수
+MAX_COMPARE_SPECS = int(os.getenv('SPEC_COMPARE_MAX', '4'))
+
+# 비교 대상 필드 정의: (컬럼명, 라벨, 타입, 선호 방향)
+# 타입이 'number'인 필드는 '225kW (306PS)' 같은 문자열에서 수치/단위를 추출함
+# 선호 방향: 'higher' / 'lower' / None (우열 없음)
+COMPARE_FIELDS = [
+    ('category', '차량 카테고리', 'text', None),
+    ('segment', '차량 세그먼트', 'text', None),
+    ('engine_type', '엔진 타입', 'text', None),
+    ('displacement', '배기량', 'number', None),
+    ('power', '최고 출력', 'number', 'higher'),
+    ('torque', '최대 토크', 'number', 'higher'),
+    ('fuel_efficiency', '연비', 'number', 'higher'),
+    ('transmission', '변속기', 'text', None),
+    ('drive_type', '구동 방식', 'text', None),
+    ('voltage', '전압 시스템', 'number', None),
+    ('fuel_capacity', '연료/배터리 용량', 'number', 'higher'),
+    ('length', '전장', 'number', None),
+    ('width', '전폭', 'number', None),
+    ('height', '전고', 'number', None),
+    ('wheelbase', '축거', 'number', None),
+    ('weight', '공차 중량', 'number', None),
+    ('max_speed', '최고 속도', 'number', 'higher'),
+    ('acceleration', '제로백', 'number', 'lower'),
+]
+
+_NUMBER_PATTERN = re.compile(r'^\s*([0-9][0-9,]*(?:\.[0-9]+)?)\s*([A-Za-z/]+)?')
+
+def parse_spec_value(raw: Any) -> Dict:
+    """스펙 문자열을 수치/단위로 변환 (예: '4,635mm' -> 4635.0, 'mm')"""
+    if raw is None:
+        return {'raw': None, 'value': None, 'unit': None}
+    if isinstance(raw, (int, float)):
+        return {'raw': raw, 'value': float(raw), 'unit': None}
+
+    match = _NUMBER_PATTERN.match(str(raw))
+    if not match:
+        # 'N/A' 등 수치가 없는 값
+        return {'raw': raw, 'value': None, 'unit': None}
+
+    value = float(match.group(1).replace(',', ''))
+    return {'raw': raw, 'value': value, 'unit': match.group(2)}
+
+class SpecCatalog:
+    """차량 스펙 카탈로그 클래스 - vehicle_specs 전체를 메모리에 캐시"""
+
+    _lock = threading.Lock()
+    _specs: Dict[int, Dict] = {}
+    _ordered_ids: List[int] = []
+    _version: Optional[str] = None
+    _loaded_at: float = 0.0
+    _samplers: Dict[tuple, Any] = {}    # (필터, 가중치) -> ID 목록 또는 AliasSampler
+
+    @classmethod
+    def refresh(cls, force: bool = False) -> bool:
+        """카탈로그 재적재 (TTL 경과 또는 force=True 일 때만 DB 조회)"""
+        with cls._lock:
+            if not force and cls._version is not None and time.time() - cls._loaded_at < CATALOG_TTL:
+                return False
+
+            try:
+                with DatabaseConnection.get_connection() as conn:
+                    with conn.cursor() as cursor:
+                        rows = VehicleSpec.fetch_all(cursor)
+            except Exception as e:
+                # DB 장애와 빈 테이블을 구분 - 장애면 빈 카탈로그를 버전으로 확정하지 않음
+                print(f"[SPEC_CATALOG] load error: {e}")
+                if cls._version is not None:
+                    # 기존 스냅샷 유지 (다음 주기에 재시도)
+                    cls._loaded_at = time.time()
+                return False
+
+            fingerprint = hashlib.sha1(
+                repr([sorted(row.items(), key=lambda kv: kv[0]) for row in rows]).encode('utf-8')
+            ).hexdigest()[:16]
+
+            # 스냅샷은 통째로 교체 (읽기 쪽은 락 없이 참조)
+            cls._specs = {row['id']: row for row in rows}
+            cls._ordered_ids = [row['id'] for row in rows]
+            cls._version = fingerprint
+            cls._loaded_at = time.time()
+            cls._samplers = {}
+            return True
+
+    @classmethod
+    def invalidate(cls):
+        """다음 조회 시 카탈로그를 다시 적재하도록 표시"""
+        with cls._lock:
+            cls._loaded_at = 0.0
+
+    @classmethod
+    def _ensure_loaded(cls):
+        if cls._version is None or time.time() - cls._loaded_at >= CATALOG_TTL:
+            cls.refresh()
+
+    @classmethod
+    def version(cls) -> Optional[str]:
+        """현재 카탈로그 버전 (스펙 데이터 지문)"""
+        cls._ensure_loaded()
+        return cls._version
+
+    @classmethod
+    def get_all(cls) -> List[Dict]:
+        """전체 스펙 목록 (category, model 순)"""
+        cls._ensure_loaded()
+        specs = cls._specs
+        return [specs[spec_id] for spec_id in cls._ordered_ids]
+
+    @classmethod
+    def get_by_category(cls, category: str) -> List[Dict]:
+        """카테고리별 스펙 목록 (model 순)"""
+        return [spec for spec in cls.get_all() if spec.get('category') == category]
+
+    @classmethod
+    def get(cls, spec_id: int) -> Optional[Dict]:
+        """ID로 스펙 조회"""
+        cls._ensure_loaded()
+        return cls._specs.get(spec_id)
+
+    @classmethod
+    def ids(cls) -> List[int]:
+        """전체 스펙 ID 목록"""
+        cls._ensure_loaded()
+        return cls._ordered_ids
+
+    @classmethod
+    def search(cls, keyword: str, filter_type: str = 'all') -> List[Dict]:
+        """키워드로 스펙 검색 (model / category / engine_type 부분 일치, 최신 ID 순)"""
+        cls._ensure_loaded()
+        keyword = keyword.lower()
+        fields = ('model',) if filter_type == 'model' else ('model', 'category', 'engine_type')
+
+        results = []
+        for spec in cls._specs.values():
+            if any(keyword in (spec.get(field) or '').lower() for field in fields):
+                results.append(spec)
+        results.sort(key=lambda spec: spec['id'], reverse=True)
+        return results
+
+    @classmethod
+    def _sampler(cls, engine_type: str = None, category: str = None, weights: Dict[int, float] = None):
+        """필터/가중치 조합별 샘플러 (카탈로그 버전 내에서 재사용)"""
+        weight_key = tuple(sorted(weights.items())) if weights else None
+        key = (engine_type, category, weight_key)
+        sampler = cls._samplers.get(key)
+        if sampler is not None:
+            return sampler
+
+        spec_ids = [
+            spec_id for spec_id in cls._ordered_ids
+            if (engine_type is None or cls._specs[spec_id].get('engine_type') == engine_type)
+            and (category is None or cls._specs[spec_id].get('category') == category)
+        ]
+        if weights:
+            # 가중치가 지정되지 않은 모델은 추출 대상에서 제외
+            spec_ids = [spec_id for spec_id in spec_ids if weights.get(spec_id, 0) > 0]
+            sampler = AliasSampler(spec_ids, [weights[spec_id] for spec_id in spec_ids]) if spec_ids else []
+        else:
+            sampler = spec_ids
+        cls._samplers[key] = sampler
+        return sampler
+
+    @classmethod
+    def random_spec(cls, engine_type: str = None, category: str = None,
+                    weights: Dict[int, float] = None) -> Optional[Dict]:
+        """랜덤 스펙 1개 선택 (예: engine_type='Electric' -> 랜덤 전기차)"""
+        cls._ensure_loaded()
+        sampler = cls._sampler(engine_type, category, weights)
+        if isinstance(sampler, AliasSampler):
+            spec_id = sampler.pick()
+        else:
+            spec_id = pick_uniform(sampler)
+        return cls._specs.get(spec_id) if spec_id is not None else None
+
+    @classmethod
+    def sample_specs(cls, count: int, engine_type: str = None, category: str = None,
+                     weights: Dict[int, float] = None) -> List[Dict]:
+        """랜덤 스펙 count개 복원 추출 (대량 픽스처 시딩용)"""
+        cls._ensure_loaded()
+        sampler = cls._sampler(engine_type, category, weights)
+        if isinstance(sampler, AliasSampler):
+            spec_ids = sampler.sample(count)
+        elif sampler:
+            spec_ids = random.choices(sampler, k=count)
+        else:
+            spec_ids = []
+        return [cls._specs[spec_id] for spec_id in spec_ids]
+
+    @classmethod
+    def get_images(cls, spec_id: int) -> List[Dict]:
+        """모델 ID별 메인 이미지 목록 (이미지 매니페스트 참조)"""
+        return ImageManifest.get_images(spec_id, 'main')
+
+    @classmethod
+    def compare(cls, spec_ids: List[int]) -> Dict:
+        """여러 모델의 스펙을 필드 단위로 정렬해 비교 결과 생성"""
+        cls._ensure_loaded()
+        specs = [cls._specs[spec_id] for spec_id in spec_ids]
+
+        models = []
+        for spec in specs:
+            images = cls.get_images(spec['id'])
+            models.append({
+                'id': spec['id'],
+                'model': spec['model'],
+                'category': spec.get('category'),
+                'images': images,
+                'hero_image': images[0]['file_path'] if images else None
+            })
+
+        fields = []
+        for key, label, field_type, prefer in COMPARE_FIELDS:
+            field = {'key': key, 'label': label, 'type': field_type}
+
+            if field_type == 'text':
+                values = [spec.get(key) for spec in specs]
+                field['values'] = values
+                field['all_equal'] = len(set(values)) <= 1
+                fields.append(field)
+                continue
+
+            parsed = [parse_spec_value(spec.get(key)) for spec in specs]
+            field['values'] = parsed
+            field['unit'] = next((p['unit'] for p in parsed if p['unit']), None)
+            field['prefer'] = prefer
+
+            numeric = [(spec['id'], p['value']) for spec, p in zip(specs, parsed) if p['value'] is not None]
+            if numeric:
+                min_value = min(value for _, value in numeric)
+                max_value = max(value for _, value in numeric)
+                field['min'] = min_value
+                field['max'] = max_value
+                field['min_ids'] = [spec_id for spec_id, value in numeric if value == min_value]
+                field['max_ids'] = [spec_id for spec_id, value in numeric if value == max_value]
+                if prefer == 'higher':
+                    field['best_ids'] = field['max_ids']
+                elif prefer == 'lower':
+                    field['best_ids'] = field['min_ids']
+            else:
+                field['min'] = field['max'] = None
+                field['min_ids'] = field['max_ids'] = []
+            fields.append(field)
+
+        return {
+            'ids': list(spec_ids),
+            'models': models,
+            'fields': fields,
+            'catalog_version': cls._version
+        }
@@ -1,7 +1,8 @@
 # User 모델 - 사용자 데이터 관리
 
 from typing import Dict, List, Optional, Any
-from .base import DatabaseHelper
+from .base import DatabaseHelper, DatabaseConnection
+from .market_post import MarketPost
 import hashlib
 from datetime import datetime
 
@@ -76,7 +77,18 @@ class User:
             params.append(user_id)
             query = f"UPDATE users SET {', '.join(update_fields)} WHERE id = %s"
             
-            return DatabaseHelper.execute_update(query, tuple(params)) > 0
+            if 'name' not in kwargs:
+                return DatabaseHelper.execute_update(query, tuple(params)) > 0
+            
+            # 이름이 바뀌면 중고장터 목록 프로젝션의 판매자 이름도 같은 트랜잭션에서 갱신
+            with DatabaseConnection.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    conn.begin()
+                    cursor.execute(query, tuple(params))
+                    updated = cursor.rowcount > 0
+                    MarketPost.refresh_seller(cursor, user_id)
+                    conn.commit()
+            return updated
         except Exception as e:
             print(f"Profile update error: {e}")
             return False
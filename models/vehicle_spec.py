@@ -14,6 +14,12 @@ class VehicleSpec:
         ORDER BY category, model
         """
         return DatabaseHelper.execute_query(query)
+
+    @staticmethod
+    def fetch_all(cursor) -> List[Dict]:
+        """모든 차량 스펙 조회 (호출 측 커서 사용 - DB 오류는 빈 목록 대신 예외로 전달)"""
+        cursor.execute("SELECT * FROM vehicle_specs ORDER BY category, model")
+        return list(cursor.fetchall())
     
     @staticmethod
     def get_by_id(spec_id: int) -> Optional[Dict]:
@@ -123,12 +129,7 @@ class VehicleSpec:
         return stats
 
     @staticmethod
-    def get_random() -> Optional[Dict]:
-        """랜덤으로 차량 스펙 하나 선택"""
-        query = """
-        SELECT * FROM vehicle_specs
-        ORDER BY RAND()
-        LIMIT 1
-        """
-        result = DatabaseHelper.execute_query(query)
-        return result[0] if result else None
\ No newline at end of file
+    def get_random(engine_type: str = None, category: str = None) -> Optional[Dict]:
+        """랜덤으로 차량 스펙 하나 선택 (인메모리 카탈로그 ID 목록 기반, 테이블 스캔 없음)"""
+        from .spec_catalog import SpecCatalog
+        return SpecCatalog.random_spec(engine_type=engine_type, category=category)
\ No newline at end of file
@@ -0,0 +1,99 @@
+# VideoPackager 모델 - 주행 영상 HLS 패키징 백그라운드 작업
+#  - 카탈로그(driving_videos)에서 hls_status = 'pending' 인 영상을 'processing'으로 선점해 fMP4/HLS로 리먹싱
+#  - ffmpeg가 없으면 'unavailable'로 표시 (스트리밍은 Range 기반 progressive MP4로 계속 동작)
+
+import os
+import threading
+from typing import Optional
+from .base import DatabaseHelper
+from utils.video_thumbnails import ffmpeg_available, file_fingerprint
+from utils.video_packaging import package_hls
+
+PACKAGE_INTERVAL = int(os.getenv('VIDEO_PACKAGE_INTERVAL', '30'))
+PACKAGE_BATCH = int(os.getenv('VIDEO_PACKAGE_BATCH', '2'))
+STALE_PROCESSING = 3600
+
+class VideoPackager:
+    """주행 영상 HLS 패키징 클래스"""
+
+    _thread: Optional[threading.Thread] = None
+    _wake = threading.Event()
+
+    @staticmethod
+    def cache_root(root_path: str) -> str:
+        return os.path.join(root_path, 'uploads', 'video_hls')
+
+    @classmethod
+    def wake(cls):
+        cls._wake.set()
+
+    @staticmethod
+    def process_pending(root_path: str, video_dir: str, batch_size: int = PACKAGE_BATCH) -> int:
+        """대기 중인 영상 한 배치 패키징 후 처리 수 반환"""
+        rows = DatabaseHelper.execute_query("""
+            SELECT id, filename FROM driving_videos
+            WHERE hls_status = 'pending' AND probe_error IS NULL
+            ORDER BY id
+            LIMIT %s
+        """, (batch_size,))
+        if not rows:
+            return 0
+        if not ffmpeg_available():
+            DatabaseHelper.execute_update(
+                "UPDATE driving_videos SET hls_status = 'unavailable' WHERE hls_status = 'pending'")
+            return 0
+
+        done = 0
+        for row in rows:
+            if not DatabaseHelper.execute_update("""
+                UPDATE driving_videos SET hls_status = 'processing'
+                WHERE id = %s AND hls_status = 'pending'
+            """, (row['id'],)):
+                continue  # 다른 프로세스가 먼저 가져감
+            try:
+                path = os.path.join(video_dir, row['filename'])
+                fingerprint = file_fingerprint(path)
+                result = package_hls(path, VideoPackager.cache_root(root_path), fingerprint)
+                DatabaseHelper.execute_update("""
+                    UPDATE driving_videos
+                    SET content_hash = %s, hls_status = 'ready', hls_segments = %s, hls_error = NULL
+                    WHERE id = %s AND hls_status = 'processing'
+                """, (fingerprint, result['segments'], row['id']))
+            except Exception as e:
+                print(f"[VIDEO_HLS] {row['filename']} failed: {e}")
+                DatabaseHelper.execute_update("""
+                    UPDATE driving_videos SET hls_status = 'failed', hls_error = %s
+                    WHERE id = %s AND hls_status = 'processing'
+                """, (str(e)[:255], row['id']))
+            done += 1
+        return done
+
+    @classmethod
+    def start(cls, root_path: str, video_dir: str, interval: int = PACKAGE_INTERVAL):
+        """백그라운드 패키징 스레드 시작 (프로세스당 1회)"""
+        if cls._thread is not None or interval <= 0:
+            return
+
+        def run():
+            try:
+                DatabaseHelper.execute_update("""
+                    UPDATE driving_videos SET hls_status = 'pending'
+                    WHERE hls_status = 'processing' AND updated_at < NOW() - INTERVAL %s SECOND
+                """, (STALE_PROCESSING,))
+                if ffmpeg_available():
+                    DatabaseHelper.execute_update(
+                        "UPDATE driving_videos SET hls_status = 'pending' WHERE hls_status = 'unavailable'")
+            except Exception as e:
+                print(f"[VIDEO_HLS] startup error: {e}")
+
+            while True:
+                cls._wake.wait(interval)
+                cls._wake.clear()
+                try:
+                    while cls.process_pending(root_path, video_dir) >= PACKAGE_BATCH:
+                        pass
+                except Exception as e:
+                    print(f"[VIDEO_HLS] error: {e}")
+
+        cls._thread = threading.Thread(target=run, name='video-packager', daemon=True)
+        cls._thread.start()
@@ -0,0 +1,102 @@
+# VideoThumbnailer 모델 - 주행 영상 미리보기 생성 백그라운드 작업
+#  - 카탈로그(driving_videos)에서 thumb_status = 'pending' 인 영상을 가져가 포스터/스프라이트/VTT 생성
+#  - 여러 프로세스가 같은 영상을 잡지 않도록 'processing'으로 선점한 뒤 처리
+#  - ffmpeg가 없으면 'unavailable'로 표시하고, 다음 시작 시 ffmpeg가 있으면 다시 'pending'으로 되돌림
+
+import os
+import threading
+from typing import Optional
+from .base import DatabaseHelper
+from utils.video_thumbnails import ffmpeg_available, file_fingerprint, generate_thumbnails
+
+THUMB_INTERVAL = int(os.getenv('VIDEO_THUMB_INTERVAL', '30'))
+THUMB_BATCH = int(os.getenv('VIDEO_THUMB_BATCH', '5'))
+# 이 시간 넘게 'processing'인 행은 처리하던 프로세스가 죽은 것으로 보고 다시 대기열로
+STALE_PROCESSING = 3600
+
+class VideoThumbnailer:
+    """주행 영상 미리보기 생성 클래스"""
+
+    _thread: Optional[threading.Thread] = None
+    _wake = threading.Event()
+
+    @staticmethod
+    def cache_root(root_path: str) -> str:
+        return os.path.join(root_path, 'uploads', 'video_thumbs')
+
+    @classmethod
+    def wake(cls):
+        """새 영상이 등록됐을 때 다음 주기까지 기다리지 않고 처리"""
+        cls._wake.set()
+
+    @staticmethod
+    def process_pending(root_path: str, video_dir: str, batch_size: int = THUMB_BATCH) -> int:
+        """대기 중인 영상 한 배치 처리 후 처리 수 반환"""
+        rows = DatabaseHelper.execute_query("""
+            SELECT id, filename, duration_ms FROM driving_videos
+            WHERE thumb_status = 'pending'
+            ORDER BY id
+            LIMIT %s
+        """, (batch_size,))
+        if not rows:
+            return 0
+        if not ffmpeg_available():
+            DatabaseHelper.execute_update(
+                "UPDATE driving_videos SET thumb_status = 'unavailable' WHERE thumb_status = 'pending'")
+            return 0
+
+        done = 0
+        for row in rows:
+            if not DatabaseHelper.execute_update("""
+                UPDATE driving_videos SET thumb_status = 'processing'
+                WHERE id = %s AND thumb_status = 'pending'
+            """, (row['id'],)):
+                continue  # 다른 프로세스가 먼저 가져감
+            try:
+                path = os.path.join(video_dir, row['filename'])
+                fingerprint = file_fingerprint(path)
+                generate_thumbnails(path, VideoThumbnailer.cache_root(root_path), fingerprint,
+                                    row['duration_ms'])
+                DatabaseHelper.execute_update("""
+                    UPDATE driving_videos
+                    SET content_hash = %s, thumb_status = 'ready', thumb_error = NULL
+                    WHERE id = %s AND thumb_status = 'processing'
+                """, (fingerprint, row['id']))
+            except Exception as e:
+                print(f"[VIDEO_THUMB] {row['filename']} failed: {e}")
+                DatabaseHelper.execute_update("""
+                    UPDATE driving_videos SET thumb_status = 'failed', thumb_error = %s
+                    WHERE id = %s AND thumb_status = 'processing'
+                """, (str(e)[:255], row['id']))
+            done += 1
+        return done
+
+    @classmethod
+    def start(cls, root_path: str, video_dir: str, interval: int = THUMB_INTERVAL):
+        """백그라운드 생성 스레드 시작 (프로세스당 1회)"""
+        if cls._thread is not None or interval <= 0:
+            return
+
+        def run():
+            try:
+                DatabaseHelper.execute_update("""
+                    UPDATE driving_videos SET thumb_status = 'pending'
+                    WHERE thumb_status = 'processing' AND updated_at < NOW() - INTERVAL %s SECOND
+                """, (STALE_PROCESSING,))
+                if ffmpeg_available():
+                    DatabaseHelper.execute_update(
+                        "UPDATE driving_videos SET thumb_status = 'pending' WHERE thumb_status = 'unavailable'")
+            except Exception as e:
+                print(f"[VIDEO_THUMB] startup error: {e}")
+
+            while True:
+                cls._wake.wait(interval)
+                cls._wake.clear()
+                try:
+                    while cls.process_pending(root_path, video_dir) >= THUMB_BATCH:
+                        pass
+                except Exception as e:
+                    print(f"[VIDEO_THUMB] error: {e}")
+
+        cls._thread = threading.Thread(target=run, name='video-thumbnailer', daemon=True)
+        cls._thread.start()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+정적 파일 사전 압축 스크립트 (배포/빌드 단계에서 실행)
+static/ 아래 텍스트 에셋(js/css/html/svg ...)마다 .gz(gzip -9)와 .br(brotli 11) 형제 파일을 만듦
+서버는 클라이언트가 받을 수 있으면 형제 파일을 그대로 보내므로 요청마다 압축하지 않음
+(원본이 형제 파일보다 새로우면 서버가 원본을 보내므로, 에셋 수정 후 다시 실행해야 함)
+
+사용 예:
+    python precompress_static.py
+    python precompress_static.py --force
+    python precompress_static.py --clean
+"""
+
+import argparse
+import gzip
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.compression import COMPRESS_MIN_SIZE, PRECOMPRESS_EXTENSIONS
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 - 없으면 .gz만 만듦
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# 사용자 업로드/대용량 미디어 폴더는 건너뜀
+SKIP_DIRS = {'uploads', 'videos'}
+
+def iter_assets(root):
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS]
+        for filename in filenames:
+            if os.path.splitext(filename)[1].lower() in PRECOMPRESS_EXTENSIONS:
+                yield os.path.join(directory, filename)
+
+def write_sibling(path, suffix, compressed, source_mtime):
+    """임시 파일에 쓴 뒤 교체하고, mtime을 원본과 맞춰 신선도 비교가 되게 함"""
+    target = path + suffix
+    tmp_path = target + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(compressed)
+    os.utime(tmp_path, (source_mtime, source_mtime))
+    os.replace(tmp_path, target)
+    return len(compressed)
+
+def is_fresh(path, sibling):
+    try:
+        return os.stat(sibling).st_mtime >= os.stat(path).st_mtime
+    except OSError:
+        return False
+
+def precompress(path, force=False):
+    """파일 1개 압축 → (원본 크기, {확장자: 압축 크기}) - 압축 이득이 없으면 형제 파일을 만들지 않음"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    stat = os.stat(path)
+    results = {}
+    if len(data) < COMPRESS_MIN_SIZE:
+        return len(data), results
+
+    encoders = [('.gz', lambda raw: gzip.compress(raw, compresslevel=9))]
+    if brotli is not None:
+        encoders.append(('.br', lambda raw: brotli.compress(raw, quality=11)))
+
+    for suffix, encode in encoders:
+        if not force and is_fresh(path, path + suffix):
+            results[suffix] = os.path.getsize(path + suffix)
+            continue
+        compressed = encode(data)
+        if len(compressed) >= len(data):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+            continue
+        results[suffix] = write_sibling(path, suffix, compressed, stat.st_mtime)
+    return len(data), results
+
+def clean(root):
+    removed = 0
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS]
+        for filename in filenames:
+            base, suffix = os.path.splitext(filename)
+            if suffix in ('.gz', '.br') and os.path.splitext(base)[1].lower() in PRECOMPRESS_EXTENSIONS:
+                os.remove(os.path.join(directory, filename))
+                removed += 1
+    return removed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='정적 파일 .gz/.br 사전 압축')
+    parser.add_argument('--root', default=STATIC_DIR, help='정적 파일 루트 (기본: static/)')
+    parser.add_argument('--force', action='store_true', help='최신 형제 파일이 있어도 다시 압축')
+    parser.add_argument('--clean', action='store_true', help='만들어 둔 형제 파일 삭제')
+    args = parser.parse_args()
+
+    if args.clean:
+        print(f"🧹 형제 파일 {clean(args.root)}개 삭제")
+        sys.exit(0)
+
+    if brotli is None:
+        print("⚠️ brotli 모듈이 없어 .gz만 생성합니다 (pip install brotli)")
+
+    total_original = 0
+    total_best = 0
+    for path in sorted(iter_assets(args.root)):
+        original, results = precompress(path, args.force)
+        best = min(results.values()) if results else original
+        total_original += original
+        total_best += best
+        if results:
+            sizes = '  '.join(f"{suffix} {size / 1024:7.1f}KB" for suffix, size in sorted(results.items()))
+            print(f"{os.path.relpath(path, args.root):<40} {original / 1024:7.1f}KB  →  {sizes}")
+
+    if total_original:
+        print(f"\n합계 {total_original / 1024:.1f}KB → {total_best / 1024:.1f}KB "
+              f"({100 * total_best / total_original:.1f}%)")
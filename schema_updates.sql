@@ -0,0 +1,182 @@
+-- Connected Car Service 스키마 변경 스크립트
+-- 설명: init_database.sql 이후 기능 추가에 따라 필요한 테이블/컬럼 변경 사항
+-- (car_photos, used_market 테이블은 운영 DB에 이미 존재한다고 가정)
+
+USE connected_car_service;
+
+-- 1. 차량 사진 백그라운드 처리 상태
+--    processing: 원본 저장 후 워커 처리 대기/진행 중
+--    ready: 리사이즈/인코딩 완료
+--    failed: 처리 실패
+ALTER TABLE car_photos
+    ADD COLUMN status ENUM('processing', 'ready', 'failed') NOT NULL DEFAULT 'ready' COMMENT '이미지 처리 상태',
+    ADD INDEX idx_car_photos_user_status (user_id, status);
+
+-- 2. 차량 사진 크기 등급별 변형 (JPEG / WebP)
+--    size_class: 160 / 480 / 1024 / 1600 (원본보다 큰 등급은 만들지 않음)
+CREATE TABLE IF NOT EXISTS car_photo_variants (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    photo_id VARCHAR(64) NOT NULL COMMENT 'car_photos.photo_id',
+    user_id INT NOT NULL,
+    size_class SMALLINT NOT NULL COMMENT '크기 등급 (가로 px)',
+    format ENUM('jpeg', 'webp') NOT NULL,
+    filename VARCHAR(255) NOT NULL,
+    file_path VARCHAR(500) NOT NULL,
+    width INT NOT NULL,
+    height INT NOT NULL,
+    file_size INT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- photo_id는 사용자별로만 고유하므로(업로드 경로는 짧은 id 사용) user_id를 함께 키로 사용
+    -- (user_id가 앞에 있어 사용자별 조회/외래키 인덱스도 겸함)
+    UNIQUE KEY uq_variant (user_id, photo_id, size_class, format),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 3. 내용 주소 기반(SHA-256) 사진 저장소
+--    처리 완료 사진/변형은 uploads/blobs/ab/cd/<hash>.<ext> 에 저장되고
+--    같은 내용의 파일은 하나만 두고 참조 수로 관리함 (참조가 0이 될 때만 파일 삭제)
+CREATE TABLE IF NOT EXISTS photo_blobs (
+    hash CHAR(64) PRIMARY KEY COMMENT 'SHA-256 (hex)',
+    file_path VARCHAR(500) NOT NULL,
+    file_size INT NOT NULL,
+    mime_type VARCHAR(50) NOT NULL,
+    ref_count INT NOT NULL DEFAULT 0 COMMENT 'car_photos + car_photo_variants 참조 수',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        COMMENT '리컨실러가 최근 변경된 블롭(처리 중일 수 있음)을 건너뛰기 위한 변경 시각',
+    INDEX idx_photo_blobs_ref (ref_count)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- blob_hash가 NULL인 행은 블롭 저장소 이전 방식(uploads/car_photos 평면 디렉토리) 파일
+ALTER TABLE car_photos
+    ADD COLUMN blob_hash CHAR(64) NULL AFTER file_path,
+    ADD INDEX idx_car_photos_filename (filename),
+    ADD INDEX idx_car_photos_blob (blob_hash);
+
+ALTER TABLE car_photo_variants
+    ADD COLUMN blob_hash CHAR(64) NULL AFTER file_path,
+    ADD INDEX idx_variants_blob (blob_hash);
+
+-- 4. 사진 파일 지연 삭제 (tombstone) 및 정합성 점검
+--    전체 삭제 등은 행만 지우고 파일 경로를 여기에 남기며, 백그라운드 스위퍼가 배치로 삭제/재시도함
+CREATE TABLE IF NOT EXISTS photo_file_tombstones (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    file_path VARCHAR(500) NOT NULL,
+    blob_hash CHAR(64) NULL COMMENT '블롭이면 삭제 직전 참조 여부를 다시 확인',
+    attempts INT NOT NULL DEFAULT 0,
+    last_error VARCHAR(255) NULL,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    claimed_by CHAR(32) NULL COMMENT '처리 중인 스위퍼 토큰',
+    claimed_at TIMESTAMP NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_tombstones_due (next_attempt_at, claimed_by),
+    INDEX idx_tombstones_claim (claimed_by)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 5. 주행 영상 카탈로그
+--    static/assets/videos 를 스캔해 MP4 헤더(moov)에서 읽은 길이/해상도/코덱을 저장
+--    파일 크기/mtime이 바뀐 파일만 다시 읽음 (증분 스캔)
+CREATE TABLE IF NOT EXISTS driving_videos (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    filename VARCHAR(255) NOT NULL COMMENT 'static/assets/videos 기준 파일명',
+    user_id INT NULL COMMENT '업로드한 사용자 (기존 샘플 영상은 NULL)',
+    car_id INT NULL,
+    file_size BIGINT NOT NULL,
+    file_mtime DOUBLE NOT NULL COMMENT '인덱싱 시점 파일 mtime (변경 감지용)',
+    duration_ms INT NULL,
+    width INT NULL,
+    height INT NULL,
+    video_codec VARCHAR(16) NULL,
+    audio_codec VARCHAR(16) NULL,
+    recorded_at DATETIME NOT NULL COMMENT 'mvhd 생성 시각, 없으면 파일 mtime',
+    probe_error VARCHAR(255) NULL COMMENT 'MP4 해석 실패 사유',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_driving_videos_filename (filename),
+    INDEX idx_driving_videos_recorded (recorded_at, id),
+    INDEX idx_driving_videos_user (user_id, recorded_at, id),
+    INDEX idx_driving_videos_car (car_id, recorded_at, id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL,
+    FOREIGN KEY (car_id) REFERENCES cars(id) ON DELETE SET NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 6. 주행 영상 미리보기 (포스터 / 스프라이트 시트 / WebVTT)
+--    결과 파일은 uploads/video_thumbs/<지문 앞 2자리>/<지문>/ 에 캐시되고 content_hash로 찾음
+ALTER TABLE driving_videos
+    ADD COLUMN content_hash CHAR(64) NULL COMMENT '영상 내용 지문 (미리보기 캐시 키)' AFTER probe_error,
+    ADD COLUMN thumb_status ENUM('pending', 'processing', 'ready', 'failed', 'unavailable')
+        NOT NULL DEFAULT 'pending' COMMENT 'unavailable: ffmpeg 없음' AFTER content_hash,
+    ADD COLUMN thumb_error VARCHAR(255) NULL AFTER thumb_status,
+    ADD INDEX idx_driving_videos_thumb (thumb_status, id);
+
+-- 7. 주행 영상 HLS 패키징 (fMP4 세그먼트 + m3u8)
+--    결과는 uploads/video_hls/<지문 앞 2자리>/<지문>/ 에 캐시 (content_hash 공유)
+ALTER TABLE driving_videos
+    ADD COLUMN hls_status ENUM('pending', 'processing', 'ready', 'failed', 'unavailable')
+        NOT NULL DEFAULT 'pending' COMMENT 'unavailable: ffmpeg 없음' AFTER thumb_error,
+    ADD COLUMN hls_segments INT NULL AFTER hls_status,
+    ADD COLUMN hls_error VARCHAR(255) NULL AFTER hls_segments,
+    ADD INDEX idx_driving_videos_hls (hls_status, id);
+
+-- 8. 중고장터 목록 상태별 개수 캐시
+--    전체 개수는 COUNT(*) 대신 개수 테이블에서 읽음 (커서 페이지네이션용 인덱스는 9번 목록 프로젝션에 있음)
+--    개수는 게시글 작성/삭제/상태 변경과 같은 트랜잭션에서 갱신됨
+CREATE TABLE IF NOT EXISTS used_market_status_counts (
+    status VARCHAR(20) PRIMARY KEY COMMENT 'sale / reserved / sold',
+    post_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 기존 게시글 기준으로 개수 초기화 (다시 실행해도 현재 값으로 맞춰짐)
+INSERT INTO used_market_status_counts (status, post_count)
+SELECT status, COUNT(*) FROM used_market GROUP BY status
+ON DUPLICATE KEY UPDATE post_count = VALUES(post_count);
+
+-- 9. 중고장터 목록 프로젝션 (목록 화면 전용 비정규화 테이블)
+--    목록 API는 이 테이블만 읽음 - 본문 전체를 읽어 자르거나 users를 JOIN하지 않음
+--    게시글 작성/수정/삭제, 사용자 이름 변경, 조회수 반영 시 애플리케이션이 같은 트랜잭션에서 갱신
+CREATE TABLE IF NOT EXISTS used_market_listing (
+    post_id INT PRIMARY KEY COMMENT 'used_market.id',
+    user_id INT NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    preview VARCHAR(110) NOT NULL COMMENT '본문 앞 100자 (+ ...)',
+    price INT NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL,
+    seller_name VARCHAR(100) NOT NULL COMMENT '판매자 표시 이름 (name, 없으면 username)',
+    view_count INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    INDEX idx_market_listing_created (created_at, post_id),
+    INDEX idx_market_listing_status_created (status, created_at, post_id),
+    INDEX idx_market_listing_user (user_id),
+    FOREIGN KEY (post_id) REFERENCES used_market(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 캐시 무효화용 버전 키 (목록 프로젝션이 바뀔 때마다 증가)
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 기존 게시글로 프로젝션 채우기 (다시 실행해도 현재 값으로 맞춰짐)
+INSERT INTO used_market_listing
+    (post_id, user_id, title, preview, price, status, seller_name, view_count, created_at)
+SELECT um.id, um.user_id, um.title,
+       CONCAT(LEFT(um.body, 100), IF(CHAR_LENGTH(um.body) > 100, '...', '')),
+       um.price, um.status, COALESCE(NULLIF(u.name, ''), u.username), um.view_count, um.created_at
+FROM used_market um
+JOIN users u ON um.user_id = u.id
+ON DUPLICATE KEY UPDATE
+    title = VALUES(title), preview = VALUES(preview), price = VALUES(price), status = VALUES(status),
+    seller_name = VALUES(seller_name), view_count = VALUES(view_count);
+
+INSERT INTO cache_versions (name, version) VALUES ('market_listing', 1)
+ON DUPLICATE KEY UPDATE version = version + 1;
+
+-- 10. 중고장터 전문 검색 (FULLTEXT + ngram 파서)
+--     ngram 파서는 한글을 ngram_token_size(기본 2)글자 단위로 색인하므로 형태소 분석 없이 부분 일치 검색 가능
+--     InnoDB는 FULLTEXT 인덱스를 한 번에 하나씩만 추가할 수 있어 문장을 나눔
+ALTER TABLE used_market
+    ADD FULLTEXT INDEX ft_used_market_title_body (title, body) WITH PARSER ngram;
+ALTER TABLE used_market
+    ADD FULLTEXT INDEX ft_used_market_title (title) WITH PARSER ngram;
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+대량 테스트 차량 데이터 시딩 스크립트
+인메모리 스펙 카탈로그에서 모델을 추출하므로 ORDER BY RAND() 없이 동작함
+
+사용 예:
+    python seed_fixture_cars.py 10000
+    python seed_fixture_cars.py 500 --engine-type Electric --owner-id 2
+"""
+
+import argparse
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.car import Car
+
+def seed_cars(count, owner_id=None, engine_type=None, category=None, batch_size=1000):
+    """count대의 차량을 batch_size 단위 multi-row INSERT로 등록"""
+    started = time.time()
+    inserted = 0
+
+    while inserted < count:
+        rows = Car.build_fixture_rows(min(batch_size, count - inserted),
+                                      owner_id=owner_id, engine_type=engine_type, category=category)
+        if not rows:
+            print("❌ 조건에 맞는 차량 스펙이 없거나 고유 VIN/번호판 생성에 실패했습니다.")
+            break
+        Car.bulk_register(rows)
+        inserted += len(rows)
+        print(f"✓ {inserted}/{count}대 등록")
+
+    elapsed = time.time() - started
+    print(f"\n✅ {inserted}대 등록 완료 ({elapsed:.2f}초)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='테스트 차량 대량 시딩')
+    parser.add_argument('count', type=int, help='생성할 차량 수')
+    parser.add_argument('--owner-id', type=int, default=None, help='소유자 ID (기본: 미등록 차량)')
+    parser.add_argument('--engine-type', default=None, help="엔진 타입 필터 (예: Electric)")
+    parser.add_argument('--category', default=None, help='카테고리 필터')
+    parser.add_argument('--batch-size', type=int, default=1000, help='INSERT 배치 크기')
+    args = parser.parse_args()
+
+    print("=== 테스트 차량 시딩 스크립트 ===")
+    seed_cars(args.count, owner_id=args.owner_id, engine_type=args.engine_type,
+              category=args.category, batch_size=args.batch_size)
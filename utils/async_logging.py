@@ -0,0 +1,235 @@
+# 비동기 로깅 (QueueHandler / QueueListener)
+#  - 요청 스레드는 로그 레코드를 큐에 넣기만 하고, 포맷팅과 파일 쓰기(RotatingFileHandler)는
+#    리스너 스레드 1개가 처리함 (핸들러 잠금을 요청 스레드끼리 다투지 않음)
+#  - 큐가 가득 차면 기다리지 않고 버림 (버린 개수는 dropped_records()로 확인)
+#  - 접근 로그: 요청마다 한 줄 (메서드/경로/상태/크기/지연 시간) → logs/access.log
+#    경로 접두사별 샘플링 비율 설정 가능, 5xx 응답과 느린 요청은 샘플링과 무관하게 항상 기록
+#  - LOG_CAPTURE_PRINT=1 이면 print() 출력을 줄 단위로 호출한 모듈의 로거로 보냄
+#    ([DEBUG]/[ERROR] 등 앞머리 태그로 레벨 결정, 꺼진 레벨은 큐에 넣지 않고 바로 버림)
+
+import atexit
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional, Tuple
+from flask import Flask, g, request
+
+LOG_DIR = os.getenv('LOG_DIR', 'logs')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+LOG_CONSOLE = os.getenv('LOG_CONSOLE', '1') == '1'
+LOG_CAPTURE_PRINT = os.getenv('LOG_CAPTURE_PRINT', '0') == '1'
+LOG_MAX_BYTES = 10 * 1024 * 1024  # 10MB
+LOG_BACKUP_COUNT = 5
+
+# "경로접두사=비율" 목록 (가장 긴 접두사 우선, 없으면 1 = 전부 기록, 0이면 기록 안 함)
+ACCESS_LOG_SAMPLE = os.getenv('ACCESS_LOG_SAMPLE', '/static=0.1,/videos/hls=0.1,/videos/thumbs=0.1')
+ACCESS_LOG_SLOW_MS = float(os.getenv('ACCESS_LOG_SLOW_MS', '1000'))
+ACCESS_LOGGER = 'access'
+
+LOG_FORMAT = '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
+ACCESS_FORMAT = '[%(asctime)s] %(message)s'
+
+# print() 앞머리 태그 → 레벨 (목록에 없는 태그/태그 없는 줄은 PRINT_WARNING_WORDS가 있으면 WARNING, 아니면 INFO)
+PRINT_TAG_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'WARN': logging.WARNING,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    '❌': logging.ERROR,
+    '⚠': logging.WARNING
+}
+PRINT_WARNING_WORDS = ('error', 'failed', '실패', '오류')
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional['DroppingQueueHandler'] = None
+
+class DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 버리는 QueueHandler - 포맷팅은 리스너 스레드에서 함"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # 같은 프로세스 안의 큐이므로 레코드를 그대로 넘김 (msg % args 포맷팅은 리스너에서)
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _AccessFilter(logging.Filter):
+    """접근 로그 레코드만 통과 (exclude=True면 반대로 접근 로그만 제외)"""
+
+    def __init__(self, exclude: bool = False):
+        super().__init__()
+        self.exclude = exclude
+
+    def filter(self, record):
+        return (record.name == ACCESS_LOGGER) != self.exclude
+
+class _WerkzeugRequestFilter(logging.Filter):
+    """werkzeug 개발 서버의 요청 줄 제외 (접근 로그와 중복)"""
+
+    def filter(self, record):
+        return '"%s" %s %s' not in str(record.msg)
+
+def _rotating_handler(filename: str, formatter, level=logging.NOTSET):
+    handler = RotatingFileHandler(os.path.join(LOG_DIR, filename),
+                                  maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    handler.setFormatter(formatter)
+    handler.setLevel(level)
+    return handler
+
+def init_logging():
+    """루트 로거를 큐 핸들러 1개로 바꾸고 리스너 스레드 시작 (프로세스당 1회)"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    app_handler = _rotating_handler('connected_car.log', formatter)
+    app_handler.addFilter(_AccessFilter(exclude=True))
+    access_handler = _rotating_handler('access.log', logging.Formatter(ACCESS_FORMAT))
+    access_handler.addFilter(_AccessFilter())
+    handlers = [app_handler, _rotating_handler('connected_car_error.log', formatter, logging.ERROR), access_handler]
+    if LOG_CONSOLE:
+        # print 캡처 시 sys.stdout이 바뀌므로 stderr에 씀
+        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    werkzeug_logger = logging.getLogger('werkzeug')
+    werkzeug_logger.setLevel(logging.INFO)
+    werkzeug_logger.addFilter(_WerkzeugRequestFilter())
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # 종료 시 큐에 남은 레코드를 모두 쓰고 파일을 닫음
+    atexit.register(shutdown_logging)
+
+    if LOG_CAPTURE_PRINT:
+        capture_print()
+
+def shutdown_logging():
+    """리스너 정지 - 큐에 남은 레코드를 모두 쓴 뒤 반환"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def dropped_records() -> int:
+    """큐가 가득 차서 버린 레코드 수"""
+    return _queue_handler.dropped if _queue_handler else 0
+
+# ==================== 접근 로그 ====================
+
+def _parse_sample_rules(spec: str) -> List[Tuple[str, float]]:
+    rules = []
+    for item in spec.split(','):
+        prefix, _, rate = item.strip().partition('=')
+        if prefix and rate:
+            rules.append((prefix, min(max(float(rate), 0.0), 1.0)))
+    return sorted(rules, key=lambda rule: len(rule[0]), reverse=True)
+
+_SAMPLE_RULES = _parse_sample_rules(ACCESS_LOG_SAMPLE)
+access_logger = logging.getLogger(ACCESS_LOGGER)
+
+def access_sample_rate(path: str) -> float:
+    for prefix, rate in _SAMPLE_RULES:
+        if path.startswith(prefix):
+            return rate
+    return 1.0
+
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+def _log_access(response):
+    """요청당 접근 로그 1줄 (세션은 읽지 않음 - 읽으면 응답에 Vary: Cookie가 붙음)"""
+    started = g.get('request_started')
+    elapsed_ms = (time.perf_counter() - started) * 1000 if started is not None else -1.0
+    rate = access_sample_rate(request.path)
+    if (response.status_code < 500 and elapsed_ms < ACCESS_LOG_SLOW_MS
+            and (rate <= 0 or (rate < 1 and random.random() >= rate))):
+        return response
+
+    # 스트리밍 응답은 크기를 알 수 없고(-), 지연 시간은 본문 전송 전까지의 시간
+    size = response.content_length
+    access_logger.info('method=%s path=%s status=%d bytes=%s ms=%.1f ip=%s rate=%g',
+                       request.method, request.full_path.rstrip('?'), response.status_code,
+                       size if size is not None else '-', elapsed_ms, request.remote_addr, rate)
+    return response
+
+def init_access_log(app: Flask):
+    """앱에 접근 로그 훅 등록 - 다른 after_request 훅(압축 등)보다 먼저 등록해야
+    마지막에 실행되어 최종 상태/크기가 기록됨"""
+    from flask.logging import default_handler
+    # Flask 기본 stderr 핸들러 대신 루트의 큐 핸들러로 전달
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(LOG_LEVEL)
+    app.before_request(_start_timer)
+    app.after_request(_log_access)
+
+# ==================== print 캡처 ====================
+
+class _PrintRouter:
+    """sys.stdout 대체 - 스레드별로 줄을 모아 호출한 모듈의 로거로 보냄"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    @staticmethod
+    def _level(line: str) -> int:
+        stripped = line.lstrip()
+        tag = stripped[1:stripped.find(']')] if stripped.startswith('[') else stripped[:1]
+        level = PRINT_TAG_LEVELS.get(tag)
+        if level is None:
+            lowered = stripped.lower()
+            level = logging.WARNING if any(word in lowered for word in PRINT_WARNING_WORDS) else logging.INFO
+        return level
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', '') + text
+        if '\n' in buffer:
+            *lines, buffer = buffer.split('\n')
+            # print()를 호출한 프레임의 모듈 이름/위치로 레코드를 만듦
+            frame = sys._getframe(1)
+            logger = logging.getLogger(frame.f_globals.get('__name__', 'stdout'))
+            for line in lines:
+                level = self._level(line)
+                if line and logger.isEnabledFor(level):
+                    logger.handle(logger.makeRecord(logger.name, level, frame.f_code.co_filename, frame.f_lineno,
+                                                    '%s', (line,), None, frame.f_code.co_name))
+        self._local.buffer = buffer
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def __getattr__(self, name):
+        # encoding / isatty / fileno 등은 원래 스트림 것을 사용
+        return getattr(self._stream, name)
+
+def capture_print():
+    """print() 출력을 로깅으로 보내기 시작 (이미 켜져 있으면 무시)"""
+    if not isinstance(sys.stdout, _PrintRouter):
+        sys.stdout = _PrintRouter(sys.stdout)
@@ -0,0 +1,59 @@
+# 내용 주소 기반(content-addressed) 파일 저장소
+# 파일을 SHA-256 해시로 이름 붙여 <root>/ab/cd/<hash>.<ext> 에 저장함
+#  - 같은 내용은 사용자/사진이 달라도 파일 1개를 공유 (참조 수는 DB photo_blobs에서 관리)
+#  - 2단계 샤딩으로 디렉토리당 파일 수를 작게 유지
+#  - 워커는 tmp/ 에 스테이징만 하고, 참조 등록 후 commit()으로 제자리에 옮김
+#    (삭제와 동시에 같은 해시가 들어와도 참조 없는 파일이 남거나 사라지지 않도록)
+
+import hashlib
+import os
+import uuid
+
+BLOB_URL_PREFIX = '/uploads/blobs'
+
+def blob_name(digest: str, ext: str) -> str:
+    """해시 -> 저장소 상대 경로 (예: ab/cd/abcd1234....jpg)"""
+    return f'{digest[:2]}/{digest[2:4]}/{digest}.{ext}'
+
+def blob_url(digest: str, ext: str) -> str:
+    """해시 -> 브라우저 접근 URL"""
+    return f'{BLOB_URL_PREFIX}/{blob_name(digest, ext)}'
+
+class BlobStore:
+    """SHA-256 샤딩 디렉토리 저장소 클래스"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.tmp_dir = os.path.join(root, 'tmp')
+
+    def path_for(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, blob_name(digest, ext))
+
+    def stage_bytes(self, data: bytes, ext: str) -> dict:
+        """데이터를 임시 위치에 기록하고 해시 정보 반환 (워커 프로세스에서 호출)"""
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        digest = hashlib.sha256(data).hexdigest()
+        staged_path = os.path.join(self.tmp_dir, f'{uuid.uuid4().hex}.{ext}')
+        with open(staged_path, 'wb') as f:
+            f.write(data)
+        return {'hash': digest, 'ext': ext, 'staged_path': staged_path, 'file_size': len(data)}
+
+    def commit(self, staged: dict) -> str:
+        """스테이징 파일을 해시 경로로 이동 (이미 있으면 스테이징 파일만 버림) 후 최종 경로 반환"""
+        path = self.path_for(staged['hash'], staged['ext'])
+        staged_path = staged['staged_path']
+        if os.path.exists(path):
+            self.discard(staged_path)
+        elif os.path.exists(staged_path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(staged_path, path)
+        return path
+
+    @staticmethod
+    def discard(path: str):
+        """파일 삭제 (실패해도 무시) - 빈 샤드 디렉토리는 그대로 둠"""
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,157 @@
+# 응답 압축 (gzip / brotli)
+#  - 동적 응답: after_request에서 Accept-Encoding을 보고 압축 (최소 크기 이상, 허용된 Content-Type만)
+#    스트리밍 응답은 청크마다 압축 후 flush 해서 받는 쪽이 바로 풀 수 있게 함
+#  - 정적 파일: 빌드 단계(precompress_static.py)에서 만든 .br / .gz 형제 파일이 있으면 그대로 전송
+#    (요청마다 압축하지 않음). 형제 파일이 없거나 원본보다 오래됐으면 원본을 그대로 보냄
+#  - 파일 전송 응답(direct_passthrough: 사진/영상/Range)은 건드리지 않음
+#  - brotli 모듈이 없으면 gzip만 사용
+
+import gzip
+import mimetypes
+import os
+import zlib
+from typing import Iterable, Iterator, Optional
+from flask import Flask, current_app, request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+# 동적 응답은 요청마다 압축하므로 빠른 품질, 빌드 단계는 최고 품질(11) 사용
+COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '5'))
+
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'text/xml', 'text/vtt',
+    'application/javascript', 'application/json', 'application/xml', 'application/manifest+json',
+    'application/vnd.apple.mpegurl', 'image/svg+xml'
+}
+
+# 정적 파일 사전 압축 대상 확장자 (precompress_static.py와 공유)
+PRECOMPRESS_EXTENSIONS = {'.html', '.css', '.js', '.json', '.svg', '.txt', '.xml', '.vtt', '.map'}
+
+# 우선순위 순서 (같은 q값이면 앞쪽 선택)
+_ENCODING_SUFFIX = {'br': '.br', 'gzip': '.gz'}
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def choose_encoding(available=None) -> Optional[str]:
+    """Accept-Encoding에서 q값이 가장 높은 지원 인코딩 (없으면 None)"""
+    accepted = request.accept_encodings
+    best, best_quality = None, 0
+    for encoding in available or supported_encodings():
+        quality = accepted[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+class _StreamEncoder:
+    """청크 단위 압축기 (gzip: zlib 스트림, br: brotli.Compressor)"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        else:
+            # wbits=31 → gzip 헤더/트레일러 포함
+            self._compressor = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """압축 후 지금까지의 출력을 모두 내보냄 (스트림 중간 flush)"""
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL)
+
+def _compress_iter(iterable: Iterable, encoding: str, charset: str) -> Iterator[bytes]:
+    encoder = _StreamEncoder(encoding)
+    try:
+        for chunk in iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            data = encoder.compress(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
+    finally:
+        if hasattr(iterable, 'close'):
+            iterable.close()
+
+def compress_response(response):
+    """after_request 훅 - 조건이 맞으면 응답 본문을 압축"""
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+    # 압축 여부와 무관하게 Accept-Encoding에 따라 본문이 달라질 수 있음을 캐시에 알림
+    response.vary.add('Accept-Encoding')
+
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers or request.method == 'HEAD'):
+        return response
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_iter(response.response, encoding, response.charset)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(compress_bytes(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+
+    # 표현이 바뀌었으므로 강한 ETag는 약한 ETag로 (If-None-Match는 약한 비교라 304는 그대로 동작)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def serve_static(filename: str):
+    """정적 파일 전송 - 사전 압축된 .br / .gz 형제 파일이 원본보다 새로우면 그것을 전송
+
+    형제 파일은 이미 압축돼 있으므로 brotli 모듈이 없어도 .br을 보낼 수 있음
+    """
+    static_folder = current_app.static_folder
+    path = safe_join(static_folder, filename)
+    if path and os.path.splitext(filename)[1].lower() in PRECOMPRESS_EXTENSIONS:
+        available = [encoding for encoding, suffix in _ENCODING_SUFFIX.items()
+                     if _sibling_fresh(path, path + suffix)]
+        encoding = choose_encoding(available) if available else None
+        if encoding:
+            response = send_from_directory(
+                static_folder, filename + _ENCODING_SUFFIX[encoding],
+                mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                max_age=current_app.get_send_file_max_age(filename)
+            )
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = current_app.send_static_file(filename)
+        response.vary.add('Accept-Encoding')
+        return response
+    return current_app.send_static_file(filename)
+
+def _sibling_fresh(path: str, sibling: str) -> bool:
+    try:
+        return os.stat(sibling).st_mtime >= os.stat(path).st_mtime
+    except OSError:
+        return False
+
+def init_compression(app: Flask):
+    """앱에 응답 압축 훅과 사전 압축 정적 파일 전송을 등록"""
+    app.after_request(compress_response)
+    if app.has_static_folder:
+        app.view_functions['static'] = serve_static
@@ -0,0 +1,131 @@
+# HTTP 조건부 요청 헬퍼 (ETag / Last-Modified / 304 / Range)
+
+import functools
+import hashlib
+import mimetypes
+import os
+from typing import Any, Callable, Optional
+from flask import current_app, request, Response
+from werkzeug.utils import send_file
+
+def make_etag(*parts) -> str:
+    """버전 값이나 본문 조각들로 ETag 값 생성 (따옴표 제외)"""
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()[:20]
+
+def conditional_response(body, mimetype: str, etag: str = None, last_modified: float = None,
+                         cache_control: str = None, weak: bool = False, vary: str = None) -> Response:
+    """ETag/Last-Modified를 붙인 응답 생성 - 클라이언트 캐시가 유효하면 304로 변환"""
+    response = Response(body, mimetype=mimetype)
+    if etag:
+        response.set_etag(etag, weak=weak)
+    if last_modified:
+        response.last_modified = last_modified
+    if cache_control:
+        response.headers['Cache-Control'] = cache_control
+    if vary:
+        response.vary.add(vary)
+    # If-None-Match / If-Modified-Since 평가 후 필요하면 304 (본문 제거)
+    return response.make_conditional(request)
+
+def conditional_json(cache_control: str = 'private, no-cache', vary: Optional[str] = 'Cookie',
+                     version: Optional[Callable[[], Any]] = None):
+    """읽기 전용 JSON API용 조건부 응답 데코레이터 (약한 ETag + If-None-Match 304)
+
+    version: 데이터 버전을 싸게 돌려주는 함수 - 있으면 뷰를 실행하기 전에 URL+버전으로 ETag를 만들어
+             일치하면 바로 304 (조회/직렬화 생략). 없으면 뷰 실행 후 본문 해시로 ETag 생성 (전송량만 절약)
+    cache_control / vary: 라우트별 정책 (뷰가 이미 설정한 값은 덮어쓰지 않음)
+    인증 검사 뒤에 평가되도록 @login_required 아래에 붙임
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            etag = None
+            if version is not None:
+                current = version()
+                if current is not None:
+                    etag = make_etag(request.full_path, current)
+                    if request.if_none_match.contains_weak(etag):
+                        response = current_app.response_class(status=304)
+                        response.set_etag(etag, weak=True)
+                        return _apply_cache_policy(response, cache_control, vary)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 304:
+                return _apply_cache_policy(response, cache_control, vary)  # 뷰가 직접 조건부 처리함
+            if response.status_code != 200 or response.is_streamed or response.direct_passthrough:
+                return response
+            if not response.get_etag()[0]:
+                response.set_etag(etag or make_etag(response.get_data()), weak=True)
+            _apply_cache_policy(response, cache_control, vary)
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+def _apply_cache_policy(response: Response, cache_control: Optional[str], vary: Optional[str]) -> Response:
+    if cache_control and 'Cache-Control' not in response.headers:
+        response.headers['Cache-Control'] = cache_control
+    if vary:
+        response.vary.add(vary)
+    return response
+
+# 파일 전송을 앞단 프록시에 위임하는 방식 (FILE_OFFLOAD 환경변수)
+#  - ''           : Python(WSGI)이 직접 전송 (기본)
+#  - 'x-accel'    : nginx X-Accel-Redirect, ACCEL_REDIRECT_PREFIX 아래 internal location 필요
+#                   예) location /_internal/ { internal; alias /srv/app/uploads/; }
+#  - 'x-sendfile' : Apache mod_xsendfile / lighttpd X-Sendfile
+FILE_OFFLOAD = os.getenv('FILE_OFFLOAD', '').lower()
+ACCEL_REDIRECT_PREFIX = os.getenv('ACCEL_REDIRECT_PREFIX', '/_internal').rstrip('/')
+
+# 내용 해시가 URL에 포함된 리소스의 캐시 기간 (1년)
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+def file_response(path: str, mimetype: str = None, etag=True, max_age: int = None,
+                  immutable: bool = False, accel_path: str = None, vary: str = None) -> Response:
+    """파일 응답 생성 - 강한 ETag, If-None-Match 304, Range(206) 처리
+
+    etag: 문자열이면 그대로 강한 ETag로 사용 (내용 해시 등), True면 mtime/크기 기반 생성
+    accel_path: X-Accel-Redirect 사용 시 ACCEL_REDIRECT_PREFIX 뒤에 붙일 경로
+    """
+    if FILE_OFFLOAD == 'x-accel' and accel_path:
+        # 본문 없이 헤더만 돌려주고 실제 전송(Range 포함)은 nginx가 수행
+        stat = os.stat(path)
+        response = current_app.response_class(
+            mimetype=mimetype or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        )
+        response.headers['X-Accel-Redirect'] = f'{ACCEL_REDIRECT_PREFIX}/{accel_path.lstrip("/")}'
+        response.last_modified = stat.st_mtime
+        if isinstance(etag, str):
+            response.set_etag(etag)
+        elif etag:
+            response.set_etag(make_etag(path, stat.st_mtime, stat.st_size))
+        if max_age is not None:
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+        response = response.make_conditional(request)
+        if response.status_code == 304:
+            # 304에는 본문이 없으므로 nginx가 파일을 다시 읽지 않도록 위임 헤더 제거
+            response.headers.pop('X-Accel-Redirect', None)
+    else:
+        # werkzeug send_file이 ETag/Last-Modified 평가와 Range(206/416)까지 처리
+        response = send_file(
+            path, request.environ, mimetype=mimetype, conditional=True, etag=etag, max_age=max_age,
+            use_x_sendfile=(FILE_OFFLOAD == 'x-sendfile'),
+            response_class=current_app.response_class
+        )
+        response.accept_ranges = 'bytes'
+
+    if immutable:
+        response.cache_control.immutable = True
+    if vary:
+        response.vary.add(vary)
+    return response
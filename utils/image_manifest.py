@@ -0,0 +1,202 @@
+# 차량 에셋 이미지 매니페스트
+# static/assets/cars 하위 이미지 폴더를 시작 시 한 번 인덱싱하고,
+# 이후에는 백그라운드 감시 스레드가 mtime 변화만 확인해 갱신함
+# 페이지 렌더링/API는 메모리의 매니페스트만 참조하므로 파일시스템을 건드리지 않음
+
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 인덱싱 대상 폴더: 종류 -> (물리 경로, URL 프리픽스, 허용 확장자)
+ASSET_DIRS = {
+    'main': (
+        os.path.join(PROJECT_ROOT, 'static', 'assets', 'cars', 'main_car_images'),
+        '/static/assets/cars/main_car_images',
+        {'.jpg', '.jpeg'}
+    ),
+    'control': (
+        os.path.join(PROJECT_ROOT, 'static', 'assets', 'cars', 'control_car_images'),
+        '/static/assets/cars/control_car_images',
+        {'.png'}
+    ),
+}
+
+# 감시 스레드의 mtime 확인 주기 (초)
+WATCH_INTERVAL = int(os.getenv('IMAGE_MANIFEST_WATCH_INTERVAL', '30'))
+
+def _file_hash(path: str) -> str:
+    """파일 내용 SHA-256 (앞 16자리)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def _image_size(path: str):
+    """이미지 헤더만 읽어 가로/세로 크기 확인 (디코딩 없음)"""
+    try:
+        from PIL import Image
+        with Image.open(path) as image:
+            return image.width, image.height
+    except Exception:
+        return None, None
+
+def _model_id_from_filename(filename: str) -> Optional[int]:
+    """1.jpg, 1_2.jpg 형태의 파일명에서 모델 ID 추출"""
+    stem = os.path.splitext(filename)[0]
+    model_part = stem.split('_', 1)[0]
+    return int(model_part) if model_part.isdigit() else None
+
+class ImageManifest:
+    """차량 이미지 매니페스트 클래스 - 모델별 이미지 목록/크기/해시 보관"""
+
+    _lock = threading.Lock()
+    _entries: Dict[str, Dict[int, List[Dict]]] = {}
+    _files: Dict[str, Dict] = {}        # 물리 경로 -> 엔트리 (재인덱싱 시 재사용)
+    _dir_mtimes: Dict[str, float] = {}
+    _version: Optional[str] = None
+    _watcher: Optional[threading.Thread] = None
+
+    @classmethod
+    def build(cls) -> bool:
+        """모든 에셋 폴더 인덱싱 (변경 없는 파일은 기존 해시/크기 재사용)"""
+        with cls._lock:
+            entries = {}
+            files = {}
+            dir_mtimes = {}
+
+            for kind, (directory, url_prefix, extensions) in ASSET_DIRS.items():
+                by_model = {}
+                try:
+                    dir_mtimes[directory] = os.stat(directory).st_mtime
+                    scanned = sorted(os.scandir(directory), key=lambda e: e.name)
+                except OSError:
+                    entries[kind] = by_model
+                    continue
+
+                for dir_entry in scanned:
+                    if not dir_entry.is_file():
+                        continue
+                    if os.path.splitext(dir_entry.name)[1].lower() not in extensions:
+                        continue
+                    model_id = _model_id_from_filename(dir_entry.name)
+                    if model_id is None:
+                        continue
+
+                    stat = dir_entry.stat()
+                    previous = cls._files.get(dir_entry.path)
+                    if previous and previous['mtime'] == stat.st_mtime and previous['size'] == stat.st_size:
+                        entry = previous
+                    else:
+                        width, height = _image_size(dir_entry.path)
+                        entry = {
+                            'filename': dir_entry.name,
+                            'file_path': f'{url_prefix}/{dir_entry.name}',
+                            'width': width,
+                            'height': height,
+                            'size': stat.st_size,
+                            'hash': _file_hash(dir_entry.path),
+                            'mtime': stat.st_mtime
+                        }
+                    files[dir_entry.path] = entry
+                    by_model.setdefault(model_id, []).append(entry)
+
+                # 대표 이미지({id}.확장자)가 항상 먼저 오도록 정렬
+                for model_id, items in by_model.items():
+                    items.sort(key=lambda item: (os.path.splitext(item['filename'])[0] != str(model_id),
+                                                 item['filename']))
+                entries[kind] = by_model
+
+            version = hashlib.sha1(
+                ''.join(sorted(entry['hash'] + entry['file_path'] for entry in files.values())).encode('utf-8')
+            ).hexdigest()[:16]
+            changed = version != cls._version
+
+            cls._entries = entries
+            cls._files = files
+            cls._dir_mtimes = dir_mtimes
+            cls._version = version
+            return changed
+
+    @classmethod
+    def is_stale(cls) -> bool:
+        """폴더 또는 인덱싱된 파일의 mtime이 바뀌었는지 확인"""
+        for directory, _, _ in ASSET_DIRS.values():
+            try:
+                if os.stat(directory).st_mtime != cls._dir_mtimes.get(directory):
+                    return True
+            except OSError:
+                if directory in cls._dir_mtimes:
+                    return True
+        for path, entry in list(cls._files.items()):
+            try:
+                if os.stat(path).st_mtime != entry['mtime']:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    @classmethod
+    def refresh_if_stale(cls) -> bool:
+        """변경이 감지된 경우에만 재인덱싱"""
+        if cls._version is None or cls.is_stale():
+            return cls.build()
+        return False
+
+    @classmethod
+    def start_watcher(cls, interval: int = WATCH_INTERVAL):
+        """백그라운드 감시 스레드 시작 (프로세스당 1회)"""
+        if cls._version is None:
+            cls.build()
+        if cls._watcher is not None or interval <= 0:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    cls.refresh_if_stale()
+                except Exception as e:
+                    print(f"Image manifest refresh error: {e}")
+
+        cls._watcher = threading.Thread(target=watch, name='image-manifest-watcher', daemon=True)
+        cls._watcher.start()
+
+    @classmethod
+    def _ensure_built(cls):
+        if cls._version is None:
+            cls.build()
+
+    @classmethod
+    def version(cls) -> Optional[str]:
+        """매니페스트 버전 (이미지 해시 지문)"""
+        cls._ensure_built()
+        return cls._version
+
+    @classmethod
+    def get_images(cls, model_id: int, kind: str = 'main') -> List[Dict]:
+        """모델 ID별 이미지 목록"""
+        cls._ensure_built()
+        return cls._entries.get(kind, {}).get(model_id, [])
+
+    @classmethod
+    def get_primary(cls, model_id: int, kind: str = 'main') -> Optional[Dict]:
+        """모델 대표 이미지"""
+        images = cls.get_images(model_id, kind)
+        return images[0] if images else None
+
+    @classmethod
+    def to_dict(cls) -> Dict:
+        """API 응답용 전체 매니페스트"""
+        cls._ensure_built()
+        return {
+            'version': cls._version,
+            'images': {
+                kind: {str(model_id): items for model_id, items in by_model.items()}
+                for kind, by_model in cls._entries.items()
+            }
+        }
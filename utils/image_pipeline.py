@@ -0,0 +1,138 @@
+# 이미지 처리 파이프라인 (백그라운드 프로세스 풀)
+# 업로드 요청은 원본만 저장하고 작업을 큐에 넣은 뒤 바로 반환하며,
+# 디스패처 스레드가 사용자별 큐를 라운드로빈으로 돌며 워커 프로세스에 작업을 배분함
+#  - 전체 대기 작업 수 상한 (bounded queue) 초과 시 PipelineFull
+#  - 사용자별 대기 작업 수 상한으로 한 사용자가 큐를 독점하지 못하게 함
+
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Hashable, Optional
+
+class PipelineFull(Exception):
+    """파이프라인 대기열이 가득 찬 경우"""
+    pass
+
+class ImagePipeline:
+    """사용자 공정성(라운드로빈)을 보장하는 이미지 처리 작업 큐"""
+
+    def __init__(self, func: Callable, workers: int = None, max_queue: int = 64,
+                 max_per_user: int = 12, on_complete: Callable = None):
+        self.func = func
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.max_per_user = max_per_user
+        self.on_complete = on_complete
+
+        self._queues = OrderedDict()     # user_id -> deque(job), 등록 순서가 라운드로빈 순서
+        self._pending_by_user: Dict[Hashable, int] = {}
+        self._queued = 0
+        self._inflight = 0
+        self._cond = threading.Condition()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._pid = None
+
+    def available(self, user_id: Hashable = None) -> int:
+        """지금 추가로 받을 수 있는 작업 수"""
+        with self._cond:
+            free = self.max_queue - self._queued - self._inflight
+            if user_id is not None:
+                free = min(free, self.max_per_user - self._pending_by_user.get(user_id, 0))
+            return max(free, 0)
+
+    def submit(self, user_id: Hashable, job: Dict):
+        """작업 등록 - job['kwargs']는 처리 함수 인자, 나머지는 완료 콜백에 그대로 전달됨"""
+        self._ensure_started()
+        with self._cond:
+            if self._queued + self._inflight >= self.max_queue:
+                raise PipelineFull('이미지 처리 대기열이 가득 찼습니다')
+            if self._pending_by_user.get(user_id, 0) >= self.max_per_user:
+                raise PipelineFull('처리 대기 중인 사진이 너무 많습니다')
+
+            job = dict(job, user_id=user_id)
+            if user_id not in self._queues:
+                self._queues[user_id] = deque()
+            self._queues[user_id].append(job)
+            self._pending_by_user[user_id] = self._pending_by_user.get(user_id, 0) + 1
+            self._queued += 1
+            self._cond.notify()
+
+    def stats(self) -> Dict:
+        """큐 상태 (모니터링용)"""
+        with self._cond:
+            return {
+                'workers': self.workers,
+                'queued': self._queued,
+                'inflight': self._inflight,
+                'users': len(self._queues),
+                'max_queue': self.max_queue
+            }
+
+    def _ensure_started(self):
+        # 워커 프로세스 fork 이후(gunicorn 등)에도 프로세스마다 풀을 새로 만들도록 PID 확인
+        with self._cond:
+            if self._executor is not None and self._pid == os.getpid():
+                return
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._pid = os.getpid()
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name='image-pipeline', daemon=True)
+            self._dispatcher.start()
+
+    def _next_job(self) -> Dict:
+        # 맨 앞 사용자의 작업 1개를 꺼내고, 남은 작업이 있으면 맨 뒤로 보냄 (라운드로빈)
+        user_id, jobs = next(iter(self._queues.items()))
+        job = jobs.popleft()
+        if jobs:
+            self._queues.move_to_end(user_id)
+        else:
+            del self._queues[user_id]
+        self._queued -= 1
+        return job
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                # 워커 수만큼만 동시에 보내야 대기 순서를 디스패처가 결정할 수 있음
+                while not self._queues or self._inflight >= self.workers:
+                    self._cond.wait()
+                job = self._next_job()
+                self._inflight += 1
+                executor = self._executor
+
+            try:
+                future = executor.submit(self.func, **job['kwargs'])
+            except BrokenProcessPool as e:
+                # 워커 프로세스가 비정상 종료된 경우 풀을 새로 만들고 해당 작업은 실패 처리
+                with self._cond:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._finish(job, None, e)
+                continue
+            except Exception as e:
+                self._finish(job, None, e)
+                continue
+            future.add_done_callback(lambda f, job=job: self._finish(job, *self._outcome(f)))
+
+    @staticmethod
+    def _outcome(future):
+        error = future.exception()
+        return (None, error) if error else (future.result(), None)
+
+    def _finish(self, job: Dict, result, error):
+        with self._cond:
+            self._inflight -= 1
+            user_id = job['user_id']
+            remaining = self._pending_by_user.get(user_id, 1) - 1
+            if remaining > 0:
+                self._pending_by_user[user_id] = remaining
+            else:
+                self._pending_by_user.pop(user_id, None)
+            self._cond.notify()
+
+        if self.on_complete:
+            try:
+                self.on_complete(job, result, error)
+            except Exception as e:
+                print(f"[PIPELINE] completion callback error: {e}")
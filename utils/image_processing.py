@@ -0,0 +1,177 @@
+# 이미지 처리 함수 (CPU 작업)
+# 요청 스레드와 이미지 파이프라인 워커 프로세스 양쪽에서 사용하므로
+# 모듈 최상위 함수로만 구성 (ProcessPoolExecutor 피클링 대상)
+
+import os
+from io import BytesIO
+from PIL import Image
+from utils.blob_store import BlobStore
+
+MAX_IMAGE_WIDTH = 1600
+MIN_IMAGE_WIDTH = 320
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+# 썸네일/반응형 이미지 크기 등급 (가로 px)
+VARIANT_WIDTHS = (160, 480, 1024, 1600)
+# 포맷 -> (PIL 포맷, 확장자, MIME)
+VARIANT_FORMATS = {
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg'),
+    'webp': ('WEBP', 'webp', 'image/webp'),
+}
+
+# EXIF Orientation 값 -> 바로 세우기 위한 변환 (ImageOps.exif_transpose와 동일)
+_EXIF_ORIENTATION_TAG = 0x0112
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# 축소 시 목표 크기의 몇 배까지를 정수배 축소(Image.reduce)로 처리할지
+# 남은 배율만 LANCZOS로 줄이므로 2.0 이상이면 화질 차이가 거의 없음
+REDUCING_GAP = 2.0
+
+def _orientation(image) -> int:
+    # EXIF 헤더만 파싱 (픽셀 디코딩 없음)
+    try:
+        return image.getexif().get(_EXIF_ORIENTATION_TAG, 1)
+    except Exception:
+        return 1
+
+def _oriented_size(image, orientation: int):
+    # 90도 회전이 포함된 방향(5~8)이면 가로/세로가 바뀜
+    if orientation in (5, 6, 7, 8):
+        return image.height, image.width
+    return image.width, image.height
+
+def probe_image(path: str):
+    """이미지 헤더만 읽어 (포맷, 가로, 세로) 반환 - 픽셀 디코딩 없음, EXIF 방향 반영"""
+    with Image.open(path) as image:
+        width, height = _oriented_size(image, _orientation(image))
+        return image.format, width, height
+
+def prepare_image(image, max_width: int = MAX_IMAGE_WIDTH, min_width: int = MIN_IMAGE_WIDTH):
+    """PIL 이미지를 EXIF 방향대로 세운 최대 가로폭 이하의 RGB 이미지로 변환
+
+    Image.open 직후(픽셀 로드 전)의 이미지를 넘기면 JPEG는 디코딩 단계에서 1/2~1/8로
+    축소(draft)하고, 남은 배율은 reduce + LANCZOS로 줄인 뒤 작은 이미지에서 회전함
+    """
+    orientation = _orientation(image)
+    width, height = _oriented_size(image, orientation)
+
+    # 크기 검증
+    if width < min_width:
+        raise ValueError(f'이미지 가로폭이 너무 작습니다. 최소 {min_width}px 이상이어야 합니다.')
+
+    # 목표 크기 (회전 전 좌표계 기준)
+    if width > max_width:
+        target = (max_width, max(1, int(height * max_width / width)))
+    else:
+        target = (width, height)
+    if orientation in (5, 6, 7, 8):
+        target = (target[1], target[0])
+
+    if image.format == 'JPEG' and target != image.size:
+        # 목표 크기 이상을 유지하는 가장 큰 1/2^n 배율로 디코딩 (IDCT 단계 축소라 화질 손실이 적음)
+        image.draft(None, target)
+
+    if image.mode == 'P':
+        # 팔레트는 LANCZOS로 줄일 수 없으므로 먼저 변환
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    # 리사이징 필요한지 확인
+    if target != image.size:
+        image = image.resize(target, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+    if image.mode in ('RGBA', 'LA'):
+        # 투명도가 있는 이미지는 배경을 흰색으로 변환 (알파 채널만 꺼내 마스크로 사용)
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image.convert('RGB') if image.mode == 'LA' else image,
+                         mask=image.getchannel('A'))
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    transpose = _ORIENTATION_TRANSPOSE.get(orientation)
+    if transpose is not None:
+        image = image.transpose(transpose)
+    # 축소/변환이 없던 경우에도 픽셀을 읽어 두어 원본 파일을 닫은 뒤에 쓸 수 있게 함
+    image.load()
+    return image
+
+def encode_image(image, fmt: str = 'jpeg') -> bytes:
+    """RGB 이미지를 JPEG/WebP 바이트로 인코딩"""
+    output = BytesIO()
+    if fmt == 'webp':
+        image.save(output, format='WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(output, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+    return output.getvalue()
+
+def resize_image(image, max_width: int = MAX_IMAGE_WIDTH, min_width: int = MIN_IMAGE_WIDTH):
+    """PIL 이미지를 최대 가로폭으로 줄이고 JPEG로 인코딩 -> (bytes, 가로, 세로)"""
+    image = prepare_image(image, max_width, min_width)
+    return encode_image(image, 'jpeg'), image.width, image.height
+
+def size_class_for(width: int) -> int:
+    """가로폭이 속하는 크기 등급 (해당 폭 이상인 가장 작은 등급)"""
+    for size_class in VARIANT_WIDTHS:
+        if width <= size_class:
+            return size_class
+    return VARIANT_WIDTHS[-1]
+
+def variant_filename(filename: str, size_class: int, fmt: str) -> str:
+    """원본 파일명에 대한 변형 파일명 (예: 1_ab12.jpg -> 1_ab12_w480.webp)"""
+    stem = os.path.splitext(filename)[0]
+    return f'{stem}_w{size_class}.{VARIANT_FORMATS[fmt][1]}'
+
+def make_variants(image, store: BlobStore, main_blob: dict) -> list:
+    """크기 등급별 JPEG/WebP 변형을 블롭 저장소에 스테이징 - 메인 JPEG와 같은 등급은 같은 블롭 공유"""
+    main_class = size_class_for(image.width)
+
+    variants = []
+    current = image
+    # 큰 등급부터 이전 결과를 다시 줄여 나감 (매번 원본에서 줄이는 것보다 빠름)
+    for size_class in sorted((c for c in VARIANT_WIDTHS if c <= main_class), reverse=True):
+        if size_class < current.width:
+            current = current.resize(
+                (size_class, max(1, round(current.height * size_class / current.width))),
+                Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP
+            )
+        for fmt in VARIANT_FORMATS:
+            if fmt == 'jpeg' and size_class == main_class:
+                blob = main_blob
+            else:
+                blob = store.stage_bytes(encode_image(current, fmt), VARIANT_FORMATS[fmt][1])
+            variants.append({
+                'size_class': size_class,
+                'format': fmt,
+                'width': current.width,
+                'height': current.height,
+                'file_size': blob['file_size'],
+                'blob': blob
+            })
+    return variants
+
+def process_photo(src_path: str, blob_root: str, max_width: int = MAX_IMAGE_WIDTH,
+                  with_variants: bool = True) -> dict:
+    """업로드 원본 파일을 디코딩/리사이즈/JPEG 인코딩해 블롭 저장소에 스테이징 (워커 프로세스에서 실행)
+
+    파일은 tmp/ 에만 기록되며, 참조 등록 후 호출 측에서 BlobStore.commit()으로 제자리에 옮김
+    """
+    with Image.open(src_path) as image:
+        prepared = prepare_image(image, max_width)
+
+    store = BlobStore(blob_root)
+    main_blob = store.stage_bytes(encode_image(prepared, 'jpeg'), 'jpg')
+
+    result = {'width': prepared.width, 'height': prepared.height,
+              'file_size': main_blob['file_size'], 'blob': main_blob}
+    if with_variants:
+        result['variants'] = make_variants(prepared, store, main_blob)
+    return result
@@ -0,0 +1,242 @@
+# JSON 요청 본문 스트리밍 파서
+# 최상위 객체의 특정 키(예: "images")에 들어 있는 base64 문자열 배열을
+# 요청 스트림에서 청크 단위로 읽으며 바로 디코딩해 파일(sink)에 기록함
+#  - 요청 전체 / base64 문자열 / 디코딩 결과를 메모리에 동시에 올리지 않음
+#  - 요소는 하나씩 순서대로 처리되므로 요청당 메모리는 청크 크기 + 스풀 상한으로 제한됨
+
+import base64
+import binascii
+import tempfile
+from typing import BinaryIO, Callable, Iterator, Optional
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 256 * 1024   # 이보다 큰 디코딩 결과는 디스크 임시 파일로 넘김
+
+_B64_ALPHABET = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/='
+# base64 알파벳 외 문자(공백, 줄바꿈 등)는 b64decode 기본 동작과 같이 버림
+_NON_B64 = bytes(c for c in range(256) if c not in _B64_ALPHABET)
+_WHITESPACE = b' \t\r\n'
+_ESCAPES = {
+    ord('"'): b'"', ord('\\'): b'\\', ord('/'): b'/', ord('b'): b'\b',
+    ord('f'): b'\f', ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t',
+}
+
+class JSONStreamError(ValueError):
+    """JSON 형식 오류 또는 base64 디코딩 실패"""
+    pass
+
+class PayloadTooLarge(JSONStreamError):
+    """디코딩된 요소 크기가 상한을 넘은 경우"""
+    pass
+
+class _Reader:
+    """요청 스트림 위의 바이트 단위 리더 (버퍼는 청크 1개 분량만 유지)"""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = b''
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        data = self.stream.read(self.chunk_size)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def next_byte(self) -> int:
+        if self.pos >= len(self.buf) and not self._fill():
+            raise JSONStreamError('JSON 본문이 중간에 끝났습니다')
+        byte = self.buf[self.pos]
+        self.pos += 1
+        return byte
+
+    def peek(self) -> Optional[int]:
+        """공백을 건너뛴 다음 바이트 (소비하지 않음), 스트림 끝이면 None"""
+        while True:
+            if self.pos >= len(self.buf) and not self._fill():
+                return None
+            byte = self.buf[self.pos]
+            if byte not in _WHITESPACE:
+                return byte
+            self.pos += 1
+
+    def expect(self, char: bytes):
+        if self.peek() != char[0]:
+            raise JSONStreamError(f"JSON 형식 오류: '{char.decode()}' 필요")
+        self.pos += 1
+
+    def string_chunks(self) -> Iterator[bytes]:
+        """여는 따옴표 다음부터 닫는 따옴표까지 문자열 내용을 조각으로 반환 (이스케이프 해제)"""
+        while True:
+            if self.pos >= len(self.buf) and not self._fill():
+                raise JSONStreamError('JSON 문자열이 닫히지 않았습니다')
+            buf = self.buf
+            quote = buf.find(b'"', self.pos)
+            backslash = buf.find(b'\\', self.pos)
+            end = quote if backslash == -1 or (quote != -1 and quote < backslash) else backslash
+            if end == -1:
+                piece = buf[self.pos:]
+                self.pos = len(buf)
+                yield piece
+                continue
+            if end > self.pos:
+                yield buf[self.pos:end]
+            self.pos = end + 1
+            if end == quote:
+                return
+
+            escape = self.next_byte()
+            if escape == ord('u'):
+                code = bytes(self.next_byte() for _ in range(4))
+                try:
+                    yield chr(int(code, 16)).encode('utf-8', 'surrogatepass')
+                except ValueError:
+                    raise JSONStreamError('JSON 유니코드 이스케이프 오류')
+            elif escape in _ESCAPES:
+                yield _ESCAPES[escape]
+            else:
+                raise JSONStreamError('JSON 이스케이프 오류')
+
+    def skip_value(self):
+        """관심 없는 값 하나를 내용 보관 없이 건너뜀"""
+        byte = self.peek()
+        if byte is None:
+            raise JSONStreamError('JSON 값이 없습니다')
+        if byte == ord('"'):
+            self.pos += 1
+            for _ in self.string_chunks():
+                pass
+            return
+        if byte in b'{[':
+            depth = 0
+            while True:
+                byte = self.next_byte()
+                if byte == ord('"'):
+                    for _ in self.string_chunks():
+                        pass
+                elif byte in b'{[':
+                    depth += 1
+                elif byte in b'}]':
+                    depth -= 1
+                    if depth == 0:
+                        return
+        # 숫자 / true / false / null
+        while True:
+            byte = self.peek()
+            if byte is None or byte in b',}]':
+                return
+            self.pos += 1
+
+class _Base64Writer:
+    """base64(또는 data URL) 텍스트 조각을 4글자 단위로 디코딩해 sink에 기록"""
+
+    def __init__(self, sink: BinaryIO, max_bytes: int = None):
+        self.sink = sink
+        self.max_bytes = max_bytes
+        self.written = 0
+        self._head = b''          # data URL 접두어 판별 전까지 모아두는 앞부분
+        self._head_done = False
+        self._pending = b''       # 4의 배수가 안 돼 남은 base64 글자
+
+    def write(self, piece: bytes):
+        if not self._head_done:
+            self._head += piece
+            if self._head.startswith(b'data:'):
+                # data:image/jpeg;base64,... 형태면 쉼표까지 버림
+                comma = self._head.find(b',')
+                if comma == -1:
+                    if len(self._head) > 256:
+                        raise JSONStreamError('data URL 형식 오류')
+                    return
+                piece = self._head[comma + 1:]
+            elif len(self._head) < 5 and b'data:'.startswith(self._head):
+                return
+            else:
+                piece = self._head
+            self._head = b''
+            self._head_done = True
+        self._feed(piece)
+
+    def _feed(self, piece: bytes):
+        data = self._pending + piece.translate(None, _NON_B64)
+        usable = len(data) - len(data) % 4
+        self._pending = data[usable:]
+        if usable:
+            self._emit(data[:usable])
+
+    def _emit(self, data: bytes):
+        try:
+            decoded = base64.b64decode(data)
+        except (binascii.Error, ValueError) as e:
+            raise JSONStreamError(f'base64 디코딩 실패: {e}')
+        self.written += len(decoded)
+        if self.max_bytes is not None and self.written > self.max_bytes:
+            raise PayloadTooLarge(f'파일 크기 제한 {self.max_bytes} 바이트를 초과했습니다.')
+        self.sink.write(decoded)
+
+    def finish(self):
+        if not self._head_done:
+            self._head_done = True
+            self._feed(self._head)
+        if self._pending:
+            # 남은 글자가 4의 배수가 아니면 패딩 오류로 처리 (b64decode와 동일)
+            self._emit(self._pending)
+            self._pending = b''
+
+def spooled_sink() -> BinaryIO:
+    """기본 출력 대상 - 작은 파일은 메모리, 큰 파일은 디스크 임시 파일"""
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+def iter_base64_array(stream: BinaryIO, key: str, sink_factory: Callable[[], BinaryIO] = spooled_sink,
+                      max_bytes: int = None, chunk_size: int = CHUNK_SIZE) -> Iterator[BinaryIO]:
+    """최상위 JSON 객체의 key 배열에 담긴 base64 문자열을 하나씩 디코딩해 sink로 반환
+
+    각 요소는 sink_factory()로 만든 파일에 기록된 뒤 처음 위치로 되감아 전달됨
+    (호출자가 다음 요소를 요청하기 전에 사용/닫기 완료해야 함)
+    배열이 아닌 값이나 문자열이 아닌 요소는 무시함
+    """
+    reader = _Reader(stream, chunk_size)
+    reader.expect(b'{')
+    if reader.peek() == ord('}'):
+        return
+
+    target = key.encode('utf-8')
+    while True:
+        reader.expect(b'"')
+        name = b''.join(reader.string_chunks())
+        reader.expect(b':')
+
+        if name == target and reader.peek() == ord('['):
+            reader.pos += 1
+            if reader.peek() == ord(']'):
+                reader.pos += 1
+            else:
+                while True:
+                    if reader.peek() == ord('"'):
+                        reader.pos += 1
+                        sink = sink_factory()
+                        try:
+                            writer = _Base64Writer(sink, max_bytes)
+                            for piece in reader.string_chunks():
+                                writer.write(piece)
+                            writer.finish()
+                            sink.seek(0)
+                        except BaseException:
+                            sink.close()
+                            raise
+                        yield sink
+                    else:
+                        reader.skip_value()
+                    if reader.peek() == ord(']'):
+                        reader.pos += 1
+                        break
+                    reader.expect(b',')
+        else:
+            reader.skip_value()
+
+        if reader.peek() == ord('}'):
+            return
+        reader.expect(b',')
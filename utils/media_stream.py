@@ -0,0 +1,170 @@
+# 대용량 미디어(영상) 전송 헬퍼 - Range / If-Range / 206 / 대역폭 제한
+#  - 파일 끝까지 보내는 응답(전체 200, "bytes=N-" 206)은 wsgi.file_wrapper에 파일 객체를 넘겨
+#    서버가 os.sendfile로 커널에서 바로 전송하게 함 (gunicorn 등, Python 워커가 바이트를 복사하지 않음)
+#  - 중간에서 끝나는 구간("bytes=N-M")은 file_wrapper가 파일 끝까지 보낼 수 있으므로 길이 제한 반복자로 전송
+#  - 대역폭 제한(rate)이 있으면 연결마다 보낸 양에 맞춰 쉬어 가며 청크 단위로 보냄 (sendfile 미사용)
+
+import mimetypes
+import os
+import re
+import time
+import unicodedata
+import urllib.parse
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from flask import current_app, request, Response
+from werkzeug.http import http_date, parse_date, is_resource_modified
+from utils.http_cache import make_etag
+
+# 연결당 전송 속도 상한 (바이트/초, 0이면 제한 없음) / 처음 몇 초 분량은 바로 보냄 (재생 시작 지연 방지)
+VIDEO_STREAM_RATE = int(os.getenv('VIDEO_STREAM_RATE', '0'))
+VIDEO_STREAM_BURST_SECONDS = float(os.getenv('VIDEO_STREAM_BURST_SECONDS', '4'))
+BLOCK_SIZE = 256 * 1024
+
+_SINGLE_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+def parse_range(header: Optional[str], size: int) -> Tuple[Optional[int], Optional[int], bool]:
+    """Range 헤더 해석 → (시작, 끝(포함), 만족 가능 여부)
+
+    단일 구간만 지원하며 형식이 잘못됐거나 여러 구간이면 (None, None, True) - Range를 무시하고 전체 전송
+    범위가 파일 밖이면 (None, None, False) - 416
+    """
+    if not header:
+        return None, None, True
+    match = _SINGLE_RANGE.match(header.replace(' ', ''))
+    if not match or not (match.group(1) or match.group(2)):
+        return None, None, True
+
+    first, last = match.group(1), match.group(2)
+    if not first:
+        # 접미 구간 "bytes=-N": 마지막 N바이트
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            return None, None, False
+        return max(size - suffix, 0), size - 1, True
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None, None, True  # 문법 오류는 무시
+    if start >= size:
+        return None, None, False
+    return start, min(end, size - 1), True
+
+def if_range_matches(header: Optional[str], etag: str, mtime: float) -> bool:
+    """If-Range 평가 - 강한 ETag 또는 Last-Modified가 정확히 같을 때만 부분 응답 허용"""
+    if not header:
+        return True
+    header = header.strip()
+    if header.startswith('W/'):
+        return False  # 약한 ETag는 If-Range에 쓸 수 없음
+    if header.startswith('"'):
+        return header == f'"{etag}"'
+    date = parse_date(header)
+    return date is not None and int(date.timestamp()) == int(mtime)
+
+class FileRangeIterator:
+    """[start, start + length) 구간만 읽어 보내는 응답 본문 (rate가 있으면 속도 제한)"""
+
+    def __init__(self, f, start: int, length: int, rate: int = 0, burst_seconds: float = 0):
+        self.f = f
+        self.start = start
+        self.length = length
+        self.rate = rate
+        self.burst = int(rate * burst_seconds)
+        # 속도 제한 시 한 번에 보내는 양을 줄여 전송이 고르게 퍼지도록 함
+        self.block_size = min(BLOCK_SIZE, max(rate // 10, 16 * 1024)) if rate else BLOCK_SIZE
+
+    def __iter__(self):
+        fd = self.f.fileno()
+        offset, remaining, sent = self.start, self.length, 0
+        began = time.monotonic()
+        while remaining > 0:
+            data = os.pread(fd, min(self.block_size, remaining), offset)
+            if not data:
+                break
+            yield data
+            offset += len(data)
+            remaining -= len(data)
+            sent += len(data)
+            if self.rate and sent > self.burst:
+                # 버스트 이후에는 보낸 양 / rate 만큼 시간이 지나도록 대기
+                delay = (sent - self.burst) / self.rate - (time.monotonic() - began)
+                if delay > 0:
+                    time.sleep(delay)
+
+    def close(self):
+        self.f.close()
+
+def content_disposition(name: str, as_attachment: bool) -> str:
+    """Content-Disposition 값 - ASCII가 아닌 이름은 filename*(RFC 5987)로 함께 전달"""
+    value = 'attachment' if as_attachment else 'inline'
+    try:
+        name.encode('ascii')
+        return f'{value}; filename="{name}"'
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+        quoted = urllib.parse.quote(name, safe='')
+        return f'{value}; filename="{simple}"; filename*=UTF-8\'\'{quoted}'
+
+def media_response(path: str, mimetype: str = None, download_name: str = None,
+                   as_attachment: bool = False, rate: int = None, max_age: int = None) -> Response:
+    """Range 지원 미디어 응답 생성 (200 / 206 / 304 / 416)
+
+    rate: 연결당 바이트/초 상한 (None이면 VIDEO_STREAM_RATE, 0이면 제한 없음)
+    파일이 없으면 OSError를 그대로 올림 (호출 측에서 처리)
+    """
+    rate = VIDEO_STREAM_RATE if rate is None else rate
+    f = open(path, 'rb')
+    try:
+        stat = os.fstat(f.fileno())
+        size = stat.st_size
+        etag = make_etag(stat.st_ino, stat.st_mtime_ns, size)
+
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'ETag': f'"{etag}"',
+            'Last-Modified': http_date(stat.st_mtime)
+        }
+        if max_age is not None:
+            headers['Cache-Control'] = f'public, max-age={max_age}'
+        if download_name or as_attachment:
+            headers['Content-Disposition'] = content_disposition(
+                download_name or os.path.basename(path), as_attachment)
+        mimetype = mimetype or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+        # If-None-Match / If-Modified-Since → 304 (Range보다 먼저 평가)
+        if not is_resource_modified(request.environ, etag=etag,
+                                    last_modified=datetime.fromtimestamp(stat.st_mtime, timezone.utc)):
+            f.close()
+            return current_app.response_class(status=304, headers=headers)
+
+        range_header = request.headers.get('Range')
+        if not if_range_matches(request.headers.get('If-Range'), etag, stat.st_mtime):
+            range_header = None  # 그 사이 파일이 바뀌었으면 Range를 무시하고 전체를 다시 보냄
+        start, end, satisfiable = parse_range(range_header, size)
+        if not satisfiable:
+            f.close()
+            headers['Content-Range'] = f'bytes */{size}'
+            return current_app.response_class(status=416, headers=headers)
+
+        if start is None:
+            status, start, length = 200, 0, size
+        else:
+            status, length = 206, end - start + 1
+            headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+        headers['Content-Length'] = str(length)
+
+        file_wrapper = request.environ.get('wsgi.file_wrapper')
+        if not rate and file_wrapper and start + length == size:
+            # 파일 끝까지 보내는 경우 서버의 sendfile 경로 사용 (Content-Length만큼 전송)
+            f.seek(start)
+            body = file_wrapper(f, BLOCK_SIZE)
+        else:
+            body = FileRangeIterator(f, start, length, rate, VIDEO_STREAM_BURST_SECONDS)
+    except Exception:
+        f.close()
+        raise
+
+    return current_app.response_class(body, status=status, headers=headers, mimetype=mimetype,
+                                      direct_passthrough=True)
@@ -0,0 +1,125 @@
+# MP4(ISO BMFF) 메타데이터 추출 - 순수 Python
+# 박스 헤더(크기/타입 8~16바이트)만 읽고 seek로 건너뛰며 moov 안의 필요한 박스만 읽음
+#  - mdat(영상 데이터)는 읽지 않으므로 파일 크기와 무관하게 수 KB만 읽음
+#  - moov가 파일 끝에 있어도(카메라 녹화 파일에 흔함) 최상위 박스 헤더만 따라가면 찾을 수 있음
+
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+# mvhd/mdhd 시각의 기준 (1904-01-01 UTC)
+MP4_EPOCH = datetime(1904, 1, 1)
+
+# 하위 박스를 가진 컨테이너 중 따라 내려갈 것
+_CONTAINERS = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+
+class MP4ProbeError(ValueError):
+    """MP4 구조를 해석할 수 없음"""
+
+def _boxes(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """[start, end) 구간의 박스를 (타입, 본문 시작, 본문 끝)으로 나열 (본문은 읽지 않음)"""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        body = pos + 8
+        if size == 1:
+            # 64비트 크기 (4GB 넘는 mdat 등)
+            size = struct.unpack('>Q', f.read(8))[0]
+            body += 8
+        elif size == 0:
+            size = end - pos  # 파일 끝까지
+        if size < body - pos:
+            raise MP4ProbeError(f'잘못된 박스 크기: {box_type!r} @ {pos}')
+        yield box_type, body, min(pos + size, end)
+        pos += size
+
+def _read(f: BinaryIO, offset: int, length: int) -> bytes:
+    f.seek(offset)
+    data = f.read(length)
+    if len(data) < length:
+        raise MP4ProbeError('박스 본문이 잘렸습니다')
+    return data
+
+def _parse_time_header(f: BinaryIO, body: int) -> Tuple[int, int, int]:
+    """mvhd/mdhd 공통 앞부분 → (생성 시각, timescale, duration)"""
+    version = _read(f, body, 1)[0]
+    if version == 1:
+        created, _, timescale, duration = struct.unpack('>QQIQ', _read(f, body + 4, 28))
+    else:
+        created, _, timescale, duration = struct.unpack('>IIII', _read(f, body + 4, 16))
+    return created, timescale, duration
+
+def _parse_tkhd(f: BinaryIO, body: int) -> Tuple[int, int]:
+    """tkhd 끝의 표시 크기(16.16 고정소수점) → (가로, 세로)"""
+    version = _read(f, body, 1)[0]
+    # version 0: 앞부분 76바이트 + 너비/높이 / version 1: 시각/길이가 64비트라 12바이트 더 김
+    offset = body + (88 if version == 1 else 76)
+    width, height = struct.unpack('>II', _read(f, offset, 8))
+    return width >> 16, height >> 16
+
+def _parse_stsd(f: BinaryIO, body: int) -> Optional[str]:
+    """stsd 첫 샘플 엔트리의 코덱 fourcc (avc1, hvc1, mp4a ...)"""
+    count = struct.unpack('>I', _read(f, body + 4, 4))[0]
+    if not count:
+        return None
+    return _read(f, body + 12, 4).decode('latin-1').strip()
+
+def _parse_trak(f: BinaryIO, start: int, end: int) -> Dict:
+    track = {}
+    stack = [(start, end)]
+    while stack:
+        s, e = stack.pop()
+        for box_type, body, box_end in _boxes(f, s, e):
+            if box_type == b'tkhd':
+                track['width'], track['height'] = _parse_tkhd(f, body)
+            elif box_type == b'mdhd':
+                _, timescale, duration = _parse_time_header(f, body)
+                track['timescale'], track['duration'] = timescale, duration
+            elif box_type == b'hdlr':
+                track['handler'] = _read(f, body + 8, 4)
+            elif box_type == b'stsd':
+                track['codec'] = _parse_stsd(f, body)
+            elif box_type in _CONTAINERS:
+                stack.append((body, box_end))
+    return track
+
+def probe_mp4(path: str) -> Dict:
+    """MP4 메타데이터 추출
+
+    → {'duration_ms', 'width', 'height', 'video_codec', 'audio_codec', 'created_at'}
+    (created_at: mvhd 생성 시각, 기록되지 않았으면 None)
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        moov = None
+        for box_type, body, box_end in _boxes(f, 0, size):
+            if box_type == b'moov':
+                moov = (body, box_end)
+                break
+        if moov is None:
+            raise MP4ProbeError('moov 박스가 없습니다 (녹화가 끝나지 않은 파일일 수 있음)')
+
+        info = {'duration_ms': None, 'width': None, 'height': None,
+                'video_codec': None, 'audio_codec': None, 'created_at': None}
+        for box_type, body, box_end in _boxes(f, *moov):
+            if box_type == b'mvhd':
+                created, timescale, duration = _parse_time_header(f, body)
+                if timescale:
+                    info['duration_ms'] = duration * 1000 // timescale
+                if created:
+                    info['created_at'] = MP4_EPOCH + timedelta(seconds=created)
+            elif box_type == b'trak':
+                track = _parse_trak(f, body, box_end)
+                if track.get('handler') == b'vide' and info['video_codec'] is None:
+                    info['video_codec'] = track.get('codec')
+                    info['width'], info['height'] = track.get('width'), track.get('height')
+                    if info['duration_ms'] is None and track.get('timescale'):
+                        info['duration_ms'] = track['duration'] * 1000 // track['timescale']
+                elif track.get('handler') == b'soun' and info['audio_codec'] is None:
+                    info['audio_codec'] = track.get('codec')
+        return info
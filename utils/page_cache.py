@@ -0,0 +1,86 @@
+# 렌더링 결과 캐시 (LRU + 메모리 상한)
+# 키별로 렌더링된 본문과 ETag/Last-Modified, 데이터 버전을 함께 보관하고
+# 조회 시 버전이 다르면 만료된 것으로 처리함
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+class PageCache:
+    """키 기반 LRU 응답 캐시 클래스 (프로세스 단위)"""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: Any = None) -> Optional[Dict]:
+        """캐시 조회 - 버전이 일치하는 엔트리만 반환 (LRU 순서 갱신)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry['version'] != version:
+                # 데이터 버전이 바뀐 엔트리는 즉시 제거
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, body: bytes, version: Any = None, etag: str = None,
+            last_modified: float = None, **extra) -> Dict:
+        """캐시 저장 - 상한 초과 시 가장 오래 사용되지 않은 엔트리부터 제거"""
+        entry = {
+            'body': body,
+            'version': version,
+            'etag': etag,
+            'last_modified': last_modified or time.time(),
+            'size': len(body)
+        }
+        entry.update(extra)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if entry['size'] > self.max_bytes:
+                # 상한보다 큰 본문은 캐시하지 않음
+                return entry
+            self._entries[key] = entry
+            self._total_bytes += entry['size']
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+        return entry
+
+    def invalidate(self, key: Hashable = None):
+        """특정 키 또는 전체 캐시 무효화"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._total_bytes = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry['size']
+
+    def stats(self) -> Dict:
+        """캐시 상태 (모니터링용)"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
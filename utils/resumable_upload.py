@@ -0,0 +1,314 @@
+# 이어 올리기(resumable) 업로드 세션 저장소
+# 세션 생성 -> 오프셋 지정 청크 PUT (순서 무관, 병렬 가능) -> 완료(finalize)
+#  - 세션별 디렉토리: <root>/<upload_id>/ 에 meta.json, data.part, chunks/<오프셋>-<길이>
+#  - 청크는 요청 본문을 조금씩 읽어 os.pwrite로 해당 오프셋에 바로 기록 (메모리에 모으지 않음)
+#  - 받은 구간은 청크 마커 파일로 기록하므로 여러 프로세스가 같은 세션에 동시에 써도 잠금이 필요 없음
+#    (마커는 쓰기 전에 지우고 fsync 후에 다시 만듦, 완료 처리가 시작되면 청크 PUT은 409)
+#  - 마지막 활동 후 TTL이 지난 세션은 GC 스레드가 삭제
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+UPLOAD_SESSION_TTL = int(os.getenv('UPLOAD_SESSION_TTL', str(24 * 3600)))
+UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', str(4 * 1024 * 1024)))    # 권장 청크 크기
+UPLOAD_MAX_CHUNK = int(os.getenv('UPLOAD_MAX_CHUNK', str(16 * 1024 * 1024)))     # 청크 1개 최대 크기
+UPLOAD_GC_INTERVAL = int(os.getenv('UPLOAD_GC_INTERVAL', '600'))
+READ_SIZE = 64 * 1024
+
+_UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+_CHUNK_NAME = re.compile(r'^(\d+)-(\d+)$')
+_SHA256 = re.compile(r'^[0-9a-fA-F]{64}$')
+
+class UploadError(Exception):
+    """업로드 세션 오류 (status: 응답 HTTP 상태 코드)"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+class ResumableUploads:
+    """디스크 기반 업로드 세션 저장소 클래스 (상태는 모두 파일에 있으므로 인스턴스는 가벼움)"""
+
+    _gc_thread: Optional[threading.Thread] = None
+
+    def __init__(self, root: str):
+        self.root = root
+
+    # ---- 세션 ----
+
+    def _session_dir(self, upload_id: str) -> str:
+        if not _UPLOAD_ID.match(upload_id or ''):
+            raise UploadError('존재하지 않는 업로드 세션입니다.', 404)
+        return os.path.join(self.root, upload_id)
+
+    def create(self, user_id, kind: str, filename: str, size: int, max_size: int,
+               sha256: str = None, chunk_size: int = None, extra: Dict = None) -> Dict:
+        """업로드 세션 생성 - 전체 크기만큼 (희소) 파일을 미리 잡아둠
+
+        extra: 완료 처리 함수에 키워드 인자로 넘길 값 (영상의 car_id 등)
+        """
+        if size <= 0:
+            raise UploadError('파일 크기가 올바르지 않습니다.')
+        if size > max_size:
+            raise UploadError(f'파일 크기 제한 {max_size} 바이트를 초과했습니다.', 413)
+        if sha256 is not None and not (isinstance(sha256, str) and _SHA256.match(sha256)):
+            raise UploadError('sha256은 64자리 16진수 문자열이어야 합니다.')
+        if chunk_size is not None and (not isinstance(chunk_size, int) or chunk_size <= 0):
+            raise UploadError('chunk_size는 양의 정수여야 합니다.')
+
+        upload_id = uuid.uuid4().hex
+        session_dir = os.path.join(self.root, upload_id)
+        os.makedirs(os.path.join(session_dir, 'chunks'))
+
+        fd = os.open(os.path.join(session_dir, 'data.part'), os.O_WRONLY | os.O_CREAT, 0o600)
+        try:
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+
+        meta = {
+            'upload_id': upload_id,
+            'user_id': user_id,
+            'kind': kind,
+            'filename': filename,
+            'size': size,
+            'sha256': sha256.lower() if sha256 else None,
+            'chunk_size': min(chunk_size or UPLOAD_CHUNK_SIZE, UPLOAD_MAX_CHUNK),
+            'extra': extra or {},
+            'created_at': time.time()
+        }
+        with open(os.path.join(session_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        return dict(meta, expires_at=meta['created_at'] + UPLOAD_SESSION_TTL)
+
+    def get(self, upload_id: str, user_id) -> Dict:
+        """세션 메타 조회 (다른 사용자의 세션은 없는 것으로 처리)"""
+        session_dir = self._session_dir(upload_id)
+        try:
+            with open(os.path.join(session_dir, 'meta.json')) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            raise UploadError('존재하지 않는 업로드 세션입니다.', 404)
+        if meta['user_id'] != user_id:
+            raise UploadError('존재하지 않는 업로드 세션입니다.', 404)
+        return meta
+
+    def _touch(self, upload_id: str) -> float:
+        # 마지막 활동 시각 = 세션 디렉토리 mtime (GC 기준)
+        session_dir = self._session_dir(upload_id)
+        os.utime(session_dir, None)
+        return os.path.getmtime(session_dir) + UPLOAD_SESSION_TTL
+
+    def abort(self, upload_id: str, user_id):
+        """세션 취소 - 받은 데이터 삭제"""
+        self.get(upload_id, user_id)
+        shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+
+    # ---- 청크 ----
+
+    def write_chunk(self, upload_id: str, user_id, offset: int, length: int, stream: BinaryIO,
+                    checksum: str = None) -> Dict:
+        """요청 본문을 읽어 offset 위치에 기록하고 구간을 받은 것으로 표시
+
+        checksum(SHA-256 hex)이 주어지면 검증하며, 불일치 시 구간을 표시하지 않음 (재전송 필요)
+        완료 처리가 시작된 세션에는 쓰지 않음 (409)
+        """
+        meta = self.get(upload_id, user_id)
+        if offset < 0 or length <= 0 or offset + length > meta['size']:
+            raise UploadError('청크 범위가 파일 크기를 벗어났습니다.', 416)
+        if length > UPLOAD_MAX_CHUNK:
+            raise UploadError(f'청크 크기 제한 {UPLOAD_MAX_CHUNK} 바이트를 초과했습니다.', 413)
+
+        session_dir = self._session_dir(upload_id)
+        self._check_not_finalizing(session_dir)
+        # 덮어쓸 구간의 기존 마커를 먼저 지움 - 쓰기가 중간에 실패해도 반쯤 덮인 구간이 받은 것으로 남지 않음
+        self._clear_markers(session_dir, offset, length)
+        # 마커를 지운 뒤 다시 확인 (그 사이 시작된 완료 처리는 빠진 구간을 보고 거절하므로 파일이 바뀌지 않음)
+        self._check_not_finalizing(session_dir)
+
+        digest = hashlib.sha256()
+        written = 0
+        fd = os.open(os.path.join(session_dir, 'data.part'), os.O_WRONLY)
+        try:
+            while written < length:
+                piece = stream.read(min(READ_SIZE, length - written))
+                if not piece:
+                    break
+                view = memoryview(piece)
+                while view:
+                    count = os.pwrite(fd, view, offset + written)
+                    digest.update(view[:count])
+                    view = view[count:]
+                    written += count
+            if written == length:
+                # 디스크에 기록된 뒤에만 마커를 남김
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        if written != length:
+            raise UploadError('청크 본문이 Content-Length보다 짧습니다.', 400)
+        actual = digest.hexdigest()
+        if checksum and checksum.lower() != actual:
+            raise UploadError('청크 체크섬이 일치하지 않습니다.', 422)
+
+        marker = os.path.join(session_dir, 'chunks', f'{offset}-{length}')
+        with open(marker, 'w') as f:
+            f.write(actual)
+
+        status = self.status(upload_id, user_id)
+        status['chunk'] = {'offset': offset, 'length': length, 'sha256': actual}
+        return status
+
+    @staticmethod
+    def _check_not_finalizing(session_dir: str):
+        if os.path.isdir(os.path.join(session_dir, 'finalizing')):
+            raise UploadError('이미 완료 처리 중인 업로드입니다.', 409)
+
+    @staticmethod
+    def _clear_markers(session_dir: str, offset: int, length: int):
+        # [offset, offset + length)와 겹치는 청크 마커 삭제 (청크 크기를 바꿔 재전송하는 경우 포함)
+        chunks_dir = os.path.join(session_dir, 'chunks')
+        for name in os.listdir(chunks_dir):
+            match = _CHUNK_NAME.match(name)
+            if match:
+                start = int(match.group(1))
+                if start < offset + length and offset < start + int(match.group(2)):
+                    try:
+                        os.remove(os.path.join(chunks_dir, name))
+                    except FileNotFoundError:
+                        pass
+
+    def _ranges(self, upload_id: str) -> List[Tuple[int, int]]:
+        # 받은 구간을 병합한 [(시작, 끝)] 목록
+        spans = []
+        for name in os.listdir(os.path.join(self._session_dir(upload_id), 'chunks')):
+            match = _CHUNK_NAME.match(name)
+            if match:
+                start, length = int(match.group(1)), int(match.group(2))
+                spans.append((start, start + length))
+        spans.sort()
+
+        merged = []
+        for start, end in spans:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def status(self, upload_id: str, user_id) -> Dict:
+        """받은 구간 / 빠진 구간 / 받은 바이트 수 (클라이언트가 이어 올릴 위치 판단용)"""
+        meta = self.get(upload_id, user_id)
+        received = self._ranges(upload_id)
+        missing, cursor = [], 0
+        for start, end in received:
+            if start > cursor:
+                missing.append([cursor, start])
+            cursor = end
+        if cursor < meta['size']:
+            missing.append([cursor, meta['size']])
+
+        return {
+            'upload_id': upload_id,
+            'kind': meta['kind'],
+            'filename': meta['filename'],
+            'size': meta['size'],
+            'chunk_size': meta['chunk_size'],
+            'received_bytes': sum(end - start for start, end in received),
+            'received': [list(span) for span in received],
+            'missing': missing,
+            'complete': not missing,
+            'expires_at': self._touch(upload_id)
+        }
+
+    # ---- 완료 ----
+
+    def finalize(self, upload_id: str, user_id) -> Tuple[Dict, str]:
+        """모든 구간을 받았는지와 전체 SHA-256을 확인하고 (메타, 완성 파일 경로) 반환
+
+        완성 파일은 호출 측이 옮기거나 처리한 뒤 release()로 세션을 정리해야 함
+        """
+        meta = self.get(upload_id, user_id)
+        session_dir = self._session_dir(upload_id)
+        try:
+            # 동시에 들어온 완료 요청은 하나만 통과
+            os.mkdir(os.path.join(session_dir, 'finalizing'))
+        except FileExistsError:
+            raise UploadError('이미 완료 처리 중인 업로드입니다.', 409)
+
+        try:
+            status = self.status(upload_id, user_id)
+            if not status['complete']:
+                raise UploadError('아직 받지 못한 구간이 있습니다.', 409)
+
+            path = os.path.join(session_dir, 'data.part')
+            if not os.path.isfile(path):
+                raise UploadError('업로드 데이터가 없습니다. 처음부터 다시 올려주세요.', 410)
+            if meta['sha256']:
+                digest = hashlib.sha256()
+                with open(path, 'rb') as f:
+                    for piece in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(piece)
+                if digest.hexdigest() != meta['sha256']:
+                    raise UploadError('파일 체크섬이 일치하지 않습니다.', 422)
+        except Exception:
+            self.reopen(upload_id)
+            raise
+        return meta, path
+
+    def reopen(self, upload_id: str):
+        """완료 처리를 진행하지 못한 세션을 다시 완료 요청 가능한 상태로 되돌림"""
+        try:
+            os.rmdir(os.path.join(self._session_dir(upload_id), 'finalizing'))
+        except FileNotFoundError:
+            pass
+
+    def release(self, upload_id: str):
+        """완료 처리 후 세션 디렉토리 삭제"""
+        shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+
+    # ---- GC ----
+
+    def collect_expired(self, ttl: int = UPLOAD_SESSION_TTL) -> int:
+        """마지막 활동 후 ttl이 지난 세션 삭제 후 삭제 수 반환"""
+        if not os.path.isdir(self.root):
+            return 0
+        cutoff = time.time() - ttl
+        removed = 0
+        for name in os.listdir(self.root):
+            session_dir = os.path.join(self.root, name)
+            try:
+                if os.path.getmtime(session_dir) < cutoff:
+                    shutil.rmtree(session_dir, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    @classmethod
+    def start_gc(cls, root: str, interval: int = UPLOAD_GC_INTERVAL):
+        """만료 세션 정리 스레드 시작 (프로세스당 1회)"""
+        if cls._gc_thread is not None or interval <= 0:
+            return
+        store = cls(root)
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    removed = store.collect_expired()
+                    if removed:
+                        print(f"[UPLOAD] expired sessions removed: {removed}")
+                except Exception as e:
+                    print(f"[UPLOAD] session GC error: {e}")
+
+        cls._gc_thread = threading.Thread(target=run, name='upload-session-gc', daemon=True)
+        cls._gc_thread.start()
@@ -0,0 +1,63 @@
+# 랜덤 샘플링 유틸리티
+# 인메모리 ID 목록 기반 균등/가중치 추출 (테이블 스캔 없음)
+
+import random
+from typing import Hashable, List, Optional, Sequence
+
+class AliasSampler:
+    """Walker/Vose alias 방식 가중치 샘플러 - 구성 O(n), 추출 O(1)"""
+
+    def __init__(self, items: Sequence[Hashable], weights: Sequence[float], rng: random.Random = None):
+        if len(items) != len(weights):
+            raise ValueError('items와 weights의 길이가 다릅니다')
+        if not items:
+            raise ValueError('샘플링할 항목이 없습니다')
+        if any(weight < 0 for weight in weights):
+            raise ValueError('가중치는 0 이상이어야 합니다')
+
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError('가중치 합이 0입니다')
+
+        self.items = list(items)
+        self._rng = rng or random
+        count = len(self.items)
+
+        # 평균이 1이 되도록 정규화한 뒤 작은/큰 칸을 짝지어 alias 테이블 구성
+        scaled = [weight * count / total for weight in weights]
+        self._prob = [0.0] * count
+        self._alias = [0] * count
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # 부동소수점 오차로 남은 칸은 확률 1로 처리
+        for i in large + small:
+            self._prob[i] = 1.0
+
+    def pick(self) -> Hashable:
+        """항목 하나 추출 (O(1))"""
+        column = self._rng.randrange(len(self.items))
+        if self._rng.random() < self._prob[column]:
+            return self.items[column]
+        return self.items[self._alias[column]]
+
+    def sample(self, count: int) -> List[Hashable]:
+        """복원 추출로 count개 추출 (대량 픽스처 생성용)"""
+        return [self.pick() for _ in range(count)]
+
+def pick_uniform(items: Sequence[Hashable], rng: random.Random = None) -> Optional[Hashable]:
+    """균등 확률로 항목 하나 추출 (빈 목록이면 None)"""
+    if not items:
+        return None
+    return (rng or random).choice(items)
@@ -0,0 +1,63 @@
+# 주행 영상 HLS 패키징 (fragmented MP4 세그먼트 + m3u8 매니페스트)
+# 로컬 ffmpeg로 재인코딩 없이(-c copy) 리먹싱만 하므로 영상 길이 대비 빠르게 끝남
+#  <cache_root>/<지문 앞 2자리>/<지문>/index.m3u8, init.mp4, seg_00000.m4s ...
+# 플레이어는 매니페스트와 첫 세그먼트만 받으면 재생을 시작하고, 본 구간의 세그먼트만 내려받음
+
+import os
+import re
+import shutil
+import uuid
+from typing import Dict
+from utils.video_thumbnails import run_ffmpeg
+
+HLS_SEGMENT_SECONDS = int(os.getenv('HLS_SEGMENT_SECONDS', '4'))
+HLS_MANIFEST = 'index.m3u8'
+HLS_INIT = 'init.mp4'
+
+# 서빙 허용 파일명 → MIME
+HLS_FILE_PATTERN = re.compile(r'^(index\.m3u8|init\.mp4|seg_\d{5}\.m4s)$')
+HLS_MIMETYPES = {
+    '.m3u8': 'application/vnd.apple.mpegurl',
+    '.mp4': 'video/mp4',
+    '.m4s': 'video/iso.segment'
+}
+
+def hls_dir(cache_root: str, fingerprint: str) -> str:
+    return os.path.join(cache_root, fingerprint[:2], fingerprint)
+
+def is_packaged(cache_root: str, fingerprint: str) -> bool:
+    # 매니페스트는 마지막에 함께 rename 되므로 있으면 세그먼트도 모두 있음
+    return os.path.isfile(os.path.join(hls_dir(cache_root, fingerprint), HLS_MANIFEST))
+
+def package_hls(video_path: str, cache_root: str, fingerprint: str) -> Dict:
+    """fMP4 HLS 패키징 (이미 캐시돼 있으면 그대로 사용) → {'segments'}
+
+    임시 디렉토리에 만든 뒤 통째로 rename 하므로 작업 중인 매니페스트가 노출되지 않음
+    """
+    directory = hls_dir(cache_root, fingerprint)
+    if not is_packaged(cache_root, fingerprint):
+        work_dir = os.path.join(cache_root, 'tmp', uuid.uuid4().hex)
+        os.makedirs(work_dir)
+        try:
+            run_ffmpeg(['-i', video_path, '-map', '0:v:0', '-map', '0:a:0?', '-c', 'copy',
+                        '-f', 'hls', '-hls_time', str(HLS_SEGMENT_SECONDS),
+                        '-hls_playlist_type', 'vod',
+                        '-hls_segment_type', 'fmp4',
+                        '-hls_fmp4_init_filename', HLS_INIT,
+                        '-hls_segment_filename', os.path.join(work_dir, 'seg_%05d.m4s'),
+                        os.path.join(work_dir, HLS_MANIFEST)])
+            if not os.path.isfile(os.path.join(work_dir, HLS_MANIFEST)):
+                raise RuntimeError('HLS 매니페스트가 생성되지 않았습니다')
+
+            os.makedirs(os.path.dirname(directory), exist_ok=True)
+            try:
+                os.rename(work_dir, directory)
+            except OSError:
+                if not is_packaged(cache_root, fingerprint):
+                    raise
+                # 다른 작업이 먼저 같은 지문을 완성함
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    segments = sum(1 for name in os.listdir(directory) if name.endswith('.m4s'))
+    return {'segments': segments}
@@ -0,0 +1,120 @@
+# 주행 영상 미리보기 생성 (포스터 JPEG + 탐색용 스프라이트 시트 + WebVTT 인덱스)
+# 디코딩은 로컬 ffmpeg 실행 파일에 맡기고(FFMPEG_BIN), 결과는 내용 지문(fingerprint)별 디렉토리에 캐시함
+#  <cache_root>/<fingerprint>/poster.jpg, sprite.jpg, sprite.vtt
+# 같은 내용의 영상은 파일명이 달라도 한 번만 생성되며, 내용이 바뀌면 지문이 바뀌어 새로 생성됨
+
+import hashlib
+import math
+import os
+import shutil
+import subprocess
+import uuid
+from typing import Dict, Optional
+
+FFMPEG_BIN = os.getenv('FFMPEG_BIN', 'ffmpeg')
+FFMPEG_TIMEOUT = int(os.getenv('FFMPEG_TIMEOUT', '600'))
+
+POSTER_WIDTH = 640
+SPRITE_TILE_WIDTH = 160
+SPRITE_COLUMNS = 10
+SPRITE_MAX_TILES = 100       # 영상 길이와 무관하게 스프라이트 1장에 최대 100컷
+SPRITE_MIN_INTERVAL = 1.0    # 짧은 영상도 1초보다 촘촘하게 자르지 않음
+
+THUMBNAIL_FILES = ('poster.jpg', 'sprite.jpg', 'sprite.vtt')
+
+# 지문 계산 시 읽는 구간 크기 (앞/가운데/끝)
+FINGERPRINT_SAMPLE = 1024 * 1024
+
+def ffmpeg_available() -> bool:
+    return shutil.which(FFMPEG_BIN) is not None
+
+def file_fingerprint(path: str) -> str:
+    """영상 내용 지문 - 크기 + 앞/가운데/끝 1MB의 SHA-256 (수 GB 파일도 3MB만 읽음)
+
+    MP4는 moov(길이/인덱스)가 앞이나 끝에 있고 편집 시 크기도 바뀌므로 재인코딩/잘라내기를 구분함
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode('ascii'))
+    with open(path, 'rb') as f:
+        if size <= FINGERPRINT_SAMPLE * 3:
+            digest.update(f.read())
+        else:
+            for offset in (0, size // 2, size - FINGERPRINT_SAMPLE):
+                f.seek(offset)
+                digest.update(f.read(FINGERPRINT_SAMPLE))
+    return digest.hexdigest()
+
+def thumbnail_dir(cache_root: str, fingerprint: str) -> str:
+    return os.path.join(cache_root, fingerprint[:2], fingerprint)
+
+def is_cached(cache_root: str, fingerprint: str) -> bool:
+    directory = thumbnail_dir(cache_root, fingerprint)
+    return all(os.path.isfile(os.path.join(directory, name)) for name in THUMBNAIL_FILES)
+
+def run_ffmpeg(args):
+    """ffmpeg 실행 (실패 시 stderr 끝부분을 담아 RuntimeError)"""
+    result = subprocess.run([FFMPEG_BIN, '-hide_banner', '-loglevel', 'error', '-nostdin', '-y'] + args,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=FFMPEG_TIMEOUT)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg 실패: {result.stderr.decode('utf-8', 'replace').strip()[-200:]}")
+
+def _vtt_time(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+def generate_thumbnails(video_path: str, cache_root: str, fingerprint: str,
+                        duration_ms: Optional[int]) -> Dict:
+    """포스터/스프라이트/VTT 생성 (이미 캐시돼 있으면 그대로 사용) → {'tiles', 'interval'}
+
+    임시 디렉토리에 만든 뒤 통째로 rename 하므로 동시에 같은 지문을 처리해도 반쯤 만든 결과가 보이지 않음
+    """
+    directory = thumbnail_dir(cache_root, fingerprint)
+    duration = (duration_ms or 0) / 1000
+    interval = max(duration / SPRITE_MAX_TILES, SPRITE_MIN_INTERVAL)
+    tiles = max(min(math.ceil(duration / interval), SPRITE_MAX_TILES), 1)
+    if is_cached(cache_root, fingerprint):
+        return {'tiles': tiles, 'interval': interval}
+
+    work_dir = os.path.join(cache_root, 'tmp', uuid.uuid4().hex)
+    os.makedirs(work_dir)
+    try:
+        # 포스터: 검은 첫 화면을 피해 1초(짧으면 10% 지점) 프레임
+        poster_at = min(1.0, duration * 0.1)
+        run_ffmpeg(['-ss', f'{poster_at:.3f}', '-i', video_path, '-frames:v', '1',
+                    '-vf', f'scale={POSTER_WIDTH}:-2', '-q:v', '3',
+                    os.path.join(work_dir, 'poster.jpg')])
+
+        # 스프라이트: interval초마다 1컷을 SPRITE_COLUMNS열 격자 한 장으로 합침
+        rows = math.ceil(tiles / SPRITE_COLUMNS)
+        columns = min(tiles, SPRITE_COLUMNS)
+        run_ffmpeg(['-i', video_path, '-frames:v', '1', '-q:v', '5',
+                    '-vf', f'fps=1/{interval:.3f},scale={SPRITE_TILE_WIDTH}:-2,tile={columns}x{rows}',
+                    os.path.join(work_dir, 'sprite.jpg')])
+
+        # 타일 높이는 회전 메타데이터까지 반영된 실제 결과 이미지에서 계산
+        from PIL import Image
+        with Image.open(os.path.join(work_dir, 'sprite.jpg')) as sprite:
+            tile_height = sprite.height // rows
+
+        cues = ['WEBVTT', '']
+        for index in range(tiles):
+            start = index * interval
+            end = min((index + 1) * interval, duration) if duration else interval
+            x = (index % SPRITE_COLUMNS) * SPRITE_TILE_WIDTH
+            y = (index // SPRITE_COLUMNS) * tile_height
+            cues += [f'{_vtt_time(start)} --> {_vtt_time(end)}',
+                     f'sprite.jpg#xywh={x},{y},{SPRITE_TILE_WIDTH},{tile_height}', '']
+        with open(os.path.join(work_dir, 'sprite.vtt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(cues))
+
+        os.makedirs(os.path.dirname(directory), exist_ok=True)
+        try:
+            os.rename(work_dir, directory)
+        except OSError:
+            if not is_cached(cache_root, fingerprint):
+                raise
+            # 다른 작업이 먼저 같은 지문을 완성함
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {'tiles': tiles, 'interval': interval}